@@ -0,0 +1,307 @@
+import math
+import time
+from itertools import islice
+from typing import Iterable
+import numpy as np
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_FPR_MESSAGE = """ERROR:
+
+Wrong false positive rate...
+
+Possible values: 0 < false_positive_rate < 1
+False positive rate: {false_positive_rate}
+"""
+
+WRONG_LABEL_MESSAGE = """ERROR:
+
+Wrong label in a dataset-format line...
+
+Possible values: True, False, 1, 0
+Line: {line}
+"""
+
+# Longest domain name allowed by DNS, longer names are hashed by their prefix
+MAX_DOMAIN_BYTES = 253
+
+# Domains hashed per batch, each batch is a (BATCH_SIZE, MAX_DOMAIN_BYTES) uint8 matrix of 16 MiB
+BATCH_SIZE = 1 << 16
+
+# Is-DGA value of the labels of dataset-format lines
+LABELS = {"True": True, "1": True, "False": False, "0": False}
+
+FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+FNV_PRIME = np.uint64(0x100000001b3)
+
+
+class BloomFilter:
+    """
+    A compact Bloom filter of domains, used as a known-benign allowlist.
+
+    Domains are hashed in batches from their UTF-8 byte matrix with a vectorized
+    64-bit FNV-1a, and the k bit positions are derived by double hashing. The
+    filter never misses an added domain; other domains are reported as present
+    with, at most, the configured false positive rate when filled to capacity.
+
+    Attributes:
+        capacity (int): Number of domains the filter is sized for.
+        false_positive_rate (float): Target false positive rate at capacity.
+        num_bits (int): Number of bits of the filter.
+        num_hashes (int): Number of hash functions.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001) -> None:
+        """
+        Initialize an empty filter sized for a capacity and false positive rate.
+
+        Args:
+            capacity (int): Number of domains the filter is sized for.
+            false_positive_rate (float, optional): Target false positive rate. Defaults to 0.001.
+
+        Raises:
+            Exception: If the false positive rate is not in (0, 1).
+        """
+        if not 0 < false_positive_rate < 1:
+            raise Exception(WRONG_FPR_MESSAGE.format(false_positive_rate=false_positive_rate))
+
+        self.capacity = max(int(capacity), 1)
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(int(math.ceil(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2)), 8)
+        self.num_hashes = max(int(round(self.num_bits / self.capacity * math.log(2))), 1)
+
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self._encoder = DomainEncoder(max_length=MAX_DOMAIN_BYTES, offset=0, truncating="post")
+        self._items = 0
+        self._lookups = 0
+        self._hits = 0
+        self._lookup_seconds = 0.0
+
+    @classmethod
+    def from_data(
+        cls,
+        data: Iterable[DataElement],
+        false_positive_rate: float = 0.001,
+        only_benign: bool = True
+    ) -> "BloomFilter":
+        """
+        Build a filter from data elements.
+
+        Args:
+            data (Iterable[DataElement]): Data elements.
+            false_positive_rate (float, optional): Target false positive rate. Defaults to 0.001.
+            only_benign (bool, optional): Whether to skip DGA domains. Defaults to True.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+        domains = [element.domain for element in data if not (only_benign and element.is_dga)]
+        bloom_filter = cls(len(domains), false_positive_rate)
+        bloom_filter.add(domains)
+        return bloom_filter
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        false_positive_rate: float = 0.001,
+        batch_size: int = BATCH_SIZE
+    ) -> "BloomFilter":
+        """
+        Build a filter from a domain list file.
+
+        Lines may be plain domains or in dataset format (<domain>;<label>), in
+        which case only the domains labelled as not DGA are added. The file is
+        read twice, to size the filter and to fill it, in constant memory.
+
+        Args:
+            path (str): Path to the file.
+            false_positive_rate (float, optional): Target false positive rate. Defaults to 0.001.
+            batch_size (int, optional): Lines hashed per batch. Defaults to BATCH_SIZE.
+
+        Returns:
+            BloomFilter: The filter.
+
+        Raises:
+            Exception: If a dataset-format line has a label other than True, False, 1 or 0.
+        """
+        with open(path, "r") as f:
+            capacity = sum(1 for line in f if line.strip())
+
+        bloom_filter = cls(capacity, false_positive_rate)
+        with open(path, "r") as f:
+            while lines := list(islice(f, batch_size)):
+                bloom_filter.add(bloom_filter._parse_lines(lines))
+        return bloom_filter
+
+    def add(self, domains: list[str]) -> None:
+        """
+        Add domains, hashing them BATCH_SIZE at a time.
+
+        Args:
+            domains (list[str]): Domains to add.
+        """
+        for start in range(0, len(domains), BATCH_SIZE):
+            positions = self._positions(domains[start:start + BATCH_SIZE])
+            np.bitwise_or.at(self._bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self._items += len(domains)
+
+    def contains(self, domains: list[str]) -> np.ndarray:
+        """
+        Check a batch of domains.
+
+        Args:
+            domains (list[str]): Domains to check.
+
+        Returns:
+            np.ndarray: Boolean array, True for domains that are (probably) in the filter.
+        """
+        start = time.perf_counter()
+        if not domains:
+            return np.zeros(0, dtype=bool)
+
+        positions = self._positions(domains)
+        bits = (self._bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        found = bits.all(axis=1)
+
+        self._lookups += len(domains)
+        self._hits += int(found.sum())
+        self._lookup_seconds += time.perf_counter() - start
+        return found
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array, in bytes."""
+        return self._bits.nbytes
+
+    def expected_false_positive_rate(self) -> float:
+        """
+        Estimate the false positive rate for the current number of items.
+
+        Returns:
+            float: Estimated false positive rate.
+        """
+        return (1 - math.exp(-self.num_hashes * self._items / self.num_bits)) ** self.num_hashes
+
+    def get_stats(self) -> Result:
+        """
+        Get memory footprint, lookup throughput and filtered fraction.
+
+        Returns:
+            Result: Filter statistics.
+        """
+        result = Result()
+        result.add_metric("Items", self._items)
+        result.add_metric("Bytes", self.nbytes)
+        result.add_metric("Hashes", self.num_hashes)
+        result.add_metric("Expected FPR", self.expected_false_positive_rate())
+        result.add_metric("Lookups", self._lookups)
+        result.add_metric("Filtered", self._hits / self._lookups if self._lookups else 0.0)
+        result.add_metric("Lookups/s", self._lookups / self._lookup_seconds if self._lookup_seconds > 0 else 0.0)
+        return result
+
+    def save(self, path: str) -> None:
+        """
+        Save the filter in NumPy .npz format.
+
+        Args:
+            path (str): Output path.
+        """
+        np.savez(
+            path,
+            bits=self._bits,
+            config=np.array([self.capacity, self.num_bits, self.num_hashes, self._items], dtype=np.int64),
+            false_positive_rate=np.array(self.false_positive_rate)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """
+        Load a filter saved with save().
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+        with np.load(path) as data:
+            capacity, num_bits, num_hashes, items = (int(value) for value in data["config"])
+            bloom_filter = cls(capacity, float(data["false_positive_rate"]))
+            bloom_filter.num_bits = num_bits
+            bloom_filter.num_hashes = num_hashes
+            bloom_filter._bits = data["bits"].copy()
+            bloom_filter._items = items
+        return bloom_filter
+
+    def _positions(self, domains: list[str]) -> np.ndarray:
+        """
+        Compute the bit positions of a batch of domains.
+
+        Args:
+            domains (list[str]): Domains.
+
+        Returns:
+            np.ndarray: uint64 matrix of shape (n, num_hashes).
+        """
+        codes = self._encoder.encode_buffer("\n".join(domains).encode("utf-8"))
+        if len(codes) < len(domains):
+            # encode_buffer drops a trailing empty domain
+            codes = np.vstack((codes, np.zeros((len(domains) - len(codes), codes.shape[1]), dtype=codes.dtype)))
+
+        used_columns = np.flatnonzero(codes.any(axis=0))
+        width = used_columns[-1] + 1 if len(used_columns) else 0
+
+        # Padding bytes are zero and skipped, so hashes do not depend on the batch width
+        first = np.full(len(domains), FNV_OFFSET, dtype=np.uint64)
+        for column in range(width):
+            values = codes[:, column]
+            first = np.where(values != 0, (first ^ values) * FNV_PRIME, first)
+        second = self._mix(first ^ np.uint64(0x9e3779b97f4a7c15)) | np.uint64(1)
+
+        hashes = np.arange(self.num_hashes, dtype=np.uint64)
+        return (first[:, None] + hashes[None, :] * second[:, None]) % np.uint64(self.num_bits)
+
+    def _mix(self, values: np.ndarray) -> np.ndarray:
+        """
+        Apply the SplitMix64 finalizer to derive an independent hash.
+
+        Args:
+            values (np.ndarray): uint64 values.
+
+        Returns:
+            np.ndarray: Mixed uint64 values.
+        """
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+        return values ^ (values >> np.uint64(31))
+
+    def _parse_lines(self, lines: list[str]) -> list[str]:
+        """
+        Extract the allowlisted domains of a batch of lines.
+
+        Args:
+            lines (list[str]): Plain or dataset-format lines.
+
+        Returns:
+            list[str]: Domains to add.
+
+        Raises:
+            Exception: If a dataset-format line has a label other than True, False, 1 or 0.
+        """
+        domains = []
+        for line in lines:
+            fields = line.strip().split(";")
+            if not fields[0]:
+                continue
+            if len(fields) > 1:
+                label = LABELS.get(fields[1].strip())
+                if label is None:
+                    raise Exception(WRONG_LABEL_MESSAGE.format(line=line.strip()))
+                if label:
+                    continue
+            domains.append(fields[0])
+        return domains
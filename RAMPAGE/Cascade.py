@@ -0,0 +1,181 @@
+import time
+from typing import Set
+import numpy as np
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.Result import Result
+from RAMPAGE.ScoreResult import ScoreResult
+
+
+# Error message templates
+WRONG_THRESHOLDS_MESSAGE = """ERROR:
+
+Wrong cascade thresholds...
+
+A (low, high) pair with 0 <= low <= threshold < high <= 1 is needed for every stage but the last one,
+so the verdict of every stage matches the decision threshold
+
+Number of stages: {stages}
+Thresholds: {thresholds}
+Threshold: {threshold}
+"""
+
+
+class Cascade(Classifier):
+    """
+    A classifier that chains trained classifiers from cheapest to most expensive.
+
+    Every stage scores the domains that reach it. Domains scored at or below
+    the stage low threshold are decided as legitimate, and at or above the
+    high threshold as DGA. The remaining, uncertain domains go to the next
+    stage. The last stage decides every domain that reaches it. The decision
+    threshold lies between the low and high thresholds of every stage, so
+    the final scores give the same verdicts as the deciding stages.
+
+    The stages are trained on their own (e.g. as classifiers registered in the
+    Framework), so training a cascade does nothing.
+
+    Attributes:
+        stages (list[Classifier]): Classifiers of every stage, in order.
+        thresholds (list[tuple[float, float]]): (low, high) thresholds of every stage but the last.
+        threshold (float): Decision threshold applied to the final scores.
+    """
+
+    def __init__(
+        self,
+        stages: list[Classifier],
+        thresholds: list[tuple[float, float]],
+        threshold: float = 0.5
+    ) -> None:
+        """
+        Initialize the cascade.
+
+        Args:
+            stages (list[Classifier]): Trained classifiers implementing predict, in order.
+            thresholds (list[tuple[float, float]]): (low, high) pairs for every stage but the last,
+                with low <= threshold < high.
+            threshold (float, optional): Decision threshold of the final scores. Defaults to 0.5.
+
+        Raises:
+            Exception: If the thresholds do not match the stages or the decision threshold.
+        """
+        if (len(thresholds) != len(stages) - 1
+                or any(not 0 <= low <= threshold < high <= 1 for low, high in thresholds)):
+            raise Exception(WRONG_THRESHOLDS_MESSAGE.format(
+                stages=len(stages),
+                thresholds=thresholds,
+                threshold=threshold
+            ))
+
+        self.stages = stages
+        self.thresholds = thresholds
+        self.threshold = threshold
+
+    def train(self, train_set: Set[DataElement], validation_set: Set[DataElement]) -> None:
+        """
+        Do nothing, the stages are trained on their own.
+
+        Args:
+            train_set (Set[DataElement]): The set of training data.
+            validation_set (Set[DataElement]): The set of validation data.
+        """
+        pass
+
+    def predict(self, domains: list[str]) -> np.ndarray:
+        """
+        Score domains through the cascade.
+
+        Args:
+            domains (list[str]): The domains to score.
+
+        Returns:
+            np.ndarray: Score of the stage that decided every domain.
+        """
+        return self.run(domains)[0]
+
+    def get_model_paths(self) -> list[str]:
+        """
+        Get the model files of every stage.
+
+        Returns:
+            list[str]: Paths of the model files of all the stages, in order.
+        """
+        return [path for stage in self.stages for path in stage.get_model_paths()]
+
+    def load_model(self) -> list:
+        """
+        Load a new copy of the model of every stage with model files.
+
+        Returns:
+            list: The loaded models, in stage order.
+
+        Raises:
+            NotImplementedError: If a stage does not support loading its model.
+        """
+        return [stage.load_model() for stage in self.stages if stage.get_model_paths()]
+
+    def test(self, test_set: Set[DataElement]) -> Result:
+        """
+        Test the cascade on a test dataset.
+
+        Besides the combined classification metrics, for every stage i the result
+        includes the fraction of domains that reached it ("Stage i traffic"), the
+        fraction it decided ("Stage i decided") and its predict time in seconds
+        ("Stage i s").
+
+        Args:
+            test_set (Set[DataElement]): The set of test data.
+
+        Returns:
+            Result: ScoreResult with the combined metrics, the final scores and per-stage traffic and time.
+        """
+        elements = list(test_set)
+        domains = [element.domain for element in elements]
+        labels = np.fromiter((element.is_dga for element in elements), dtype=bool, count=len(elements))
+
+        scores, decided_by, reached, seconds = self.run(domains)
+
+        result = ScoreResult(labels, scores, self.threshold, domains=domains, elements=elements)
+        total = max(len(domains), 1)
+        decided = np.bincount(decided_by, minlength=len(self.stages))
+        for index in range(len(self.stages)):
+            result.add_metric(f"Stage {index} traffic", reached[index] / total)
+            result.add_metric(f"Stage {index} decided", int(decided[index]) / total)
+            result.add_metric(f"Stage {index} s", seconds[index])
+        result.add_metric("Cascade s", sum(seconds))
+        return result
+
+    def run(self, domains: list[str]) -> tuple[np.ndarray, np.ndarray, list[int], list[float]]:
+        """
+        Score domains through the cascade, keeping per-stage statistics.
+
+        Args:
+            domains (list[str]): The domains to score.
+
+        Returns:
+            tuple: Final scores, index of the deciding stage of every domain,
+                number of domains that reached every stage and seconds spent in every stage.
+        """
+        scores = np.zeros(len(domains), dtype=np.float32)
+        decided_by = np.zeros(len(domains), dtype=np.int64)
+        remaining = np.arange(len(domains))
+        reached = []
+        seconds = []
+
+        for index, stage in enumerate(self.stages):
+            reached.append(len(remaining))
+            if len(remaining) == 0:
+                seconds.append(0.0)
+                continue
+
+            start = time.perf_counter()
+            stage_scores = np.asarray(stage.predict([domains[i] for i in remaining])).ravel()
+            seconds.append(time.perf_counter() - start)
+
+            scores[remaining] = stage_scores
+            decided_by[remaining] = index
+            if index < len(self.thresholds):
+                low, high = self.thresholds[index]
+                remaining = remaining[(stage_scores > low) & (stage_scores < high)]
+
+        return scores, decided_by, reached, seconds
@@ -1,3 +1,4 @@
+import numpy as np
 from RAMPAGE.Result import Result
 
 class Classifier:
@@ -5,6 +6,10 @@ class Classifier:
     A base classifier class that provides interface for training and testing.
     
     This class serves as a template for implementing different classification algorithms.
+    Implementing predict is optional and enables scoring of unlabelled domains.
+    Implementing partial_train is optional and enables incremental updates.
+    Implementing get_model_paths and load_model is optional and lets benchmarks
+    report the size on disk and load time of the model.
     """
     
     def train(self, train_set: set, validation_set: set) -> None:
@@ -17,6 +22,19 @@ class Classifier:
         """
         pass
     
+    def partial_train(self, new_train_set: set, validation_set: set) -> None:
+        """
+        Update the trained classifier with new training data only.
+        
+        Args:
+            new_train_set (set): The new training data, not seen by the classifier.
+            validation_set (set): The set of validation data.
+            
+        Raises:
+            NotImplementedError: If the classifier does not support incremental updates.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement partial_train()")
+    
     def test(self, test_set: set) -> Result:
         """
         Test the trained classifier on a test dataset.
@@ -27,4 +45,43 @@ class Classifier:
         Returns:
             Result: The classification results.
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def predict(self, domains: list[str]) -> np.ndarray:
+        """
+        Score a batch of unlabelled domains with the trained classifier.
+        
+        Args:
+            domains (list[str]): The domains to score.
+            
+        Returns:
+            np.ndarray: The DGA score of every domain, in the same order.
+            
+        Raises:
+            NotImplementedError: If the classifier does not support prediction.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement predict()")
+    
+    def get_model_paths(self) -> list[str]:
+        """
+        Get the files of the trained model on disk.
+        
+        Returns:
+            list[str]: Paths of the model files, empty if the model is not saved.
+        """
+        return []
+    
+    def load_model(self) -> object:
+        """
+        Load a new copy of the trained model from its files.
+        
+        The classifier (and any copy of the model it shares) is left unchanged,
+        so the load can be timed without losing training that is not saved.
+        
+        Returns:
+            object: The loaded model.
+            
+        Raises:
+            NotImplementedError: If the classifier does not support loading its model.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement load_model()")
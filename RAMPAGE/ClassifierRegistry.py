@@ -0,0 +1,209 @@
+import importlib
+from importlib import metadata
+from typing import Union
+from RAMPAGE.Classifier import Classifier
+
+
+# Error message templates
+UNKNOWN_CLASSIFIER_MESSAGE = """ERROR:
+
+Unknown classifier...
+
+Possible values: {names}
+Classifier: {name}
+"""
+
+WRONG_TARGET_MESSAGE = """ERROR:
+
+Wrong classifier target...
+
+Expected format: 'package.module:ClassName'
+Target: {target}
+"""
+
+WRONG_CLASSIFIER_MESSAGE = """ERROR:
+
+Target is not a Classifier subclass...
+
+Classifier: {name}
+Target: {target}
+"""
+
+# Entry point group where installed packages publish their classifiers
+ENTRY_POINT_GROUP = "rampage.classifiers"
+
+# Classifiers shipped with the package, by name
+BUILTIN_CLASSIFIERS = {
+    "NGramClassifier": "RAMPAGE.NGramClassifier:NGramClassifier",
+}
+
+
+class ClassifierRegistry:
+    """
+    A registry of Classifier implementations that imports them only when used.
+
+    Every classifier is registered by name with a 'module:ClassName' target,
+    from the built-in classifiers, the ENTRY_POINT_GROUP entry points of the
+    installed packages (read from their metadata, without importing them) or
+    explicit register() calls. The module of a classifier is imported the first
+    time it is loaded, so listing or validating classifiers never pays for
+    heavy dependencies such as TensorFlow.
+
+    Attributes:
+        targets (dict[str, str]): Target of every classifier, by name.
+    """
+
+    def __init__(self, discover: bool = True) -> None:
+        """
+        Initialize the registry with the built-in classifiers.
+
+        Args:
+            discover (bool, optional): Also register the installed entry points. Defaults to True.
+        """
+        self.targets = dict(BUILTIN_CLASSIFIERS)
+        self._classes = {}
+        if discover:
+            self.discover()
+
+    def discover(self) -> int:
+        """
+        Register the classifiers published in the ENTRY_POINT_GROUP entry points.
+
+        Returns:
+            int: Number of entry points found.
+        """
+        entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        for entry_point in entry_points:
+            self.register(entry_point.name, entry_point.value)
+        return len(entry_points)
+
+    def register(self, name: str, target: Union[str, type]) -> None:
+        """
+        Register a classifier, replacing any previous one with the same name.
+
+        Args:
+            name (str): Classifier name.
+            target (Union[str, type]): 'module:ClassName' target, or the class itself.
+
+        Raises:
+            Exception: If a target string is not in 'module:ClassName' format.
+        """
+        self._classes.pop(name, None)
+        if isinstance(target, type):
+            self.targets[name] = f"{target.__module__}:{target.__qualname__}"
+            self._classes[name] = self._check(name, target)
+            return
+
+        module, _, attribute = target.partition(":")
+        if not module or not attribute:
+            raise Exception(WRONG_TARGET_MESSAGE.format(target=target))
+        self.targets[name] = target
+
+    def get_names(self) -> list[str]:
+        """
+        Get the names of every registered classifier.
+
+        Returns:
+            list[str]: Sorted names.
+        """
+        return sorted(self.targets)
+
+    def get_module(self, name: str) -> str:
+        """
+        Get the module that defines a classifier, without importing it.
+
+        Args:
+            name (str): Classifier name.
+
+        Returns:
+            str: Module name.
+
+        Raises:
+            Exception: If the classifier is not registered.
+        """
+        return self._get_target(name).partition(":")[0]
+
+    def is_loaded(self, name: str) -> bool:
+        """
+        Check whether the class of a classifier has been imported.
+
+        Args:
+            name (str): Classifier name.
+
+        Returns:
+            bool: True if it was loaded.
+        """
+        return name in self._classes
+
+    def load(self, name: str) -> type:
+        """
+        Import the class of a classifier.
+
+        Args:
+            name (str): Classifier name.
+
+        Returns:
+            type: The Classifier subclass.
+
+        Raises:
+            Exception: If the classifier is not registered or its target is not a Classifier subclass.
+        """
+        if name not in self._classes:
+            target = self._get_target(name)
+            module, _, attribute = target.partition(":")
+            value = importlib.import_module(module)
+            for part in attribute.split("."):
+                value = getattr(value, part)
+            self._classes[name] = self._check(name, value)
+        return self._classes[name]
+
+    def create(self, name: str, **kwargs) -> Classifier:
+        """
+        Import a classifier and create an instance.
+
+        Args:
+            name (str): Classifier name.
+            **kwargs: Constructor arguments.
+
+        Returns:
+            Classifier: The new classifier.
+
+        Raises:
+            Exception: If the classifier is not registered or its target is not a Classifier subclass.
+        """
+        return self.load(name)(**kwargs)
+
+    def _get_target(self, name: str) -> str:
+        """
+        Get the target of a classifier.
+
+        Args:
+            name (str): Classifier name.
+
+        Returns:
+            str: Its 'module:ClassName' target.
+
+        Raises:
+            Exception: If the classifier is not registered.
+        """
+        if name not in self.targets:
+            raise Exception(UNKNOWN_CLASSIFIER_MESSAGE.format(names=", ".join(self.get_names()), name=name))
+        return self.targets[name]
+
+    def _check(self, name: str, value: object) -> type:
+        """
+        Check that a target is a Classifier subclass.
+
+        Args:
+            name (str): Classifier name.
+            value (object): Imported target.
+
+        Returns:
+            type: The target.
+
+        Raises:
+            Exception: If it is not a Classifier subclass.
+        """
+        if not isinstance(value, type) or not issubclass(value, Classifier):
+            raise Exception(WRONG_CLASSIFIER_MESSAGE.format(name=name, target=self.targets[name]))
+        return value
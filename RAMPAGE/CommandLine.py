@@ -0,0 +1,516 @@
+import argparse
+import functools
+import json
+import os
+import subprocess
+import sys
+import time
+import tomllib
+from typing import Optional
+from RAMPAGE.ClassifierRegistry import ClassifierRegistry
+
+
+# Error message templates
+WRONG_CONFIG_MESSAGE = """ERROR:
+
+Wrong configuration file...
+
+Possible formats: .toml, .json
+Path: {path}
+"""
+
+WRONG_CONFIG_KEY_MESSAGE = """ERROR:
+
+Wrong configuration value...
+
+Key: {key}
+Expected: {expected}
+"""
+
+WRONG_MODE_MESSAGE = """ERROR:
+
+Wrong run mode...
+
+Possible values: 'test', 'evaluate'
+Mode: {mode}
+"""
+
+# Modules measured by the imports command, besides the registered classifiers
+CORE_MODULES = ("RAMPAGE.CommandLine", "RAMPAGE.Framework", "RAMPAGE.ResultStore")
+
+# Code run in a fresh interpreter to time one import
+IMPORT_TIMER = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+class CommandLine:
+    """
+    The `rampage` command line, driven by a configuration file.
+
+    A configuration (TOML or JSON) describes the dataset files and split
+    percentages (and optional normalization), the classifiers to run with their constructor arguments,
+    plugin classifiers ('module:ClassName' targets) and the run options.
+    Classifiers are resolved through a ClassifierRegistry and only imported
+    when a command runs them; the framework, NumPy-based results and the
+    result store are imported inside the commands that use them. Listing
+    classifiers or querying results therefore starts without TensorFlow, and
+    the imports command measures it in fresh interpreters.
+
+    Attributes:
+        registry (ClassifierRegistry): Registry of the available classifiers.
+    """
+
+    def __init__(self, registry: Optional[ClassifierRegistry] = None) -> None:
+        """
+        Initialize the command line.
+
+        Args:
+            registry (ClassifierRegistry, optional): Registry to use. Defaults to None
+                (built-in classifiers and installed entry points).
+        """
+        self.registry = registry if registry is not None else ClassifierRegistry()
+
+    def run(self, argv: Optional[list[str]] = None) -> int:
+        """
+        Parse the arguments and run a command.
+
+        Args:
+            argv (list[str], optional): Arguments. Defaults to None (sys.argv).
+
+        Returns:
+            int: Exit status.
+        """
+        arguments = self._build_parser().parse_args(argv)
+        config_path = getattr(arguments, "config", None)
+        config = self.load_config(config_path) if config_path else {}
+        self._register_plugins(config, config_path)
+        return arguments.command(arguments, config)
+
+    @staticmethod
+    def load_config(path: str) -> dict:
+        """
+        Read a configuration file.
+
+        Args:
+            path (str): Path to a .toml or .json file.
+
+        Returns:
+            dict: The configuration.
+
+        Raises:
+            Exception: If the extension is not supported.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".toml":
+            with open(path, "rb") as f:
+                return tomllib.load(f)
+        if extension == ".json":
+            with open(path, "r") as f:
+                return json.load(f)
+        raise Exception(WRONG_CONFIG_MESSAGE.format(path=path))
+
+    def list_classifiers(self, arguments: argparse.Namespace, config: dict) -> int:
+        """
+        Print every registered classifier and its target, without importing them.
+
+        Returns:
+            int: Exit status.
+        """
+        for name in self.registry.get_names():
+            print(f"  {name:<24} {self.registry.targets[name]}")
+        return 0
+
+    def validate(self, arguments: argparse.Namespace, config: dict) -> int:
+        """
+        Load the datasets of a configuration and check its classifiers, without importing them.
+
+        Returns:
+            int: Exit status, 1 if a classifier module cannot be found.
+        """
+        from importlib.util import find_spec
+
+        framework = self._build_framework(config, arguments.config)
+        for dataset in framework.get_dataset_names() or [None]:
+            if dataset is not None:
+                framework.use_dataset_manager(dataset)
+                print(f"  dataset {dataset}:")
+            for name, split in (
+                ("TRAIN", framework.dataset_manager.get_train()),
+                ("VALIDATION", framework.dataset_manager.get_validation()),
+                ("TEST", framework.dataset_manager.get_test())
+            ):
+                dga = sum(1 for element in split if element.is_dga)
+                print(f"  {name:<10}: {len(split)} domains, {dga} DGA")
+
+        status = 0
+        for name, _ in self._get_classifier_specs(config):
+            module = self.registry.get_module(name)
+            found = find_spec(module) is not None
+            print(f"  classifier {name}: {module} {'found' if found else 'NOT FOUND'}")
+            status |= not found
+        return status
+
+    def run_config(self, arguments: argparse.Namespace, config: dict) -> int:
+        """
+        Train and test (or evaluate) the classifiers of a configuration and print their results.
+
+        Returns:
+            int: Exit status.
+
+        Raises:
+            Exception: If the run mode is not valid.
+        """
+        options = self._get_table(config, "run")
+        mode = options.get("mode", "test")
+        if mode not in ("test", "evaluate"):
+            raise Exception(WRONG_MODE_MESSAGE.format(mode=mode))
+
+        framework = self._build_framework(config, arguments.config)
+        if framework.get_dataset_names():
+            return self._run_matrix(framework, arguments, config, mode)
+
+        selected = set(arguments.classifier or [])
+        for name, kwargs in self._get_classifier_specs(config):
+            if not selected or name in selected:
+                start = time.perf_counter()
+                framework.add_classifier(self.registry.create(name, **kwargs))
+                framework.timings[-1]["load"] = time.perf_counter() - start
+
+        framework.train()
+        if mode == "evaluate":
+            framework.evaluate()
+        else:
+            framework.test()
+
+        rows = []
+        # Unique names, so a classifier listed twice with other arguments gets two distinct rows
+        names = framework.get_classifier_names()
+        for index, result in enumerate(framework.get_results()):
+            name = names[index]
+            print(f"\nClassifier: {name}")
+            print("-" * 40)
+            print(result)
+            print("  " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in framework.timings[index].items()))
+            rows.append((name, result))
+
+        output = options.get("output")
+        if output and rows:
+            with open(self._resolve(output, arguments.config), "w") as f:
+                f.write("classifier," + rows[0][1].get_csv_header(",") + "\n")
+                f.writelines(f"{name},{result.to_csv(',')}\n" for name, result in rows)
+        return 0
+
+    def _run_matrix(self, framework, arguments: argparse.Namespace, config: dict, mode: str) -> int:
+        """
+        Run the classifiers of a configuration on each of its named datasets and print the matrix.
+
+        Returns:
+            int: Exit status, 1 if a cell failed.
+        """
+        options = self._get_table(config, "run")
+        selected = set(arguments.classifier or [])
+        factories = {}
+        for name, kwargs in self._get_classifier_specs(config):
+            if not selected or name in selected:
+                # Repeated classifiers (e.g. with other arguments) get their position as suffix
+                label = name if name not in factories else f"{name}-{len(factories)}"
+                factories[label] = functools.partial(self.registry.create, name, **kwargs)
+
+        matrix = framework.run_matrix(
+            factories,
+            mode=mode,
+            workers=options.get("workers"),
+            exclusive=options.get("exclusive", True),
+            share_encodings=options.get("share_encodings", True)
+        )
+        print(matrix)
+        print()
+        print(matrix.format_metric(options.get("metric", "Accuracy")))
+
+        output = options.get("output")
+        if output:
+            with open(self._resolve(output, arguments.config), "w") as f:
+                f.writelines(row + "\n" for row in matrix.get_csv_rows(","))
+        return 1 if matrix.errors else 0
+
+    def results(self, arguments: argparse.Namespace, config: dict) -> int:
+        """
+        Print a leaderboard or the trend of a classifier from a result store.
+
+        Returns:
+            int: Exit status.
+        """
+        from RAMPAGE.ResultStore import ResultStore
+
+        store = ResultStore(arguments.database)
+        try:
+            if arguments.trend:
+                for run_id, created, value in store.trend(arguments.trend, arguments.metric, arguments.limit):
+                    print(f"  run {run_id:<6} {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created))}  {value}")
+            else:
+                leaderboard = store.leaderboard(arguments.metric, arguments.limit, not arguments.ascending)
+                for position, (classifier, value, run_id) in enumerate(leaderboard, start=1):
+                    print(f"  {position:>3}. {classifier:<24} {value:<12.6g} run {run_id}")
+        finally:
+            store.close()
+        return 0
+
+    def measure_imports(self, arguments: argparse.Namespace, config: dict) -> int:
+        """
+        Measure the import time of the core modules and of every registered classifier.
+
+        Every import is timed in a fresh interpreter (the best of several
+        repeats), as is the startup of `rampage list`.
+
+        Returns:
+            int: Exit status.
+        """
+        from RAMPAGE.Result import Result
+
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(sys.path[1:])
+        modules = list(CORE_MODULES) + sorted({self.registry.get_module(name) for name in self.registry.get_names()})
+
+        result = Result()
+        for module in modules:
+            seconds = []
+            for _ in range(arguments.repeat):
+                process = subprocess.run(
+                    [sys.executable, "-c", IMPORT_TIMER.format(module=module)],
+                    capture_output=True, text=True, env=environment
+                )
+                seconds.append(float(process.stdout) if process.returncode == 0 else float("nan"))
+            result.add_metric(f"import {module}", min(seconds))
+
+        seconds = []
+        for _ in range(arguments.repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "RAMPAGE", "list"], capture_output=True, env=environment)
+            seconds.append(time.perf_counter() - start)
+        result.add_metric("startup rampage list", min(seconds))
+
+        print(result)
+        return 0
+
+    def _build_parser(self) -> argparse.ArgumentParser:
+        """
+        Build the argument parser, every command stores its method in 'command'.
+
+        Returns:
+            argparse.ArgumentParser: The parser.
+        """
+        parser = argparse.ArgumentParser(prog="rampage", description="DGA classifier experiments.")
+        commands = parser.add_subparsers(required=True, metavar="command")
+
+        command = commands.add_parser("list", help="list the available classifiers")
+        command.add_argument("--config", help="configuration with plugin classifiers")
+        command.set_defaults(command=self.list_classifiers)
+
+        command = commands.add_parser("validate", help="load the datasets and check the classifiers")
+        command.add_argument("config", help="configuration file (.toml or .json)")
+        command.set_defaults(command=self.validate)
+
+        command = commands.add_parser("run", help="train and test the classifiers of a configuration")
+        command.add_argument("config", help="configuration file (.toml or .json)")
+        command.add_argument("--classifier", action="append", help="only run this classifier (repeatable)")
+        command.set_defaults(command=self.run_config)
+
+        command = commands.add_parser("results", help="query a result store")
+        command.add_argument("database", help="result store (SQLite file)")
+        command.add_argument("--metric", default="Accuracy", help="metric name (default: Accuracy)")
+        command.add_argument("--limit", type=int, default=10, help="number of rows (default: 10)")
+        command.add_argument("--ascending", action="store_true", help="lower is better (e.g. FPR)")
+        command.add_argument("--trend", metavar="CLASSIFIER", help="show the runs of a classifier instead")
+        command.set_defaults(command=self.results)
+
+        command = commands.add_parser("imports", help="measure import and startup times")
+        command.add_argument("--config", help="configuration with plugin classifiers")
+        command.add_argument("--repeat", type=int, default=3, help="repeats per measure (default: 3)")
+        command.set_defaults(command=self.measure_imports)
+
+        return parser
+
+    def _register_plugins(self, config: dict, config_path: Optional[str]) -> None:
+        """
+        Add the plugin search paths of a configuration to sys.path and register its plugins.
+
+        Args:
+            config (dict): The configuration.
+            config_path (str): Path of the configuration, paths are relative to it.
+        """
+        paths = config.get("paths", [])
+        if not isinstance(paths, list):
+            raise Exception(WRONG_CONFIG_KEY_MESSAGE.format(key="paths", expected="list of directories"))
+        for path in reversed(paths):
+            sys.path.insert(1, self._resolve(path, config_path))
+        for name, target in self._get_table(config, "plugins").items():
+            self.registry.register(name, target)
+
+    def _build_framework(self, config: dict, config_path: str):
+        """
+        Create a framework and load the datasets of a configuration.
+
+        Args:
+            config (dict): The configuration.
+            config_path (str): Path of the configuration, paths are relative to it.
+
+        Returns:
+            Framework: The framework with its datasets loaded.
+        """
+        from RAMPAGE.Framework import Framework
+
+        options = self._get_table(config, "run")
+        framework = Framework(debug_mode=options.get("debug", False))
+        if "memory_budget" in options:
+            spill_dir = options.get("spill_dir")
+            framework.set_memory_budget(
+                options["memory_budget"],
+                self._resolve(spill_dir, config_path) if spill_dir else None
+            )
+        if "result_store" in options:
+            from RAMPAGE.ResultStore import ResultStore
+            framework.set_result_store(ResultStore(self._resolve(options["result_store"], config_path)))
+
+        if "benchmark" in config:
+            from RAMPAGE.InferenceBenchmark import InferenceBenchmark
+            framework.set_benchmark(InferenceBenchmark(**self._get_table(config, "benchmark")))
+
+        # Named [datasets.<name>] tables are the columns of a matrix run
+        datasets = self._get_table(config, "datasets")
+        if datasets:
+            for name, dataset in datasets.items():
+                if not isinstance(dataset, dict):
+                    raise Exception(WRONG_CONFIG_KEY_MESSAGE.format(key=f"datasets.{name}", expected="table"))
+                framework.add_dataset_manager(name, self._build_dataset_manager(dataset, config_path))
+                self._load_dataset(framework, dataset, config_path)
+        else:
+            dataset = self._get_table(config, "dataset")
+            framework.set_dataset_manager(self._build_dataset_manager(dataset, config_path))
+            self._load_dataset(framework, dataset, config_path)
+        return framework
+
+    def _build_dataset_manager(self, dataset: dict, config_path: str):
+        """
+        Create the dataset manager of a dataset table.
+
+        Args:
+            dataset (dict): The dataset table.
+            config_path (str): Path of the configuration, paths are relative to it.
+
+        Returns:
+            DatasetManager: The empty dataset manager.
+        """
+        from RAMPAGE.DatasetManager import DatasetManager
+
+        dataset_manager = DatasetManager()
+        if "percentages" in dataset:
+            dataset_manager.set_percentages(*dataset["percentages"])
+        if dataset.get("normalize", False):
+            from RAMPAGE.DomainNormalizer import DomainNormalizer
+            suffix_file = dataset.get("suffix_file")
+            dataset_manager.set_normalizer(DomainNormalizer(
+                self._resolve(suffix_file, config_path) if suffix_file else None
+            ))
+        return dataset_manager
+
+    def _load_dataset(self, framework, dataset: dict, config_path: str) -> None:
+        """
+        Load the files of a dataset table into the current dataset manager of a framework.
+
+        Args:
+            framework (Framework): The framework.
+            dataset (dict): The dataset table.
+            config_path (str): Path of the configuration, paths are relative to it.
+        """
+        for path in dataset.get("files", []):
+            framework.add_dataset(self._resolve(path, config_path), dataset.get("random", True))
+        if "logs" in dataset:
+            from RAMPAGE.DnsQueryReader import DnsQueryReader
+            reader_options = dict(dataset.get("reader", {}))
+            for key in ("dga_path", "benign_path"):
+                if key in reader_options:
+                    reader_options[key] = self._resolve(reader_options[key], config_path)
+            reader = DnsQueryReader(normalizer=framework.dataset_manager.normalizer, **reader_options)
+            for path in dataset["logs"]:
+                framework.add_dataset(self._resolve(path, config_path), dataset.get("random", True), reader)
+        for path in dataset.get("train", []):
+            framework.add_train_dataset(self._resolve(path, config_path))
+        for path in dataset.get("validation", []):
+            framework.add_validation_dataset(self._resolve(path, config_path))
+        for path in dataset.get("test", []):
+            framework.add_test_dataset(self._resolve(path, config_path))
+
+    @staticmethod
+    def _get_classifier_specs(config: dict) -> list[tuple[str, dict]]:
+        """
+        Get the classifiers of a configuration.
+
+        Entries are either a name or a table with 'name' and optional 'args'.
+
+        Args:
+            config (dict): The configuration.
+
+        Returns:
+            list[tuple[str, dict]]: Name and constructor arguments of every classifier.
+        """
+        specs = []
+        for entry in config.get("classifiers", []):
+            if isinstance(entry, str):
+                specs.append((entry, {}))
+            elif isinstance(entry, dict) and "name" in entry:
+                specs.append((entry["name"], dict(entry.get("args", {}))))
+            else:
+                raise Exception(WRONG_CONFIG_KEY_MESSAGE.format(key="classifiers", expected="name or {name, args} table"))
+        return specs
+
+    @staticmethod
+    def _get_table(config: dict, key: str) -> dict:
+        """
+        Get a table of a configuration.
+
+        Args:
+            config (dict): The configuration.
+            key (str): Table name.
+
+        Returns:
+            dict: The table, empty if missing.
+
+        Raises:
+            Exception: If the value is not a table.
+        """
+        table = config.get(key, {})
+        if not isinstance(table, dict):
+            raise Exception(WRONG_CONFIG_KEY_MESSAGE.format(key=key, expected="table"))
+        return table
+
+    @staticmethod
+    def _resolve(path: str, config_path: Optional[str]) -> str:
+        """
+        Resolve a path relative to the directory of the configuration.
+
+        Args:
+            path (str): The path.
+            config_path (str): Path of the configuration, or None.
+
+        Returns:
+            str: The resolved path.
+        """
+        if config_path is None or os.path.isabs(path):
+            return path
+        return os.path.join(os.path.dirname(os.path.abspath(config_path)), path)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point of the `rampage` console script.
+
+    Args:
+        argv (list[str], optional): Arguments. Defaults to None (sys.argv).
+
+    Returns:
+        int: Exit status.
+    """
+    try:
+        return CommandLine().run(argv)
+    except Exception as error:
+        print(error, file=sys.stderr)
+        return 1
@@ -0,0 +1,322 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import numpy as np
+from RAMPAGE.ConfusionResult import ConfusionResult, METRIC_NAMES
+from RAMPAGE.Result import Result
+from RAMPAGE.ScoreResult import ScoreResult
+
+
+# Error message templates
+WRONG_RESULTS_MESSAGE = """ERROR:
+
+Results are not comparable...
+
+Every result must be a ScoreResult of the same test set, in the same order
+Result: {name}
+"""
+
+UNKNOWN_RESULT_MESSAGE = """ERROR:
+
+Unknown result...
+
+Possible values: {names}
+Result: {name}
+"""
+
+# Resamples drawn by every task, fixed so results only depend on the seed
+RESAMPLES_PER_TASK = 128
+
+# Below this number of discordant pairs McNemar uses the exact binomial test
+MCNEMAR_EXACT_LIMIT = 50
+
+
+class Comparison:
+    """
+    Confidence intervals and paired significance tests between classifiers.
+
+    It works on the stored per-domain scores of several classifiers over the
+    same test set (ScoreResult), so no model is loaded. Every domain falls in a
+    cell given by its label, its prediction and a quantile bin of its score.
+    Resampling n domains with replacement is the same as drawing the n domains
+    from a multinomial distribution over those cells, so every bootstrap
+    resample is a row of cell counts and the metrics of thousands of resamples
+    are computed at once as NumPy column operations, whatever the size of the
+    test set. Tasks of RESAMPLES_PER_TASK resamples run in a thread pool, each
+    one with its own seed.
+
+    Metrics that only depend on the confusion matrix are resampled exactly;
+    the resampled AUC counts ties within a score bin as half, so its interval
+    gets closer to the exact one as the number of bins grows.
+
+    Attributes:
+        results (dict[str, ScoreResult]): Results by classifier name.
+        labels (np.ndarray): Boolean ground truth shared by every result.
+        resamples (int): Number of bootstrap resamples.
+        confidence (float): Confidence level of the intervals.
+        bins (int): Score bins per classifier for confidence intervals.
+        paired_bins (int): Score bins per classifier for paired tests.
+        seed (int): Seed of the resamples.
+        workers (int): Number of threads.
+    """
+
+    def __init__(
+        self,
+        results: dict[str, ScoreResult],
+        resamples: int = 2000,
+        confidence: float = 0.95,
+        bins: int = 256,
+        paired_bins: int = 32,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> None:
+        """
+        Initialize the comparison.
+
+        Args:
+            results (dict[str, ScoreResult]): Results of the same test set by classifier name.
+            resamples (int, optional): Number of bootstrap resamples. Defaults to 2000.
+            confidence (float, optional): Confidence level of the intervals. Defaults to 0.95.
+            bins (int, optional): Score bins per classifier for confidence intervals. Defaults to 256.
+            paired_bins (int, optional): Score bins per classifier for paired tests. Defaults to 32.
+            seed (int, optional): Seed of the resamples. Defaults to None.
+            workers (int, optional): Number of threads. Defaults to None (one per core).
+
+        Raises:
+            Exception: If a result is not a ScoreResult or its labels differ from the others.
+        """
+        self.results = dict(results)
+        self.labels = None
+        for name, result in self.results.items():
+            if not isinstance(result, ScoreResult):
+                raise Exception(WRONG_RESULTS_MESSAGE.format(name=name))
+            if self.labels is None:
+                self.labels = result.labels
+            elif not np.array_equal(self.labels, result.labels):
+                raise Exception(WRONG_RESULTS_MESSAGE.format(name=name))
+
+        self.resamples = resamples
+        self.confidence = confidence
+        self.bins = bins
+        self.paired_bins = paired_bins
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+
+    def confidence_intervals(self) -> dict[str, Result]:
+        """
+        Calculate a bootstrap confidence interval for every metric of every classifier.
+
+        Returns:
+            dict[str, Result]: By classifier name, a result with the point estimate of every
+                metric followed by its "low" and "high" bounds.
+        """
+        intervals = {}
+        for name, result in self.results.items():
+            counts = np.bincount(self._cells(result, self.bins), minlength=self.bins * 4)
+            samples = self._bootstrap(counts, lambda rows: _metrics(rows.reshape(len(rows), self.bins, 2, 2)))
+            low, high = self._bounds(samples)
+
+            interval = Result()
+            for index, (metric, value) in enumerate(result.get_metrics()[:len(METRIC_NAMES)]):
+                interval.add_metric(metric, value)
+                interval.add_metric(f"{metric} low", float(low[index]))
+                interval.add_metric(f"{metric} high", float(high[index]))
+            intervals[name] = interval
+        return intervals
+
+    def mcnemar(self, name_a: str, name_b: str) -> tuple[float, float]:
+        """
+        Run McNemar's test on the predictions of two classifiers.
+
+        Below MCNEMAR_EXACT_LIMIT discordant domains it uses the exact binomial
+        test, otherwise the chi-squared statistic with continuity correction.
+
+        Args:
+            name_a (str): First classifier.
+            name_b (str): Second classifier.
+
+        Returns:
+            tuple[float, float]: Statistic (discordant count or chi-squared) and two-sided p-value.
+
+        Raises:
+            Exception: If a name is unknown.
+        """
+        result_a, result_b = self._get_result(name_a), self._get_result(name_b)
+        correct_a = (result_a.scores > result_a.threshold) == self.labels
+        correct_b = (result_b.scores > result_b.threshold) == self.labels
+        only_a = int(np.count_nonzero(correct_a & ~correct_b))
+        only_b = int(np.count_nonzero(~correct_a & correct_b))
+        discordant = only_a + only_b
+
+        if discordant == 0:
+            return 0.0, 1.0
+        if discordant < MCNEMAR_EXACT_LIMIT:
+            smallest = min(only_a, only_b)
+            tail = sum(math.comb(discordant, k) for k in range(smallest + 1)) / 2 ** discordant
+            return float(smallest), min(1.0, 2 * tail)
+        statistic = (abs(only_a - only_b) - 1) ** 2 / discordant
+        return float(statistic), math.erfc(math.sqrt(statistic / 2))
+
+    def paired_bootstrap(self, name_a: str, name_b: str) -> Result:
+        """
+        Run a paired bootstrap of the difference of every metric between two classifiers.
+
+        Both classifiers are evaluated on the same resampled domains.
+
+        Args:
+            name_a (str): First classifier.
+            name_b (str): Second classifier.
+
+        Returns:
+            Result: For every metric, the observed difference (a - b), its confidence
+                interval bounds and the two-sided p-value of no difference.
+
+        Raises:
+            Exception: If a name is unknown.
+        """
+        result_a, result_b = self._get_result(name_a), self._get_result(name_b)
+        bins = self.paired_bins
+        # Joint cell (cell of a, cell of b), the label bit is shared
+        cells_a = self._cells(result_a, bins)
+        cells_b = self._cells(result_b, bins) >> 1
+        counts = np.bincount(cells_b * (bins * 4) + cells_a, minlength=bins * bins * 8)
+
+        def differences(rows: np.ndarray) -> np.ndarray:
+            joint = rows.reshape(len(rows), bins * 2, bins * 4)
+            metrics_a = _metrics(joint.sum(axis=1).reshape(len(rows), bins, 2, 2))
+            metrics_b = _metrics(joint.reshape(len(rows), bins * 2, bins * 2, 2).sum(axis=2).reshape(len(rows), bins, 2, 2))
+            return metrics_a - metrics_b
+
+        samples = self._bootstrap(counts, differences)
+        low, high = self._bounds(samples)
+        below = (samples <= 0).mean(axis=0)
+        above = (samples >= 0).mean(axis=0)
+
+        comparison = Result()
+        metrics_a, metrics_b = result_a.get_metrics(), result_b.get_metrics()
+        for index, metric in enumerate(METRIC_NAMES):
+            comparison.add_metric(f"{metric} diff", metrics_a[index][1] - metrics_b[index][1])
+            comparison.add_metric(f"{metric} diff low", float(low[index]))
+            comparison.add_metric(f"{metric} diff high", float(high[index]))
+            comparison.add_metric(f"{metric} p-value", float(min(1.0, 2 * min(below[index], above[index]))))
+        return comparison
+
+    def compare(self, name_a: str, name_b: str) -> Result:
+        """
+        Run McNemar's test and the paired bootstrap between two classifiers.
+
+        Args:
+            name_a (str): First classifier.
+            name_b (str): Second classifier.
+
+        Returns:
+            Result: McNemar statistic and p-value followed by the paired bootstrap metrics.
+
+        Raises:
+            Exception: If a name is unknown.
+        """
+        statistic, p_value = self.mcnemar(name_a, name_b)
+        comparison = Result()
+        comparison.add_metric("McNemar", statistic)
+        comparison.add_metric("McNemar p-value", p_value)
+        for metric, value in self.paired_bootstrap(name_a, name_b).get_metrics():
+            comparison.add_metric(metric, value)
+        return comparison
+
+    def _get_result(self, name: str) -> ScoreResult:
+        """
+        Get the result of a classifier.
+
+        Args:
+            name (str): Classifier name.
+
+        Returns:
+            ScoreResult: Its result.
+
+        Raises:
+            Exception: If the name is unknown.
+        """
+        if name not in self.results:
+            raise Exception(UNKNOWN_RESULT_MESSAGE.format(names=", ".join(self.results), name=name))
+        return self.results[name]
+
+    def _cells(self, result: ScoreResult, bins: int) -> np.ndarray:
+        """
+        Assign every domain to a (score bin, prediction, label) cell.
+
+        Args:
+            result (ScoreResult): The result.
+            bins (int): Number of score quantile bins.
+
+        Returns:
+            np.ndarray: Cell index of every domain, bin * 4 + prediction * 2 + label.
+        """
+        scores = result.scores
+        edges = np.unique(np.quantile(scores, np.linspace(0, 1, bins + 1)[1:-1])) if len(scores) else []
+        score_bins = np.searchsorted(edges, scores, side="right").astype(np.int64)
+        return score_bins * 4 + (scores > result.threshold) * 2 + self.labels
+
+    def _bootstrap(self, counts: np.ndarray, statistic) -> np.ndarray:
+        """
+        Draw the bootstrap resamples of some cell counts and apply a statistic to them.
+
+        Args:
+            counts (np.ndarray): Observed count of every cell.
+            statistic (callable): Maps a (resamples, cells) count matrix to a (resamples, metrics) matrix.
+
+        Returns:
+            np.ndarray: (resamples, metrics) matrix.
+        """
+        total = int(counts.sum())
+        probabilities = counts / max(total, 1)
+        sizes = [min(RESAMPLES_PER_TASK, self.resamples - start) for start in range(0, self.resamples, RESAMPLES_PER_TASK)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        def task(size: int, seed: np.random.SeedSequence) -> np.ndarray:
+            rows = np.random.default_rng(seed).multinomial(total, probabilities, size=size)
+            return statistic(rows)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return np.concatenate(list(executor.map(task, sizes, seeds)))
+
+    def _bounds(self, samples: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the percentile interval of every metric.
+
+        Args:
+            samples (np.ndarray): (resamples, metrics) matrix.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Lower and upper bound of every metric.
+        """
+        alpha = (1 - self.confidence) / 2
+        low, high = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+        return low, high
+
+
+def _metrics(counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the ConfusionResult metrics of many count tables at once.
+
+    Args:
+        counts (np.ndarray): (resamples, bins, prediction, label) counts, bins by increasing score.
+
+    Returns:
+        np.ndarray: (resamples, metrics) matrix in METRIC_NAMES order.
+    """
+    counts = counts.astype(np.float64)
+    tp = counts[:, :, 1, 1].sum(axis=1)
+    tn = counts[:, :, 0, 0].sum(axis=1)
+    fp = counts[:, :, 1, 0].sum(axis=1)
+    fn = counts[:, :, 0, 1].sum(axis=1)
+
+    # Rank-sum AUC over the score bins, ties within a bin count half
+    positives = counts[:, :, :, 1].sum(axis=2)
+    negatives = counts[:, :, :, 0].sum(axis=2)
+    below = np.cumsum(negatives, axis=1) - negatives
+    pairs = positives.sum(axis=1) * negatives.sum(axis=1)
+    ranked = (positives * (below + negatives / 2)).sum(axis=1)
+    auc = np.divide(ranked, pairs, out=np.zeros_like(ranked), where=pairs != 0)
+
+    return ConfusionResult.metrics_table(tp, tn, fp, fn, auc)
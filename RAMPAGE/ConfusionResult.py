@@ -0,0 +1,164 @@
+import numpy as np
+from RAMPAGE.Result import Result
+
+
+# Reported metrics, in order
+METRIC_NAMES = (
+    "Accuracy", "Precision", "Recall", "F1 score", "FPR", "TPR", "AUC",
+    "FP", "FN", "TP", "TN", "MCC", "Kappa"
+)
+
+class ConfusionResult(Result):
+    """
+    A class to compute common classification metrics from a confusion matrix.
+
+    It reports the metrics of METRIC_NAMES, with accuracy, precision and
+    recall as percentages, and is the base of the results of the example
+    classifiers (ScoreResult), so every classifier reports the same metrics.
+
+    Attributes:
+        tp (int): Number of true positives.
+        tn (int): Number of true negatives.
+        fp (int): Number of false positives.
+        fn (int): Number of false negatives.
+        auc (float): Area under the ROC curve.
+    """
+
+    def __init__(self, tp: int, tn: int, fp: int, fn: int, auc: float) -> None:
+        """
+        Initialize ConfusionResult and calculate all metrics.
+
+        Args:
+            tp (int): Number of true positives.
+            tn (int): Number of true negatives.
+            fp (int): Number of false positives.
+            fn (int): Number of false negatives.
+            auc (float): Area under the ROC curve.
+        """
+        super().__init__()
+        self.tp = int(tp)
+        self.tn = int(tn)
+        self.fp = int(fp)
+        self.fn = int(fn)
+        self.auc = float(auc)
+
+        for name, value in self._calculate_metrics():
+            self.add_metric(name, value)
+
+    @classmethod
+    def from_scores(cls, labels: np.ndarray, scores: np.ndarray, threshold: float = 0.5) -> "ConfusionResult":
+        """
+        Build the result from labels and scores in one vectorized pass.
+
+        Args:
+            labels (np.ndarray): 1 for DGA domains and 0 otherwise.
+            scores (np.ndarray): DGA score of every domain.
+            threshold (float, optional): Scores above it are DGA. Defaults to 0.5.
+
+        Returns:
+            ConfusionResult: The result.
+        """
+        labels = np.asarray(labels).astype(bool)
+        scores = np.asarray(scores, dtype=np.float64)
+        tp, tn, fp, fn = cls.confusion_counts(labels, scores > threshold)
+        return cls(tp, tn, fp, fn, cls.roc_auc(labels, scores))
+
+    @staticmethod
+    def confusion_counts(labels: np.ndarray, predictions: np.ndarray) -> tuple[int, int, int, int]:
+        """
+        Count true/false positives/negatives.
+
+        Args:
+            labels (np.ndarray): Boolean ground truth.
+            predictions (np.ndarray): Boolean predictions.
+
+        Returns:
+            tuple[int, int, int, int]: tp, tn, fp and fn.
+        """
+        # Cell index: 0 tn, 1 fp, 2 fn, 3 tp
+        cells = np.bincount(labels.astype(np.int64) * 2 + predictions.astype(np.int64), minlength=4)
+        tn, fp, fn, tp = (int(count) for count in cells)
+        return tp, tn, fp, fn
+
+    @staticmethod
+    def roc_auc(labels: np.ndarray, scores: np.ndarray) -> float:
+        """
+        Calculate the exact ROC AUC with the rank-sum formulation (ties count half).
+
+        Args:
+            labels (np.ndarray): Boolean ground truth.
+            scores (np.ndarray): Scores.
+
+        Returns:
+            float: ROC AUC, or 0.0 if one of the classes is missing.
+        """
+        positives = int(labels.sum())
+        negatives = len(labels) - positives
+        if positives == 0 or negatives == 0:
+            return 0.0
+
+        order = np.argsort(scores, kind="mergesort")
+        sorted_scores = scores[order]
+        # Average rank of every group of tied scores
+        group_starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+        group_sizes = np.diff(np.r_[group_starts, len(scores)])
+        group_ranks = group_starts + (group_sizes + 1) / 2
+        ranks = np.repeat(group_ranks, group_sizes)
+
+        rank_sum = ranks[labels[order]].sum()
+        return float((rank_sum - positives * (positives + 1) / 2) / (positives * negatives))
+
+    @staticmethod
+    def metrics_table(tp: np.ndarray, tn: np.ndarray, fp: np.ndarray, fn: np.ndarray, auc: np.ndarray) -> np.ndarray:
+        """
+        Calculate the metrics of many confusion matrices at once.
+
+        Every column gives the same value as the result built from the same
+        counts, so large groups of results (slices, bootstrap resamples) are
+        computed with NumPy column operations instead of one object each.
+
+        Args:
+            tp (np.ndarray): True positives of every matrix.
+            tn (np.ndarray): True negatives of every matrix.
+            fp (np.ndarray): False positives of every matrix.
+            fn (np.ndarray): False negatives of every matrix.
+            auc (np.ndarray): ROC AUC of every matrix.
+
+        Returns:
+            np.ndarray: (matrices, metrics) float64 matrix in METRIC_NAMES order.
+        """
+        tp, tn, fp, fn = (np.asarray(count, dtype=np.float64) for count in (tp, tn, fp, fn))
+        total = tp + tn + fp + fn
+
+        def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+            return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+        accuracy = ratio(tp + tn, total) * 100
+        precision = ratio(tp, tp + fp) * 100
+        recall = ratio(tp, tp + fn) * 100
+        f1 = ratio(2 * precision * recall, precision + recall)
+        mcc = ratio(tp * tn - fp * fn, np.sqrt((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn)))
+
+        p0 = ratio(tn + tp, total)
+        pe = p0 * ratio(tn + fn, total) + ratio(fn + tp, total) * ratio(fp + tp, total)
+        kappa = np.where((pe != 1) & (total != 0), ratio(p0 - pe, 1 - pe), 0.0)
+
+        return np.stack([
+            accuracy, precision, recall, f1, ratio(fp, fp + tn), ratio(tp, tp + fn),
+            np.broadcast_to(np.asarray(auc, dtype=np.float64), tp.shape),
+            fp, fn, tp, tn, mcc, kappa
+        ], axis=1)
+
+    def _calculate_metrics(self) -> list[tuple[str, float]]:
+        """
+        Calculate all metrics in METRIC_NAMES order.
+
+        The values come from metrics_table, so a single result and a table of
+        many results are always computed by the same code.
+
+        Returns:
+            list[tuple[str, float]]: (name, value) pairs.
+        """
+        row = self.metrics_table([self.tp], [self.tn], [self.fp], [self.fn], [self.auc])[0].tolist()
+        counts = {"FP": self.fp, "FN": self.fn, "TP": self.tp, "TN": self.tn}
+        return [(name, counts.get(name, value)) for name, value in zip(METRIC_NAMES, row)]
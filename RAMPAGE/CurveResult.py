@@ -0,0 +1,336 @@
+from typing import Optional
+import numpy as np
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_TARGET_FPR_MESSAGE = """ERROR:
+
+Wrong target false positive rate...
+
+Possible values: 0 <= target_fpr <= 1
+Target false positive rate: {target_fpr}
+"""
+
+# False positive rates reported by default
+DEFAULT_FPR_TARGETS = (1e-4, 1e-3, 1e-2)
+
+
+class CurveResult(Result):
+    """
+    ROC and precision-recall curves of a scored test set.
+
+    Every operating point is stored as the exact number of true and false
+    positives reached by one threshold, so rates, precision and areas are
+    derived from integer counts. The curve is computed with a single sort of
+    the scores (O(n log n)) and may be reduced to a fixed number of points,
+    which are still exact operating points, before being saved.
+
+    A point with threshold t classifies as DGA the scores above t, as every
+    other result does, so the thresholds it returns can be used directly.
+
+    Attributes:
+        thresholds (np.ndarray): float32 threshold of every point, decreasing.
+        tps (np.ndarray): True positives of every point, non-decreasing.
+        fps (np.ndarray): False positives of every point, non-decreasing.
+        positives (int): Number of DGA domains.
+        negatives (int): Number of legitimate domains.
+        fpr_targets (tuple[float, ...]): False positive rates reported as metrics.
+    """
+
+    def __init__(
+        self,
+        thresholds: np.ndarray,
+        tps: np.ndarray,
+        fps: np.ndarray,
+        positives: int,
+        negatives: int,
+        fpr_targets: tuple[float, ...] = DEFAULT_FPR_TARGETS
+    ) -> None:
+        """
+        Initialize CurveResult from its operating points and calculate its metrics.
+
+        Args:
+            thresholds (np.ndarray): Threshold of every point, decreasing.
+            tps (np.ndarray): True positives of every point.
+            fps (np.ndarray): False positives of every point.
+            positives (int): Number of DGA domains.
+            negatives (int): Number of legitimate domains.
+            fpr_targets (tuple[float, ...], optional): False positive rates reported as metrics.
+                Defaults to (1e-4, 1e-3, 1e-2).
+        """
+        super().__init__()
+        self.thresholds = np.asarray(thresholds, dtype=np.float32)
+        self.tps = np.asarray(tps, dtype=np.int64)
+        self.fps = np.asarray(fps, dtype=np.int64)
+        self.positives = int(positives)
+        self.negatives = int(negatives)
+        self.fpr_targets = tuple(fpr_targets)
+
+        self.add_metric("AUC", self.roc_auc())
+        self.add_metric("AP", self.average_precision())
+        for target in self.fpr_targets:
+            self.add_metric(f"TPR@FPR={target:g}", self.tpr_at_fpr(target))
+            self.add_metric(f"Threshold@FPR={target:g}", self.threshold_at_fpr(target))
+        self.add_metric("Points", len(self.thresholds))
+
+    @classmethod
+    def from_scores(
+        cls,
+        labels: np.ndarray,
+        scores: np.ndarray,
+        max_points: Optional[int] = None,
+        fpr_targets: tuple[float, ...] = DEFAULT_FPR_TARGETS
+    ) -> "CurveResult":
+        """
+        Build the curves from labels and scores with one sort.
+
+        Args:
+            labels (np.ndarray): 1 for DGA domains and 0 otherwise.
+            scores (np.ndarray): DGA score of every domain.
+            max_points (int, optional): Keep about this many points. Defaults to None (every threshold).
+            fpr_targets (tuple[float, ...], optional): False positive rates reported as metrics.
+                Defaults to (1e-4, 1e-3, 1e-2).
+
+        Returns:
+            CurveResult: The curves.
+        """
+        labels = np.asarray(labels).astype(bool).ravel()
+        scores = np.asarray(scores, dtype=np.float32).ravel()
+
+        order = np.argsort(scores, kind="stable")[::-1]
+        sorted_scores = scores[order]
+        # Last position of every group of tied scores, highest scores first
+        ends = np.flatnonzero(np.r_[sorted_scores[1:] != sorted_scores[:-1], True])[:len(scores)]
+        tps = np.cumsum(labels[order], dtype=np.int64)[ends]
+        fps = ends + 1 - tps
+
+        # Point k flags every score down to the k-th distinct one: threshold just below it.
+        # The first point flags nothing.
+        top = sorted_scores[:1] if len(scores) else np.array([np.inf], dtype=np.float32)
+        thresholds = np.r_[top, np.nextafter(sorted_scores[ends], np.float32(-np.inf))]
+        tps = np.r_[0, tps]
+        fps = np.r_[0, fps]
+
+        positives = int(labels.sum())
+        curve = cls(thresholds, tps, fps, positives, len(labels) - positives, fpr_targets)
+        return curve.downsample(max_points) if max_points is not None else curve
+
+    def downsample(self, max_points: int) -> "CurveResult":
+        """
+        Keep about max_points of the operating points.
+
+        Points are picked on a logarithmic false positive rate grid, where
+        thresholds for low false positive rates are chosen, and on linear grids
+        of both rates. The extremes are always kept.
+
+        Args:
+            max_points (int): Approximate number of points to keep.
+
+        Returns:
+            CurveResult: The reduced curves, or the same ones if they are already small enough.
+        """
+        if len(self.thresholds) <= max_points:
+            return self
+
+        steps = max(max_points // 3, 2)
+        smallest = 1 / max(self.negatives, 1)
+        fpr_grid = np.r_[np.geomspace(smallest, 1, steps), np.linspace(0, 1, steps)]
+        tpr_grid = np.linspace(0, 1, steps)
+        # Best point of every grid cell: last one at or below its rate
+        keep = np.unique(np.r_[
+            0,
+            np.searchsorted(self.get_fpr(), fpr_grid, side="right") - 1,
+            np.searchsorted(self.get_tpr(), tpr_grid, side="right") - 1,
+            len(self.thresholds) - 1
+        ])
+        keep = keep[keep >= 0]
+        return CurveResult(
+            self.thresholds[keep],
+            self.tps[keep],
+            self.fps[keep],
+            self.positives,
+            self.negatives,
+            self.fpr_targets
+        )
+
+    def get_fpr(self) -> np.ndarray:
+        """
+        Get the false positive rate of every point.
+
+        Returns:
+            np.ndarray: False positive rates.
+        """
+        return self.fps / max(self.negatives, 1)
+
+    def get_tpr(self) -> np.ndarray:
+        """
+        Get the true positive rate (recall) of every point.
+
+        Returns:
+            np.ndarray: True positive rates.
+        """
+        return self.tps / max(self.positives, 1)
+
+    def get_precision(self) -> np.ndarray:
+        """
+        Get the precision of every point. The point that flags nothing has precision 1.
+
+        Returns:
+            np.ndarray: Precisions.
+        """
+        flagged = self.tps + self.fps
+        return np.divide(self.tps, flagged, out=np.ones(len(flagged)), where=flagged != 0)
+
+    def get_roc(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the ROC curve.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: False positive rates, true positive rates and thresholds.
+        """
+        return self.get_fpr(), self.get_tpr(), self.thresholds
+
+    def get_pr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the precision-recall curve.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Precisions, recalls and thresholds.
+        """
+        return self.get_precision(), self.get_tpr(), self.thresholds
+
+    def roc_auc(self) -> float:
+        """
+        Calculate the area under the ROC curve with the trapezoidal rule.
+
+        With every point kept it equals the rank-sum AUC (ties count half).
+
+        Returns:
+            float: ROC AUC, or 0.0 if one of the classes is missing.
+        """
+        if self.positives == 0 or self.negatives == 0:
+            return 0.0
+        fpr, tpr = self.get_fpr(), self.get_tpr()
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def average_precision(self) -> float:
+        """
+        Calculate the average precision (area under the precision-recall step curve).
+
+        Returns:
+            float: Average precision, or 0.0 if there are no DGA domains.
+        """
+        if self.positives == 0:
+            return 0.0
+        return float(np.sum(np.diff(self.get_tpr()) * self.get_precision()[1:]))
+
+    def threshold_at_fpr(self, target_fpr: float) -> float:
+        """
+        Get the threshold with the highest true positive rate whose false positive rate does not exceed a target.
+
+        Args:
+            target_fpr (float): Maximum false positive rate.
+
+        Returns:
+            float: Threshold, scores above it are DGA.
+
+        Raises:
+            Exception: If the target is not between 0 and 1.
+        """
+        return float(self.thresholds[self._index_at_fpr(target_fpr)])
+
+    def tpr_at_fpr(self, target_fpr: float) -> float:
+        """
+        Get the highest true positive rate whose false positive rate does not exceed a target.
+
+        Args:
+            target_fpr (float): Maximum false positive rate.
+
+        Returns:
+            float: True positive rate.
+
+        Raises:
+            Exception: If the target is not between 0 and 1.
+        """
+        return float(self.get_tpr()[self._index_at_fpr(target_fpr)])
+
+    def save(self, path: str) -> None:
+        """
+        Save the operating points in compressed NumPy .npz format.
+
+        Args:
+            path (str): Output path.
+        """
+        # Counts fit in 32 bits for any realistic test set
+        count_dtype = np.uint32 if max(self.positives, self.negatives) < 2 ** 32 else np.int64
+        np.savez_compressed(
+            path,
+            thresholds=self.thresholds,
+            tps=self.tps.astype(count_dtype),
+            fps=self.fps.astype(count_dtype),
+            totals=np.array([self.positives, self.negatives], dtype=np.int64),
+            fpr_targets=np.array(self.fpr_targets, dtype=np.float64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CurveResult":
+        """
+        Load curves saved with save().
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            CurveResult: The curves.
+        """
+        with np.load(path) as data:
+            positives, negatives = (int(total) for total in data["totals"])
+            return cls(
+                data["thresholds"],
+                data["tps"],
+                data["fps"],
+                positives,
+                negatives,
+                tuple(float(target) for target in data["fpr_targets"])
+            )
+
+    @staticmethod
+    def compare(curves: dict[str, "CurveResult"], fpr_targets: tuple[float, ...] = DEFAULT_FPR_TARGETS) -> Result:
+        """
+        Compare the curves of several classifiers at the same false positive rates.
+
+        Args:
+            curves (dict[str, CurveResult]): Curves by classifier name.
+            fpr_targets (tuple[float, ...], optional): False positive rates to compare at.
+                Defaults to (1e-4, 1e-3, 1e-2).
+
+        Returns:
+            Result: AUC, average precision and true positive rate at every target of every classifier.
+        """
+        result = Result()
+        for name, curve in curves.items():
+            result.add_metric(f"{name} AUC", curve.roc_auc())
+            result.add_metric(f"{name} AP", curve.average_precision())
+            for target in fpr_targets:
+                result.add_metric(f"{name} TPR@FPR={target:g}", curve.tpr_at_fpr(target))
+        return result
+
+    def _index_at_fpr(self, target_fpr: float) -> int:
+        """
+        Find the last point whose false positive rate does not exceed a target.
+
+        Args:
+            target_fpr (float): Maximum false positive rate.
+
+        Returns:
+            int: Index of the point.
+
+        Raises:
+            Exception: If the target is not between 0 and 1.
+        """
+        if not 0 <= target_fpr <= 1:
+            raise Exception(WRONG_TARGET_FPR_MESSAGE.format(target_fpr=target_fpr))
+        # Compare counts, not rates, so rounding never lets a point exceed the target
+        allowed = np.floor(target_fpr * self.negatives + 1e-9)
+        return max(int(np.searchsorted(self.fps, allowed, side="right")) - 1, 0)
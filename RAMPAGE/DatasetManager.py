@@ -1,6 +1,10 @@
 import warnings
 import random
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DnsQueryReader import DnsQueryReader
+from RAMPAGE.DomainNormalizer import DomainNormalizer
 
 
 # Error and warning message templates
@@ -21,13 +25,19 @@ train <= validation
 {train_pct} <= {validation_pct}
 """
 
+# Data elements normalized per batch
+NORMALIZE_CHUNK_SIZE = 65536
+
 
 class DatasetManager:
     """
     A class to manage dataset splitting and loading for machine learning tasks.
     
     This class handles the division of data into training, validation, and test sets,
-    with configurable percentages and optional randomization.
+    with configurable percentages and optional randomization. An optional
+    DomainNormalizer normalizes every loaded domain in batches. Files are in
+    dataset format (<domain>;<label>) unless a DnsQueryReader is given, in which
+    case the labelled names of a DNS query log or pcap capture are loaded.
     """
 
     def __init__(self):
@@ -38,6 +48,9 @@ class DatasetManager:
         self.train_pct = 80
         self.validation_pct = 10
         self.test_pct = 10
+        self.normalizer = None
+        # Incremented on every change of the splits, so derived values (e.g. fingerprints) can be cached
+        self.version = 0
 
     def set_percentages(self, train: int, validation: int, test: int) -> None:
         """
@@ -69,6 +82,15 @@ class DatasetManager:
         self.validation_pct = validation
         self.test_pct = test
 
+    def set_normalizer(self, normalizer: Optional[DomainNormalizer]) -> None:
+        """
+        Set the normalizer applied to the domains loaded from now on, or disable it with None.
+        
+        Args:
+            normalizer (DomainNormalizer): The normalizer, or None.
+        """
+        self.normalizer = normalizer
+
     def get_train(self) -> set:
         """Return the training set."""
         return self.train_set
@@ -81,17 +103,19 @@ class DatasetManager:
         """Return the test set."""
         return self.test_set
     
-    def add(self, path: str, random_sets: bool) -> None:
+    def add(self, path: str, random_sets: bool, reader: Optional[DnsQueryReader] = None) -> tuple[list, list, list]:
         """
         Load and split data from file into train, validation and test sets.
         
         Args:
             path (str): Path to the data file.
             random_sets (bool): Whether to randomize the data split.
+            reader (DnsQueryReader, optional): Reader of a query log or capture. Defaults to None.
+            
+        Returns:
+            tuple[list, list, list]: The new train, validation and test elements.
         """
-        data_elements = []
-        with open(path, 'r') as f:
-            data_elements = [self.parse_data_element(line) for line in f]
+        data_elements = list(self._read(path, reader))
 
         if random_sets:
             random.shuffle(data_elements)
@@ -100,45 +124,52 @@ class DatasetManager:
         train_end = int(total_elements * self.train_pct / 100)
         val_end = int(total_elements * (self.train_pct + self.validation_pct) / 100)
 
-        self.train_set.update(data_elements[:train_end])
-        self.validation_set.update(data_elements[train_end:val_end])
-        self.test_set.update(data_elements[val_end:])
+        new_sets = data_elements[:train_end], data_elements[train_end:val_end], data_elements[val_end:]
+        self.train_set.update(new_sets[0])
+        self.validation_set.update(new_sets[1])
+        self.test_set.update(new_sets[2])
+        self.version += 1
+        return new_sets
 
-    def add_train(self, path: str) -> None:
+    def add_train(self, path: str, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add data from file to training set.
         
         Args:
             path (str): Path to the data file.
+            reader (DnsQueryReader, optional): Reader of a query log or capture. Defaults to None.
         """
-        with open(path, 'r') as f:
-            self.train_set.update(self.parse_data_element(line) for line in f)
+        self.train_set.update(self._read(path, reader))
+        self.version += 1
 
-    def add_validation(self, path: str) -> None:
+    def add_validation(self, path: str, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add data from file to validation set.
         
         Args:
             path (str): Path to the data file.
+            reader (DnsQueryReader, optional): Reader of a query log or capture. Defaults to None.
         """
-        with open(path, 'r') as f:
-            self.validation_set.update(self.parse_data_element(line) for line in f)
+        self.validation_set.update(self._read(path, reader))
+        self.version += 1
 
-    def add_test(self, path: str) -> None:
+    def add_test(self, path: str, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add data from file to test set.
         
         Args:
             path (str): Path to the data file.
+            reader (DnsQueryReader, optional): Reader of a query log or capture. Defaults to None.
         """
-        with open(path, 'r') as f:
-            self.test_set.update(self.parse_data_element(line) for line in f)
+        self.test_set.update(self._read(path, reader))
+        self.version += 1
 
     def clear(self) -> None:
         """Clear all data sets."""
         self.train_set.clear()
         self.validation_set.clear()
         self.test_set.clear()
+        self.version += 1
 
     def parse_data_element(self, line: str) -> DataElement:
         """
@@ -152,4 +183,42 @@ class DatasetManager:
         """
         domain, is_dga_str = line.strip().split(";")
         is_dga = bool(eval(is_dga_str))
-        return DataElement(domain, is_dga)
\ No newline at end of file
+        return DataElement(domain, is_dga)
+
+    def _read(self, path: str, reader: Optional[DnsQueryReader] = None) -> Iterator[DataElement]:
+        """
+        Stream the normalized data elements of a file.
+        
+        Args:
+            path (str): Path to the data file.
+            reader (DnsQueryReader, optional): Reader of a query log or capture. Defaults to None
+                (dataset format).
+            
+        Returns:
+            Iterator[DataElement]: The data elements.
+        """
+        if reader is not None:
+            yield from self._normalize(reader.read_elements(path))
+            return
+        with open(path, 'r') as f:
+            yield from self._normalize(self.parse_data_element(line) for line in f)
+    
+    def _normalize(self, data_elements: Iterable[DataElement]) -> Iterator[DataElement]:
+        """
+        Normalize the domains of data elements in batches, if a normalizer is set.
+        
+        Args:
+            data_elements (Iterable[DataElement]): Parsed data elements.
+            
+        Returns:
+            Iterator[DataElement]: The same data elements, with normalized domains.
+        """
+        iterator = iter(data_elements)
+        if self.normalizer is None:
+            yield from iterator
+            return
+        while chunk := list(islice(iterator, NORMALIZE_CHUNK_SIZE)):
+            domains = self.normalizer.normalize_batch([element.domain for element in chunk])
+            for element, domain in zip(chunk, domains):
+                element.domain = domain
+            yield from chunk
\ No newline at end of file
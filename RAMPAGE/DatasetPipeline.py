@@ -0,0 +1,219 @@
+from typing import Callable, Iterable, Optional
+import numpy as np
+import tensorflow as tf
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.LengthBucketer import LengthBucketer
+from RAMPAGE.SpilledSplit import SpilledSplit
+
+
+# Error message templates
+WRONG_SPLIT_MESSAGE = """ERROR:
+
+Wrong split name...
+
+Possible values: 'train', 'validation', 'test'
+Split: {split}
+"""
+
+
+class DatasetPipeline:
+    """
+    A class to build streaming tf.data input pipelines from dataset splits.
+
+    Domains are kept as strings and encoded chunk by chunk in parallel, so the
+    encoded matrix of a whole split is never materialized. Encoded elements are
+    shuffled with a bounded buffer, batched and prefetched to overlap input
+    preparation with training. With a LengthBucketer, batches are grouped by
+    domain length and padded only to their bucket upper bound. Splits spilled
+    to disk (SpilledSplit) are streamed from their memory-mapped encoding.
+
+    Attributes:
+        encoder (DomainEncoder): Encoder used to convert domains to sequences.
+        batch_size (int): Number of elements per batch.
+        shuffle_buffer (int): Size of the shuffle buffer, in elements.
+        chunk_size (int): Number of domains encoded per parallel call.
+        seed (int): Optional seed for the shuffling.
+        bucketer (LengthBucketer): Optional bucketer for dynamic padding.
+    """
+
+    def __init__(
+        self,
+        encoder: DomainEncoder,
+        batch_size: int = 50,
+        shuffle_buffer: int = 10000,
+        chunk_size: int = 4096,
+        seed: Optional[int] = None,
+        bucketer: Optional[LengthBucketer] = None
+    ) -> None:
+        """
+        Initialize the pipeline configuration.
+
+        Args:
+            encoder (DomainEncoder): Encoder used to convert domains to sequences.
+            batch_size (int, optional): Elements per batch. Defaults to 50.
+            shuffle_buffer (int, optional): Shuffle buffer size. Defaults to 10000.
+            chunk_size (int, optional): Domains encoded per parallel call. Defaults to 4096.
+            seed (int, optional): Seed for the shuffling. Defaults to None.
+            bucketer (LengthBucketer, optional): Bucketer for dynamic padding. Defaults to None.
+        """
+        self.encoder = encoder
+        self.batch_size = batch_size
+        self.shuffle_buffer = shuffle_buffer
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.bucketer = bucketer
+
+    def build(self, data: Iterable[DataElement], shuffle: bool = False) -> tf.data.Dataset:
+        """
+        Build a dataset of (domains, labels) batches.
+
+        Args:
+            data (Iterable[DataElement]): Data elements to stream.
+            shuffle (bool, optional): Whether to shuffle every epoch. Defaults to False.
+
+        Returns:
+            tf.data.Dataset: Batched and prefetched dataset.
+        """
+        if isinstance(data, SpilledSplit):
+            encode_chunk, size = self._spilled_chunks(data)
+        else:
+            encode_chunk, size = self._memory_chunks(data)
+        num_chunks = (size + self.chunk_size - 1) // self.chunk_size
+
+        def encode_chunk_op(index: tf.Tensor) -> tuple[tf.Tensor, ...]:
+            x_data, y_data, lengths = tf.numpy_function(
+                encode_chunk,
+                [index],
+                (tf.as_dtype(self.encoder.dtype), tf.float32, tf.int32)
+            )
+            x_data.set_shape([None, self.encoder.max_length])
+            y_data.set_shape([None])
+            lengths.set_shape([None])
+            if self.bucketer is None:
+                return x_data, y_data
+            return x_data, y_data, lengths
+
+        dataset = tf.data.Dataset.range(num_chunks)
+        if shuffle:
+            dataset = dataset.shuffle(max(num_chunks, 1), seed=self.seed, reshuffle_each_iteration=True)
+
+        dataset = dataset.map(
+            encode_chunk_op,
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=not shuffle
+        )
+        dataset = dataset.unbatch()
+
+        if shuffle:
+            dataset = dataset.shuffle(self.shuffle_buffer, seed=self.seed, reshuffle_each_iteration=True)
+
+        if self.bucketer is not None:
+            return self._bucket(dataset).prefetch(tf.data.AUTOTUNE)
+
+        # unbatch() hides the size, so restore it for Keras progress and epoch ends
+        num_batches = (size + self.batch_size - 1) // self.batch_size
+        dataset = dataset.batch(self.batch_size)
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(num_batches))
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def _memory_chunks(self, data: Iterable[DataElement]) -> tuple[Callable, int]:
+        """
+        Prepare chunked encoding of in-memory data elements.
+
+        Args:
+            data (Iterable[DataElement]): Data elements.
+
+        Returns:
+            tuple[Callable, int]: Function from chunk index to (domains, labels, lengths) and number of elements.
+        """
+        elements = data if isinstance(data, list) else list(data)
+        domains = [element.domain for element in elements]
+        labels = self.encoder.encode_labels(elements).astype(np.float32)
+
+        def encode_chunk(index: np.int64) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            start = int(index) * self.chunk_size
+            chunk = domains[start:start + self.chunk_size]
+            lengths = np.fromiter(map(len, chunk), dtype=np.int32, count=len(chunk))
+            lengths = np.minimum(lengths, self.encoder.max_length)
+            return self.encoder.encode(chunk), labels[start:start + self.chunk_size], lengths
+
+        return encode_chunk, len(domains)
+
+    def _spilled_chunks(self, data: SpilledSplit) -> tuple[Callable, int]:
+        """
+        Prepare chunked reads of a spilled split from its memory-mapped encoding.
+
+        Args:
+            data (SpilledSplit): Spilled split.
+
+        Returns:
+            tuple[Callable, int]: Function from chunk index to (domains, labels, lengths) and number of elements.
+        """
+        codes, lengths = data.encode(self.encoder)
+        labels = data.labels
+
+        def read_chunk(index: np.int64) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            chunk = slice(int(index) * self.chunk_size, (int(index) + 1) * self.chunk_size)
+            return np.array(codes[chunk]), labels[chunk].astype(np.float32), np.array(lengths[chunk])
+
+        return read_chunk, len(data)
+
+    def _bucket(self, dataset: tf.data.Dataset) -> tf.data.Dataset:
+        """
+        Group elements by length and pad every batch to its bucket upper bound.
+
+        Args:
+            dataset (tf.data.Dataset): Dataset of fixed width (domain, label, length) elements.
+
+        Returns:
+            tf.data.Dataset: Bucketed dataset of (domains, labels) batches.
+        """
+        padding_value = self.encoder.padding_value
+        dtype = tf.as_dtype(self.encoder.dtype)
+
+        def trim(x_data: tf.Tensor, y_data: tf.Tensor, length: tf.Tensor) -> tuple[tf.Tensor, tf.Tensor]:
+            return x_data[:length], y_data
+
+        # tf.data buckets are [boundary_i, boundary_i+1) and pad to boundary - 1
+        boundaries = [boundary + 1 for boundary in self.bucketer.boundaries]
+        return dataset.map(trim, num_parallel_calls=tf.data.AUTOTUNE).bucket_by_sequence_length(
+            element_length_func=lambda x_data, y_data: tf.shape(x_data)[0],
+            bucket_boundaries=boundaries,
+            bucket_batch_sizes=[self.batch_size] * (len(boundaries) + 1),
+            padding_values=(tf.constant(padding_value, dtype=dtype), tf.constant(0.0)),
+            pad_to_bucket_boundary=True
+        )
+
+    def from_manager(
+        self,
+        dataset_manager: DatasetManager,
+        split: str,
+        shuffle: Optional[bool] = None
+    ) -> tf.data.Dataset:
+        """
+        Build a dataset from a DatasetManager split.
+
+        Args:
+            dataset_manager (DatasetManager): Manager holding the splits.
+            split (str): 'train', 'validation' or 'test'.
+            shuffle (bool, optional): Whether to shuffle. Defaults to True only for 'train'.
+
+        Returns:
+            tf.data.Dataset: Batched and prefetched dataset.
+
+        Raises:
+            Exception: If the split name is not valid.
+        """
+        getters = {
+            "train": dataset_manager.get_train,
+            "validation": dataset_manager.get_validation,
+            "test": dataset_manager.get_test
+        }
+        if split not in getters:
+            raise Exception(WRONG_SPLIT_MESSAGE.format(split=split))
+
+        if shuffle is None:
+            shuffle = split == "train"
+        return self.build(getters[split](), shuffle)
@@ -0,0 +1,509 @@
+import re
+import struct
+import time
+from typing import Iterable, Iterator, Optional
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DomainNormalizer import DomainNormalizer
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_FORMAT_MESSAGE = """ERROR:
+
+Wrong query log format...
+
+Possible values: {formats}
+Format: {log_format}
+"""
+
+UNSUPPORTED_CAPTURE_MESSAGE = """ERROR:
+
+Unsupported capture...
+
+Only classic pcap files are read (convert pcapng with "editcap -F pcap")
+Path: {path}
+{detail}
+"""
+
+# Queried name of a log line, by server
+LOG_PATTERNS = {
+    # client @0x7f... 192.0.2.1#53000 (example.com): query: example.com IN A +E(0)K (192.0.2.53)
+    "bind": re.compile(rb" query: (\S+) [A-Z]+ "),
+    # dnsmasq[1234]: query[A] example.com from 192.0.2.1
+    "dnsmasq": re.compile(rb"query\[[A-Za-z0-9]+\] (\S+) from "),
+    # unbound[1234:0] info: 192.0.2.1 example.com. A IN
+    "unbound": re.compile(rb"info: [0-9A-Fa-f.:]+ (\S+) [A-Za-z0-9]+ IN\b"),
+    # One domain per line, or dataset format (<domain>;<label>)
+    "plain": re.compile(rb"^[ \t]*([^;\s]+)", re.MULTILINE),
+}
+
+# Magic numbers of classic pcap files (microsecond and nanosecond timestamps), by byte order
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": "<", b"\x4d\x3c\xb2\xa1": "<",
+    b"\xa1\xb2\xc3\xd4": ">", b"\xa1\xb2\x3c\x4d": ">",
+}
+PCAPNG_MAGIC = b"\x0a\x0d\x0d\x0a"
+
+# Link layer types: null/loopback, Ethernet, raw IP, Linux cooked v1 and v2
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = (12, 101, 228, 229)
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86dd
+ETHERTYPE_VLAN = (0x8100, 0x88a8)
+# Address families of the null/loopback header (IPv6 differs between systems)
+AF_IPV6 = (10, 24, 28, 30)
+
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+DNS_PORT = 53
+
+# Longest domain name allowed by DNS
+MAX_DOMAIN_BYTES = 253
+# Bytes accepted in a decoded name: printable ASCII without spaces
+NAME_BYTES = re.compile(rb"[!-~]+")
+# Compression pointers followed while decoding one name
+MAX_POINTERS = 16
+
+
+class DnsQueryReader:
+    """
+    A streaming reader of the names queried in DNS query logs and pcap captures.
+
+    Query logs of BIND, dnsmasq and Unbound (or plain domain lists) are read
+    in large binary chunks and the queried names of a whole chunk are
+    extracted with one regular expression scan, so Python code only runs
+    per name, never per byte. Classic pcap captures are walked record by
+    record from the same chunks, and the question of every DNS message over
+    UDP or TCP port 53 is decoded with struct, without third-party packet
+    libraries. Memory is bounded by the chunk size plus the set of names seen.
+
+    Names are normalized (see DomainNormalizer) and, if enabled, deduplicated
+    on the fly: every name is yielded once, the first time it is seen. Names
+    found in the reference lists are labelled as DGA or legitimate, first by
+    the exact name and then by its registrable domain (with a normalizer that
+    has public suffixes), so they can be loaded into the dataset splits; the
+    other names can still be scored.
+
+    Attributes:
+        log_format (str): 'auto', 'bind', 'dnsmasq', 'unbound' or 'plain' (ignored for pcap files).
+        normalizer (DomainNormalizer): Normalizer of the extracted and reference names.
+        deduplicate (bool): Whether every name is yielded only once.
+        queries_only (bool): Whether names of DNS responses in captures are skipped.
+        chunk_size (int): Bytes read at a time.
+        batch_size (int): Names per yielded batch of captures.
+        dga_domains (set[str]): Reference DGA names.
+        benign_domains (set[str]): Reference legitimate names.
+    """
+
+    def __init__(
+        self,
+        log_format: str = "auto",
+        dga_path: Optional[str] = None,
+        benign_path: Optional[str] = None,
+        normalizer: Optional[DomainNormalizer] = None,
+        deduplicate: bool = True,
+        queries_only: bool = False,
+        chunk_size: int = 1 << 24,
+        batch_size: int = 65536
+    ) -> None:
+        """
+        Initialize the reader and load the reference lists.
+
+        Args:
+            log_format (str, optional): Query log format, 'auto' detects it from the
+                first chunk. Defaults to 'auto'.
+            dga_path (str, optional): File of DGA names, one per line. Defaults to None.
+            benign_path (str, optional): File of legitimate names, one per line. Defaults to None.
+            normalizer (DomainNormalizer, optional): Normalizer of the names. Defaults to None
+                (a DomainNormalizer without public suffixes).
+            deduplicate (bool, optional): Whether every name is yielded only once. Defaults to True.
+            queries_only (bool, optional): Whether names of DNS responses in captures are
+                skipped. Defaults to False.
+            chunk_size (int, optional): Bytes read at a time. Defaults to 16 MiB.
+            batch_size (int, optional): Names per yielded batch of captures. Defaults to 65536.
+
+        Raises:
+            Exception: If the log format is not valid.
+        """
+        if log_format != "auto" and log_format not in LOG_PATTERNS:
+            raise Exception(WRONG_FORMAT_MESSAGE.format(
+                formats=", ".join(("auto",) + tuple(LOG_PATTERNS)),
+                log_format=log_format
+            ))
+        self.log_format = log_format
+        self.normalizer = normalizer if normalizer is not None else DomainNormalizer()
+        self.deduplicate = deduplicate
+        self.queries_only = queries_only
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.dga_domains = self._load_reference(dga_path) if dga_path is not None else set()
+        self.benign_domains = self._load_reference(benign_path) if benign_path is not None else set()
+
+        self._seen = set()
+        self._stats = dict.fromkeys(("bytes", "names", "unique", "dga", "benign", "malformed"), 0)
+        self._seconds = 0.0
+
+    def read_domains(self, path: str) -> Iterator[list[str]]:
+        """
+        Stream the normalized queried names of a query log or pcap file.
+
+        Args:
+            path (str): Path to the file, pcap files are detected by their magic number.
+
+        Returns:
+            Iterator[list[str]]: Batches of names, new ones only if deduplicating.
+
+        Raises:
+            Exception: If the file is a pcapng or uses an unsupported link layer.
+        """
+        with open(path, "rb") as f:
+            magic = f.read(4)
+            f.seek(0)
+            if magic in PCAP_MAGIC or magic == PCAPNG_MAGIC:
+                raw_batches = self._read_pcap(f, path)
+            else:
+                raw_batches = self._read_log(f)
+
+            start = time.perf_counter()
+            for raw_names in raw_batches:
+                names = self._filter(self.normalizer.normalize_batch(raw_names))
+                self._stats["unique"] += len(names)
+                self._seconds += time.perf_counter() - start
+                if names:
+                    yield names
+                start = time.perf_counter()
+            self._seconds += time.perf_counter() - start
+
+    def read_elements(self, path: str) -> Iterator[DataElement]:
+        """
+        Stream the queried names found in the reference lists as labelled data elements.
+
+        Args:
+            path (str): Path to the query log or pcap file.
+
+        Returns:
+            Iterator[DataElement]: Labelled names, unlabelled ones are skipped.
+        """
+        for names in self.read_domains(path):
+            for name, is_dga in zip(names, self.label(names)):
+                if is_dga is not None:
+                    yield DataElement(name, is_dga)
+
+    def label(self, names: Iterable[str]) -> list[Optional[bool]]:
+        """
+        Label normalized names against the reference lists.
+
+        Args:
+            names (Iterable[str]): Normalized names.
+
+        Returns:
+            list[Optional[bool]]: True for DGA, False for legitimate and None for
+                names in neither list.
+        """
+        labels = []
+        for name in names:
+            is_dga = self._lookup(name)
+            if is_dga is None and self.normalizer.num_rules:
+                registrable = self.normalizer.split(name)[1]
+                if registrable and registrable != name:
+                    is_dga = self._lookup(registrable)
+            if is_dga is not None:
+                self._stats["dga" if is_dga else "benign"] += 1
+            labels.append(is_dga)
+        return labels
+
+    def get_stats(self) -> Result:
+        """
+        Get the counters of everything read since the reader was created or reset.
+
+        Returns:
+            Result: Bytes and names read, unique names, labelled names, malformed
+                packets, seconds and MB/s.
+        """
+        result = Result()
+        result.add_metric("Bytes", self._stats["bytes"])
+        result.add_metric("Names", self._stats["names"])
+        result.add_metric("Unique", self._stats["unique"])
+        result.add_metric("DGA", self._stats["dga"])
+        result.add_metric("Benign", self._stats["benign"])
+        result.add_metric("Malformed", self._stats["malformed"])
+        result.add_metric("Seconds", self._seconds)
+        result.add_metric("MB/s", self._stats["bytes"] / self._seconds / 1e6 if self._seconds else 0.0)
+        return result
+
+    def reset(self) -> None:
+        """Forget the names seen and the counters."""
+        self._seen.clear()
+        self._stats = dict.fromkeys(self._stats, 0)
+        self._seconds = 0.0
+
+    def _filter(self, names: list[str]) -> list[str]:
+        """
+        Drop empty names and, if deduplicating, names already seen.
+
+        Args:
+            names (list[str]): Normalized names.
+
+        Returns:
+            list[str]: Remaining names, in order of first appearance.
+        """
+        if not self.deduplicate:
+            return [name for name in names if name]
+        seen = self._seen
+        names = [name for name in dict.fromkeys(names) if name and name not in seen]
+        seen.update(names)
+        return names
+
+    def _lookup(self, name: str) -> Optional[bool]:
+        """
+        Look a name up in the reference lists, DGA first.
+
+        Args:
+            name (str): Normalized name.
+
+        Returns:
+            Optional[bool]: True, False or None if it is in neither list.
+        """
+        if name in self.dga_domains:
+            return True
+        if name in self.benign_domains:
+            return False
+        return None
+
+    def _read_log(self, f) -> Iterator[list[str]]:
+        """
+        Extract the raw queried names of a query log, one batch per chunk.
+
+        Args:
+            f (BinaryIO): The open file.
+
+        Returns:
+            Iterator[list[str]]: Raw names of every chunk.
+        """
+        pattern = None if self.log_format == "auto" else LOG_PATTERNS[self.log_format]
+        remainder = b""
+        while True:
+            data = f.read(self.chunk_size)
+            self._stats["bytes"] += len(data)
+            if data:
+                # Only whole lines are scanned, the last partial one waits for the next chunk
+                data = remainder + data
+                end = data.rfind(b"\n") + 1
+                if end == 0:
+                    remainder = data
+                    continue
+                data, remainder = data[:end], data[end:]
+            else:
+                data, remainder = remainder, b""
+                if not data:
+                    return
+
+            if pattern is None:
+                pattern = self._detect_pattern(data)
+            names = pattern.findall(data)
+            self._stats["names"] += len(names)
+            if self.deduplicate:
+                # Repeated queries are dropped before decoding them
+                names = dict.fromkeys(names)
+            if names:
+                yield b"\n".join(names).decode("utf-8", "replace").split("\n")
+
+    @staticmethod
+    def _detect_pattern(data: bytes) -> re.Pattern:
+        """
+        Choose the log pattern with the most matches in a chunk.
+
+        Args:
+            data (bytes): The first chunk.
+
+        Returns:
+            re.Pattern: Pattern of the detected format, 'plain' if no server format matches.
+        """
+        sample = data[:1 << 20]
+        counts = {
+            name: len(pattern.findall(sample))
+            for name, pattern in LOG_PATTERNS.items() if name != "plain"
+        }
+        best = max(counts, key=counts.get)
+        return LOG_PATTERNS[best] if counts[best] else LOG_PATTERNS["plain"]
+
+    def _read_pcap(self, f, path: str) -> Iterator[list[str]]:
+        """
+        Extract the raw question names of the DNS messages of a classic pcap file.
+
+        Args:
+            f (BinaryIO): The open file.
+            path (str): Path to the file, for error messages.
+
+        Returns:
+            Iterator[list[str]]: Batches of raw names.
+
+        Raises:
+            Exception: If the file is a pcapng or uses an unsupported link layer.
+        """
+        header = f.read(24)
+        self._stats["bytes"] += len(header)
+        byte_order = PCAP_MAGIC.get(header[:4])
+        if byte_order is None or len(header) < 24:
+            raise Exception(UNSUPPORTED_CAPTURE_MESSAGE.format(path=path, detail="Format: pcapng or truncated"))
+        linktype = struct.unpack(byte_order + "I", header[20:24])[0] & 0x0fffffff
+        if linktype not in (LINKTYPE_NULL, LINKTYPE_ETHERNET, LINKTYPE_LOOP, LINKTYPE_LINUX_SLL, LINKTYPE_LINUX_SLL2) \
+                and linktype not in LINKTYPE_RAW:
+            raise Exception(UNSUPPORTED_CAPTURE_MESSAGE.format(path=path, detail=f"Link type: {linktype}"))
+
+        record = struct.Struct(byte_order + "8xI4x")
+        names = []
+        buffer = b""
+        position = 0
+        while True:
+            data = f.read(self.chunk_size)
+            self._stats["bytes"] += len(data)
+            if not data:
+                break
+            buffer = buffer[position:] + data
+            position = 0
+            end = len(buffer)
+            # Walk the records fully contained in the buffer
+            while position + 16 <= end:
+                captured = record.unpack_from(buffer, position)[0]
+                if position + 16 + captured > end:
+                    break
+                name = self._decode_packet(buffer[position + 16:position + 16 + captured], linktype)
+                if name is not None:
+                    names.append(name)
+                position += 16 + captured
+
+            if len(names) >= self.batch_size:
+                self._stats["names"] += len(names)
+                yield names
+                names = []
+        if names:
+            self._stats["names"] += len(names)
+            yield names
+
+    def _decode_packet(self, packet: bytes, linktype: int) -> Optional[str]:
+        """
+        Decode the question name of a captured DNS packet.
+
+        Args:
+            packet (bytes): Captured bytes, from the link layer header.
+            linktype (int): Link layer type of the capture.
+
+        Returns:
+            Optional[str]: Raw name, or None if the packet is not a DNS message over
+                port 53 (or a response, with queries_only) or is malformed.
+        """
+        try:
+            # Link layer
+            if linktype == LINKTYPE_ETHERNET:
+                ethertype = (packet[12] << 8) | packet[13]
+                offset = 14
+                while ethertype in ETHERTYPE_VLAN:
+                    ethertype = (packet[offset + 2] << 8) | packet[offset + 3]
+                    offset += 4
+            elif linktype == LINKTYPE_LINUX_SLL:
+                ethertype = (packet[14] << 8) | packet[15]
+                offset = 16
+            elif linktype == LINKTYPE_LINUX_SLL2:
+                ethertype = (packet[0] << 8) | packet[1]
+                offset = 20
+            elif linktype in (LINKTYPE_NULL, LINKTYPE_LOOP):
+                family = max(packet[0], packet[3])
+                ethertype = ETHERTYPE_IPV6 if family in AF_IPV6 else ETHERTYPE_IPV4
+                offset = 4
+            else:
+                ethertype = ETHERTYPE_IPV6 if packet[0] >> 4 == 6 else ETHERTYPE_IPV4
+                offset = 0
+
+            # Network layer
+            if ethertype == ETHERTYPE_IPV4:
+                if packet[offset + 6] & 0x1f or packet[offset + 7]:
+                    return None  # Not the first fragment
+                protocol = packet[offset + 9]
+                offset += (packet[offset] & 0x0f) * 4
+            elif ethertype == ETHERTYPE_IPV6:
+                protocol = packet[offset + 6]
+                offset += 40
+            else:
+                return None
+
+            # Transport layer
+            if protocol == IPPROTO_UDP:
+                message = offset + 8
+            elif protocol == IPPROTO_TCP:
+                message = offset + (packet[offset + 12] >> 4) * 4 + 2  # Skip the length prefix
+            else:
+                return None
+            source_port = (packet[offset] << 8) | packet[offset + 1]
+            destination_port = (packet[offset + 2] << 8) | packet[offset + 3]
+            if source_port != DNS_PORT and destination_port != DNS_PORT:
+                return None
+
+            # DNS header: a query (unless queries_only) with at least one question
+            if self.queries_only and packet[message + 2] & 0x80:
+                return None
+            if not (packet[message + 4] or packet[message + 5]):
+                return None
+            return self._decode_name(packet, message, message + 12)
+        except IndexError:
+            self._stats["malformed"] += 1
+            return None
+
+    def _decode_name(self, packet: bytes, message: int, offset: int) -> Optional[str]:
+        """
+        Decode a possibly compressed name of a DNS message.
+
+        Args:
+            packet (bytes): Captured bytes.
+            message (int): Offset of the DNS message, compression pointers are relative to it.
+            offset (int): Offset of the name.
+
+        Returns:
+            Optional[str]: Dotted name, or None if it is malformed or not printable.
+
+        Raises:
+            IndexError: If the name is truncated.
+        """
+        labels = []
+        pointers = 0
+        while True:
+            length = packet[offset]
+            if length == 0:
+                break
+            if length >= 0xc0:
+                pointers += 1
+                if pointers > MAX_POINTERS:
+                    self._stats["malformed"] += 1
+                    return None
+                offset = message + (((length & 0x3f) << 8) | packet[offset + 1])
+                continue
+            # A truncated label is caught by the next length byte lookup
+            offset += length + 1
+            labels.append(packet[offset - length:offset])
+
+        name = b".".join(labels)
+        if len(name) > MAX_DOMAIN_BYTES or not NAME_BYTES.fullmatch(name):
+            return None
+        return name.decode("ascii")
+
+    def _load_reference(self, path: str) -> set[str]:
+        """
+        Load a reference list of names.
+
+        Args:
+            path (str): File with one name per line (the dataset format label is ignored).
+
+        Returns:
+            set[str]: Normalized names.
+        """
+        with open(path, "rb") as f:
+            raw_names = LOG_PATTERNS["plain"].findall(f.read())
+        if not raw_names:
+            return set()
+        names = b"\n".join(raw_names).decode("utf-8", "replace").split("\n")
+        return set(self.normalizer.normalize_batch(names))
@@ -0,0 +1,273 @@
+import hashlib
+from typing import Iterable, Optional
+import numpy as np
+from RAMPAGE.DataElement import DataElement
+
+
+# Error message templates
+WRONG_TRUNCATING_MESSAGE = """ERROR:
+
+Wrong truncating mode...
+
+Possible values: 'pre', 'post'
+Truncating: {truncating}
+"""
+
+WRONG_DTYPE_MESSAGE = """ERROR:
+
+Wrong output dtype...
+
+Only integer dtypes are supported
+dtype: {dtype}
+"""
+
+
+class DomainEncoder:
+    """
+    A class to encode batches of domains into padded integer matrices.
+
+    Domains are encoded with NumPy lookup tables directly from a byte buffer,
+    without building per-character Python lists. By default the encoding
+    reproduces the scheme used by the example classifiers, i.e.
+    ``ord(char) - 33`` per character, post-padded with zeros and truncated
+    from the beginning (``pad_sequences`` defaults).
+
+    Attributes:
+        max_length (int): Width of the output matrix.
+        alphabet (str): Optional alphabet. If set, alphabet[i] is encoded as i + 1.
+        offset (int): Value subtracted from each code point when no alphabet is set.
+        dtype (np.dtype): Integer dtype of the output matrix.
+        truncating (str): 'pre' to drop leading characters, 'post' to drop trailing ones.
+        padding_value (int): Value used to fill positions after the domain.
+        unknown_value (int): Value for characters outside the alphabet or the dtype range.
+    """
+
+    def __init__(
+        self,
+        max_length: int = 70,
+        alphabet: Optional[str] = None,
+        offset: int = 33,
+        dtype: np.dtype = np.uint8,
+        truncating: str = "pre",
+        padding_value: int = 0,
+        unknown_value: int = 0
+    ) -> None:
+        """
+        Initialize the encoder and build its lookup table.
+
+        Args:
+            max_length (int, optional): Width of the output matrix. Defaults to 70.
+            alphabet (str, optional): Alphabet to encode with. Defaults to None (ord - offset).
+            offset (int, optional): Offset subtracted from code points. Defaults to 33 ('!').
+            dtype (np.dtype, optional): Integer output dtype. Defaults to np.uint8.
+            truncating (str, optional): 'pre' or 'post'. Defaults to 'pre'.
+            padding_value (int, optional): Padding value. Defaults to 0.
+            unknown_value (int, optional): Value for unencodable characters. Defaults to 0.
+
+        Raises:
+            Exception: If truncating mode or dtype are not valid.
+        """
+        if truncating not in ("pre", "post"):
+            raise Exception(WRONG_TRUNCATING_MESSAGE.format(truncating=truncating))
+        if not np.issubdtype(np.dtype(dtype), np.integer):
+            raise Exception(WRONG_DTYPE_MESSAGE.format(dtype=np.dtype(dtype)))
+
+        self.max_length = max_length
+        self.alphabet = alphabet
+        self.offset = offset
+        self.dtype = np.dtype(dtype)
+        self.truncating = truncating
+        self.padding_value = padding_value
+        self.unknown_value = unknown_value
+
+        table_size = 256 if alphabet is None else max([256] + [ord(char) + 1 for char in alphabet])
+        self._table = self._build_table(table_size)
+
+    def encode(self, domains: Iterable[str]) -> np.ndarray:
+        """
+        Encode a batch of domains.
+
+        Args:
+            domains (Iterable[str]): Domains to encode. They must not contain newlines.
+
+        Returns:
+            np.ndarray: Matrix of shape (n, max_length) with the encoded domains.
+        """
+        domains = domains if isinstance(domains, list) else list(domains)
+        if not domains:
+            return np.full((0, self.max_length), self.padding_value, dtype=self.dtype)
+
+        joined = "\n".join(domains)
+        if joined.isascii():
+            codes = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+        else:
+            # One code unit per character keeps the ord() semantics for IDNs
+            codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+        return self._encode_codes(codes, ord("\n"))
+
+    def encode_buffer(self, buffer: bytes, separator: bytes = b"\n") -> np.ndarray:
+        """
+        Encode a byte buffer of separator-delimited ASCII domains.
+
+        Useful to encode the raw content of a domain list file without decoding it.
+        A trailing separator is ignored.
+
+        Args:
+            buffer (bytes): Buffer with the domains.
+            separator (bytes, optional): One byte separator. Defaults to b"\\n".
+
+        Returns:
+            np.ndarray: Matrix of shape (n, max_length) with the encoded domains.
+        """
+        if buffer.endswith(separator):
+            buffer = buffer[:-len(separator)]
+        if not buffer:
+            return np.full((0, self.max_length), self.padding_value, dtype=self.dtype)
+
+        codes = np.frombuffer(buffer, dtype=np.uint8)
+        return self._encode_codes(codes, separator[0])
+
+    def encode_utf8(self, domains: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Encode a batch of domains as their UTF-8 bytes.
+
+        Unlike encode(), every character fits the byte lookup table, so no
+        character of an IDN collapses into the padding or unknown value. ASCII
+        domains are encoded exactly as by encode(). Every domain gets a row,
+        empty ones included.
+
+        Args:
+            domains (Iterable[str]): Domains to encode. They must not contain newlines.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Matrix of shape (n, max_length) with the encoded
+                bytes and the length in bytes of every domain (before truncation).
+        """
+        domains = domains if isinstance(domains, list) else list(domains)
+        if not domains:
+            return np.full((0, self.max_length), self.padding_value, dtype=self.dtype), np.zeros(0, dtype=np.int64)
+
+        codes = np.frombuffer("\n".join(domains).encode("utf-8"), dtype=np.uint8)
+        bounds = np.concatenate(([-1], np.flatnonzero(codes == ord("\n")), [len(codes)]))
+        return self._encode_codes(codes, ord("\n")), np.diff(bounds) - 1
+
+    def encode_labels(self, data: Iterable[DataElement]) -> np.ndarray:
+        """
+        Encode the labels of a batch of data elements.
+
+        Args:
+            data (Iterable[DataElement]): Data elements.
+
+        Returns:
+            np.ndarray: uint8 array with 1 for DGA domains and 0 otherwise.
+        """
+        return np.fromiter((element.is_dga for element in data), dtype=np.uint8)
+
+    def prepare(self, data: Iterable[DataElement]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Encode domains and labels of a batch of data elements.
+
+        Args:
+            data (Iterable[DataElement]): Data elements.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Encoded domains and labels, in the same order.
+        """
+        elements = data if isinstance(data, list) else list(data)
+        x_data = self.encode([element.domain for element in elements])
+        y_data = self.encode_labels(elements)
+        return x_data, y_data
+
+    def get_fingerprint(self) -> str:
+        """
+        Fingerprint the encoding, so encoded data can be cached and reused by equal encoders.
+
+        Returns:
+            str: Hex fingerprint of the lookup table, width, dtype, truncation and padding.
+        """
+        digest = hashlib.blake2b(self._table.tobytes(), digest_size=8)
+        digest.update(f"{self.max_length};{self.dtype.str};{self.truncating};{self.padding_value}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _build_table(self, size: int) -> np.ndarray:
+        """
+        Build the code point to value lookup table.
+
+        Args:
+            size (int): Number of code points covered by the table.
+
+        Returns:
+            np.ndarray: Lookup table with the output dtype.
+        """
+        if self.alphabet is None:
+            values = np.arange(size, dtype=np.int64) - self.offset
+        else:
+            values = np.full(size, self.unknown_value, dtype=np.int64)
+            for index, char in enumerate(self.alphabet):
+                values[ord(char)] = index + 1
+
+        return self._to_dtype(values)
+
+    def _to_dtype(self, values: np.ndarray) -> np.ndarray:
+        """
+        Cast values to the output dtype, replacing unrepresentable ones.
+
+        Args:
+            values (np.ndarray): int64 values.
+
+        Returns:
+            np.ndarray: Values with the output dtype.
+        """
+        info = np.iinfo(self.dtype)
+        values = np.where((values < info.min) | (values > info.max), self.unknown_value, values)
+        return values.astype(self.dtype)
+
+    def _lookup(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Map code points to output values.
+
+        Args:
+            codes (np.ndarray): uint8 bytes or uint32 code points.
+
+        Returns:
+            np.ndarray: Encoded values.
+        """
+        if codes.dtype == np.uint8:
+            return self._table[codes]
+
+        inside = codes < len(self._table)
+        values = np.full(len(codes), self.unknown_value, dtype=self.dtype)
+        values[inside] = self._table[codes[inside]]
+        if self.alphabet is None:
+            values[~inside] = self._to_dtype(codes[~inside].astype(np.int64) - self.offset)
+        return values
+
+    def _encode_codes(self, codes: np.ndarray, separator: int) -> np.ndarray:
+        """
+        Encode a flat array of separator-delimited code points.
+
+        Args:
+            codes (np.ndarray): Code points of all domains.
+            separator (int): Code point delimiting domains.
+
+        Returns:
+            np.ndarray: Matrix of shape (n, max_length) with the encoded domains.
+        """
+        separators = np.flatnonzero(codes == separator)
+        starts = np.concatenate(([0], separators + 1))
+        ends = np.concatenate((separators, [len(codes)]))
+        lengths = ends - starts
+
+        kept = np.minimum(lengths, self.max_length)
+        if self.truncating == "pre":
+            starts = ends - kept
+
+        # Scatter every kept character through flat indices of the source and the output
+        firsts = np.cumsum(kept) - kept
+        positions = np.arange(int(kept.sum()))
+        targets = positions + np.repeat(np.arange(len(kept)) * self.max_length - firsts, kept)
+        sources = positions + np.repeat(starts - firsts, kept)
+
+        output = np.full((len(kept), self.max_length), self.padding_value, dtype=self.dtype)
+        output.ravel()[targets] = self._lookup(codes[sources])
+        return output
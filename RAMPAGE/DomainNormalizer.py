@@ -0,0 +1,242 @@
+from functools import lru_cache
+from typing import Optional, Sequence
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_CACHE_SIZE_MESSAGE = """ERROR:
+
+Wrong cache size...
+
+Possible values: cache_size >= 0
+Cache size: {cache_size}
+"""
+
+# Trie key of the rule that ends at a node (labels are never empty)
+RULE_KEY = ""
+
+# Kinds of rules stored under RULE_KEY
+NORMAL_RULE = 1
+EXCEPTION_RULE = 2
+
+
+class DomainNormalizer:
+    """
+    A normalization stage for domain names, with public suffix splitting.
+
+    Domains are stripped of surrounding whitespace and trailing dots,
+    lowercased and converted to their ASCII (punycode) form, so every character
+    fed to an encoder is printable ASCII and equal names are equal strings.
+    Batches whose text is pure ASCII, the usual case, are lowercased as one
+    joined string without per-domain work. Internationalized domains go through
+    the IDNA codec behind a bounded LRU cache, as do public suffix splits.
+
+    Splitting follows the Public Suffix List algorithm (normal, wildcard and
+    exception rules, longest match, "*" as the default rule) over a trie of
+    labels compiled once from a local copy of the list
+    (https://publicsuffix.org/list/public_suffix_list.dat). Without a file,
+    the suffix is the last label.
+
+    Attributes:
+        suffix_path (str): Path to the public suffix file, or None.
+        cache_size (int): Maximum number of cached domains, per cache.
+        num_rules (int): Number of suffix rules in the trie.
+    """
+
+    def __init__(self, suffix_path: Optional[str] = None, cache_size: int = 65536) -> None:
+        """
+        Initialize the normalizer and compile the suffix trie.
+
+        Args:
+            suffix_path (str, optional): Path to a public suffix file. Defaults to None.
+            cache_size (int, optional): Maximum number of cached domains, per cache. Defaults to 65536.
+
+        Raises:
+            Exception: If the cache size is negative.
+        """
+        if cache_size < 0:
+            raise Exception(WRONG_CACHE_SIZE_MESSAGE.format(cache_size=cache_size))
+        self.suffix_path = suffix_path
+        self.cache_size = cache_size
+        self.num_rules = 0
+        self._trie = {}
+        if suffix_path is not None:
+            self._load_suffixes(suffix_path)
+
+        self._cached_to_ascii = lru_cache(maxsize=cache_size)(self._to_ascii)
+        self._cached_split = lru_cache(maxsize=cache_size)(self._split)
+
+    def normalize(self, domain: str) -> str:
+        """
+        Normalize one domain.
+
+        Args:
+            domain (str): Raw domain.
+
+        Returns:
+            str: Lowercase ASCII domain without trailing dots.
+        """
+        domain = domain.strip().rstrip(".")
+        if domain.isascii():
+            return domain.lower()
+        return self._cached_to_ascii(domain)
+
+    def normalize_batch(self, domains: Sequence[str]) -> list[str]:
+        """
+        Normalize a batch of domains.
+
+        Args:
+            domains (Sequence[str]): Raw domains.
+
+        Returns:
+            list[str]: Lowercase ASCII domains without trailing dots.
+        """
+        text = "\n".join(domains)
+        if not text.isascii():
+            return [self.normalize(domain) for domain in domains]
+
+        normalized = text.lower().split("\n") if domains else []
+        # Only touch domains one by one when some of them need it
+        if ".\n" in text or text.endswith(".") or any(character in text for character in " \t\r\f\v"):
+            normalized = [domain.strip().rstrip(".") for domain in normalized]
+        return normalized
+
+    def split(self, domain: str) -> tuple[str, str, str]:
+        """
+        Split a normalized domain into subdomain, registrable domain and public suffix.
+
+        For example "a.b.example.co.uk" is ("a.b", "example.co.uk", "co.uk").
+
+        Args:
+            domain (str): Normalized domain.
+
+        Returns:
+            tuple[str, str, str]: Subdomain, registrable domain (empty if the domain is a
+                public suffix) and public suffix.
+        """
+        return self._cached_split(domain)
+
+    def get_suffixes(self, domains: Sequence[str]) -> list[str]:
+        """
+        Get the public suffix of every normalized domain.
+
+        Args:
+            domains (Sequence[str]): Normalized domains.
+
+        Returns:
+            list[str]: Public suffixes.
+        """
+        return [self._cached_split(domain)[2] for domain in domains]
+
+    def get_registrable_domains(self, domains: Sequence[str]) -> list[str]:
+        """
+        Get the registrable domain of every normalized domain.
+
+        Args:
+            domains (Sequence[str]): Normalized domains.
+
+        Returns:
+            list[str]: Registrable domains, empty for public suffixes.
+        """
+        return [self._cached_split(domain)[1] for domain in domains]
+
+    def get_stats(self) -> Result:
+        """
+        Get the statistics of the caches.
+
+        Returns:
+            Result: Hits, misses and size of the IDNA and split caches, and number of suffix rules.
+        """
+        result = Result()
+        for name, cache in (("IDNA", self._cached_to_ascii), ("Split", self._cached_split)):
+            info = cache.cache_info()
+            result.add_metric(f"{name} hits", info.hits)
+            result.add_metric(f"{name} misses", info.misses)
+            result.add_metric(f"{name} size", info.currsize)
+        result.add_metric("Suffix rules", self.num_rules)
+        return result
+
+    def clear_cache(self) -> None:
+        """Empty both caches."""
+        self._cached_to_ascii.cache_clear()
+        self._cached_split.cache_clear()
+
+    def _to_ascii(self, domain: str) -> str:
+        """
+        Convert an internationalized domain to its lowercase ASCII form.
+
+        The IDNA codec is used when possible; names it rejects (empty or
+        too long labels) are converted label by label with punycode.
+
+        Args:
+            domain (str): Domain with non-ASCII characters, already stripped.
+
+        Returns:
+            str: ASCII domain.
+        """
+        try:
+            return domain.encode("idna").decode("ascii").lower()
+        except UnicodeError:
+            return ".".join(
+                label.lower() if label.isascii() else "xn--" + label.lower().encode("punycode").decode("ascii")
+                for label in domain.split(".")
+            )
+
+    def _split(self, domain: str) -> tuple[str, str, str]:
+        """
+        Split a normalized domain with the suffix trie (see split).
+
+        Args:
+            domain (str): Normalized domain.
+
+        Returns:
+            tuple[str, str, str]: Subdomain, registrable domain and public suffix.
+        """
+        # Walk the labels from the right by their dot positions, without splitting the domain
+        suffix_start = domain.rfind(".") + 1
+        node = self._trie
+        end = len(domain)
+        while end > 0:
+            dot = domain.rfind(".", 0, end)
+            child = node.get(domain[dot + 1:end])
+            if child is None:
+                if "*" in node:
+                    suffix_start = dot + 1
+                break
+            rule = child.get(RULE_KEY)
+            if rule == EXCEPTION_RULE:
+                suffix_start = end + 1
+                break
+            if rule == NORMAL_RULE or "*" in node:
+                suffix_start = dot + 1
+            node = child
+            end = dot
+
+        if suffix_start == 0:
+            return "", "", domain
+        registrable_start = domain.rfind(".", 0, suffix_start - 1) + 1
+        return domain[:max(registrable_start - 1, 0)], domain[registrable_start:], domain[suffix_start:]
+
+    def _load_suffixes(self, path: str) -> None:
+        """
+        Compile the rules of a public suffix file into the label trie.
+
+        Args:
+            path (str): Path to the file.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("//"):
+                    continue
+                rule = line.split()[0]
+                kind = EXCEPTION_RULE if rule.startswith("!") else NORMAL_RULE
+                rule = rule.lstrip("!")
+                if not rule.isascii():
+                    rule = self._to_ascii(rule)
+
+                node = self._trie
+                for label in reversed(rule.lower().split(".")):
+                    node = node.setdefault(label, {})
+                node[RULE_KEY] = kind
+                self.num_rules += 1
@@ -0,0 +1,399 @@
+from typing import Sequence
+import numpy as np
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_SKETCH_MESSAGE = """ERROR:
+
+Sketches are not compatible...
+
+Both sketches must have the same depth, width and TLD buckets
+Shape: {shape} - {other_shape}
+"""
+
+# Longest domain name allowed by DNS, longer names are truncated
+MAX_DOMAIN_BYTES = 253
+
+# Length histogram bins, the last one holds every longer domain
+LENGTH_BINS = 64
+
+# Entropy histogram over [0, MAX_ENTROPY) bits, the last bin holds every higher entropy
+ENTROPY_BINS = 32
+MAX_ENTROPY = 6.0
+
+# TLD bytes hashed, longer TLDs share the bucket of their prefix
+MAX_TLD_BYTES = 16
+
+# Odd multipliers of the count-min rows (multiplicative hashing)
+ROW_MULTIPLIERS = np.array([0x9e3779b1, 0x85ebca77, 0xc2b2ae3d, 0x27d4eb2f, 0x165667b1, 0xd3a2646c | 1], dtype=np.uint32)
+
+DOT = ord(".")
+
+# x * log2(x) of every possible character count
+X_LOG_X = np.r_[0.0, np.arange(1, MAX_DOMAIN_BYTES + 1) * np.log2(np.arange(1, MAX_DOMAIN_BYTES + 1))]
+
+
+class DomainSketch:
+    """
+    A compact, mergeable summary of a stream of domains.
+
+    It holds a count-min sketch of the character bigrams and trigrams, a
+    length histogram, a Shannon entropy histogram and a hashed TLD
+    distribution. Its memory does not depend on the number of domains. Every
+    part is a table of integer counts filled with bincounts over the UTF-8 byte
+    matrix of the batch (lengths and entropies are in bytes, which are the
+    characters of ASCII domains), so summarizing is vectorized, and sketches merge by adding
+    (and subtracting) their counts, which is how sliding windows are kept.
+
+    Divergences between two sketches are Jensen-Shannon divergences (base 2,
+    between 0 and 1) of their distributions; for n-grams, it is the mean over
+    the rows of the count-min sketch, each one a hashed n-gram histogram.
+
+    Attributes:
+        depth (int): Rows of the count-min sketch.
+        width (int): Columns of the count-min sketch.
+        tld_buckets (int): Buckets of the TLD distribution.
+        domains (int): Number of summarized domains.
+        ngram_counts (np.ndarray): (depth, width) count-min sketch.
+        length_counts (np.ndarray): Number of domains per length in bytes.
+        entropy_counts (np.ndarray): Number of domains per entropy bin.
+        tld_counts (np.ndarray): Number of domains per TLD bucket.
+        tld_names (dict[int, str]): A TLD of every non-empty bucket, for reports.
+    """
+
+    def __init__(self, depth: int = 4, width: int = 1 << 14, tld_buckets: int = 4096) -> None:
+        """
+        Initialize an empty sketch.
+
+        Args:
+            depth (int, optional): Rows of the count-min sketch, up to 6. Defaults to 4.
+            width (int, optional): Columns of the count-min sketch, a power of 2. Defaults to 16384.
+            tld_buckets (int, optional): Buckets of the TLD distribution. Defaults to 4096.
+        """
+        self.depth = min(depth, len(ROW_MULTIPLIERS))
+        self.width = 1 << (int(width) - 1).bit_length()
+        self.tld_buckets = tld_buckets
+        self.domains = 0
+        self.ngram_counts = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.length_counts = np.zeros(LENGTH_BINS, dtype=np.int64)
+        self.entropy_counts = np.zeros(ENTROPY_BINS, dtype=np.int64)
+        self.tld_counts = np.zeros(tld_buckets, dtype=np.int64)
+        self.tld_names = {}
+        self._encoder = DomainEncoder(max_length=MAX_DOMAIN_BYTES, offset=0, truncating="post")
+
+    @classmethod
+    def from_domains(cls, domains: Sequence[str], batch_size: int = 65536, **kwargs) -> "DomainSketch":
+        """
+        Summarize domains in batches.
+
+        Args:
+            domains (Sequence[str]): Domains.
+            batch_size (int, optional): Domains per batch. Defaults to 65536.
+            **kwargs: Arguments of the constructor.
+
+        Returns:
+            DomainSketch: The sketch.
+        """
+        sketch = cls(**kwargs)
+        for start in range(0, len(domains), batch_size):
+            sketch.update(domains[start:start + batch_size])
+        return sketch
+
+    def update(self, domains: Sequence[str]) -> None:
+        """
+        Add a batch of domains to the sketch.
+
+        Args:
+            domains (Sequence[str]): Domains.
+        """
+        if len(domains) == 0:
+            return
+        # IDNs are summarized by their UTF-8 bytes, so no character collapses into the zero padding
+        codes, lengths = self._encoder.encode_utf8(list(domains))
+        lengths = np.minimum(lengths, MAX_DOMAIN_BYTES)
+        codes = codes[:, :max(int(lengths.max()), 1)]
+
+        self.domains += len(domains)
+        self._add_ngrams(codes)
+        self.length_counts += np.bincount(np.minimum(lengths, LENGTH_BINS - 1), minlength=LENGTH_BINS)
+        entropy_bins = np.minimum((self._entropies(codes, lengths) * (ENTROPY_BINS / MAX_ENTROPY)).astype(np.int64), ENTROPY_BINS - 1)
+        self.entropy_counts += np.bincount(entropy_bins, minlength=ENTROPY_BINS)
+        self._add_tlds(codes, lengths, domains)
+
+    def merge(self, other: "DomainSketch") -> None:
+        """
+        Add the counts of another sketch.
+
+        Args:
+            other (DomainSketch): Sketch with the same shape.
+
+        Raises:
+            Exception: If the sketches have different shapes.
+        """
+        self._check_compatible(other)
+        self.domains += other.domains
+        self.ngram_counts += other.ngram_counts
+        self.length_counts += other.length_counts
+        self.entropy_counts += other.entropy_counts
+        self.tld_counts += other.tld_counts
+        for bucket, name in other.tld_names.items():
+            self.tld_names.setdefault(bucket, name)
+
+    def subtract(self, other: "DomainSketch") -> None:
+        """
+        Remove the counts of another sketch, previously merged into this one.
+
+        Args:
+            other (DomainSketch): Sketch with the same shape.
+
+        Raises:
+            Exception: If the sketches have different shapes.
+        """
+        self._check_compatible(other)
+        self.domains -= other.domains
+        self.ngram_counts -= other.ngram_counts
+        self.length_counts -= other.length_counts
+        self.entropy_counts -= other.entropy_counts
+        self.tld_counts -= other.tld_counts
+
+    def clear(self) -> None:
+        """Remove every count."""
+        self.domains = 0
+        for counts in (self.ngram_counts, self.length_counts, self.entropy_counts, self.tld_counts):
+            counts.fill(0)
+        self.tld_names.clear()
+
+    def estimate(self, ngram: str) -> int:
+        """
+        Estimate the number of occurrences of a bigram or trigram (never an underestimate).
+
+        Args:
+            ngram (str): Two or three ASCII characters.
+
+        Returns:
+            int: Estimated count.
+        """
+        packed = np.uint32(0)
+        for byte in ngram.encode("ascii"):
+            packed = (packed << np.uint32(8)) | np.uint32(byte)
+        columns = self._hash(np.array([packed], dtype=np.uint32))
+        return int(self.ngram_counts[np.arange(self.depth), columns[:, 0]].min())
+
+    def divergence(self, other: "DomainSketch") -> Result:
+        """
+        Calculate the Jensen-Shannon divergence of every distribution with another sketch.
+
+        Args:
+            other (DomainSketch): Sketch with the same shape.
+
+        Returns:
+            Result: N-gram, length, entropy and TLD divergences (0 for identical
+                distributions, 1 for disjoint ones).
+
+        Raises:
+            Exception: If the sketches have different shapes.
+        """
+        self._check_compatible(other)
+        result = Result()
+        result.add_metric("N-gram JSD", float(np.mean(_js_divergence(self.ngram_counts, other.ngram_counts))))
+        result.add_metric("Length JSD", float(_js_divergence(self.length_counts, other.length_counts)))
+        result.add_metric("Entropy JSD", float(_js_divergence(self.entropy_counts, other.entropy_counts)))
+        result.add_metric("TLD JSD", float(_js_divergence(self.tld_counts, other.tld_counts)))
+        return result
+
+    def top_tlds(self, count: int = 10) -> list[tuple[str, float]]:
+        """
+        Get the most frequent TLD buckets.
+
+        Args:
+            count (int, optional): Number of TLDs. Defaults to 10.
+
+        Returns:
+            list[tuple[str, float]]: A TLD of every bucket and its share of the domains, most frequent first.
+        """
+        buckets = np.argsort(-self.tld_counts, kind="stable")[:count]
+        total = max(int(self.tld_counts.sum()), 1)
+        return [(self.tld_names.get(int(bucket), "?"), self.tld_counts[bucket] / total) for bucket in buckets if self.tld_counts[bucket]]
+
+    def get_bytes(self) -> int:
+        """
+        Get the memory used by the count tables.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return sum(counts.nbytes for counts in (self.ngram_counts, self.length_counts, self.entropy_counts, self.tld_counts))
+
+    def copy(self) -> "DomainSketch":
+        """
+        Create an empty sketch with the same shape.
+
+        Returns:
+            DomainSketch: The empty sketch.
+        """
+        return DomainSketch(self.depth, self.width, self.tld_buckets)
+
+    def save(self, path: str) -> None:
+        """
+        Save the sketch in NumPy .npz format.
+
+        Args:
+            path (str): Output path.
+        """
+        buckets = np.array(sorted(self.tld_names), dtype=np.int64)
+        np.savez_compressed(
+            path,
+            domains=np.array(self.domains),
+            ngram_counts=self.ngram_counts,
+            length_counts=self.length_counts,
+            entropy_counts=self.entropy_counts,
+            tld_counts=self.tld_counts,
+            tld_buckets=buckets,
+            tld_names=np.array([self.tld_names[int(bucket)] for bucket in buckets], dtype=str)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "DomainSketch":
+        """
+        Load a sketch saved with save().
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            DomainSketch: The sketch.
+        """
+        with np.load(path) as data:
+            depth, width = data["ngram_counts"].shape
+            sketch = cls(depth, width, len(data["tld_counts"]))
+            sketch.domains = int(data["domains"])
+            sketch.ngram_counts[:] = data["ngram_counts"]
+            sketch.length_counts[:] = data["length_counts"]
+            sketch.entropy_counts[:] = data["entropy_counts"]
+            sketch.tld_counts[:] = data["tld_counts"]
+            sketch.tld_names = dict(zip(data["tld_buckets"].tolist(), data["tld_names"].tolist()))
+        return sketch
+
+    def _add_ngrams(self, codes: np.ndarray) -> None:
+        """
+        Count the bigrams and trigrams of a byte matrix in every row of the count-min sketch.
+
+        Args:
+            codes (np.ndarray): Byte matrix, zero past the end of every domain.
+        """
+        codes = codes.astype(np.uint32)
+        bigrams = (codes[:, :-1] << np.uint32(8)) | codes[:, 1:]
+        trigrams = (bigrams[:, :-1] << np.uint32(8)) | codes[:, 2:]
+        # N-grams past the end of a domain end with a zero byte and are skipped
+        packed = np.concatenate([bigrams[codes[:, 1:] != 0], trigrams[codes[:, 2:] != 0]])
+        for row, columns in enumerate(self._hash(packed)):
+            self.ngram_counts[row] += np.bincount(columns, minlength=self.width)
+
+    def _hash(self, packed: np.ndarray) -> np.ndarray:
+        """
+        Hash packed n-grams to one column per row of the count-min sketch.
+
+        Args:
+            packed (np.ndarray): uint32 packed n-grams.
+
+        Returns:
+            np.ndarray: (depth, n) column indices.
+        """
+        shift = np.uint32(32 - (self.width.bit_length() - 1))
+        return (packed[None, :] * ROW_MULTIPLIERS[:self.depth, None]) >> shift
+
+    def _entropies(self, codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Calculate the Shannon entropy (bits per byte) of every domain.
+
+        Args:
+            codes (np.ndarray): Byte matrix, zero past the end of every domain.
+            lengths (np.ndarray): Length in bytes of every domain.
+
+        Returns:
+            np.ndarray: Entropy of every domain.
+        """
+        # Equal bytes are contiguous in every sorted row, count them as runs
+        ordered = np.sort(codes, axis=1)
+        change = np.ones(ordered.shape, dtype=bool)
+        np.not_equal(ordered[:, 1:], ordered[:, :-1], out=change[:, 1:])
+        starts = np.flatnonzero(change)
+        runs = np.diff(np.r_[starts, ordered.size])
+        valid = ordered.ravel()[starts] != 0
+
+        totals = np.maximum(lengths, 1).astype(np.float64)
+        rows = starts[valid] // ordered.shape[1]
+        weighted = np.bincount(rows, weights=X_LOG_X[runs[valid]], minlength=len(codes))
+        return np.maximum(np.log2(totals) - weighted / totals, 0.0)
+
+    def _add_tlds(self, codes: np.ndarray, lengths: np.ndarray, domains: Sequence[str]) -> None:
+        """
+        Count the TLD bucket of every domain (its bytes after the last dot).
+
+        Args:
+            codes (np.ndarray): Byte matrix, zero past the end of every domain.
+            lengths (np.ndarray): Length in bytes of every domain.
+            domains (Sequence[str]): The domains, to name new buckets.
+        """
+        positions = np.arange(codes.shape[1])
+        last_dot = np.where(codes == DOT, positions, -1).max(axis=1)
+        hashes = np.zeros(len(codes), dtype=np.uint32)
+        for offset in range(1, MAX_TLD_BYTES + 1):
+            column = last_dot + offset
+            inside = column < lengths
+            if not inside.any():
+                break
+            byte = codes[np.arange(len(codes)), np.minimum(column, codes.shape[1] - 1)].astype(np.uint32)
+            hashes = np.where(inside, hashes * np.uint32(31) + byte, hashes)
+        buckets = (hashes % np.uint32(self.tld_buckets)).astype(np.int64)
+        self.tld_counts += np.bincount(buckets, minlength=self.tld_buckets)
+
+        # Name the buckets seen for the first time, once each
+        unique, first = np.unique(buckets, return_index=True)
+        for bucket, index in zip(unique.tolist(), first.tolist()):
+            if bucket not in self.tld_names:
+                self.tld_names[bucket] = domains[index].rpartition(".")[2].lower()
+
+    def _check_compatible(self, other: "DomainSketch") -> None:
+        """
+        Check that another sketch has the same shape.
+
+        Args:
+            other (DomainSketch): The other sketch.
+
+        Raises:
+            Exception: If the shapes are different.
+        """
+        shape = (self.depth, self.width, self.tld_buckets)
+        other_shape = (other.depth, other.width, other.tld_buckets)
+        if shape != other_shape:
+            raise Exception(WRONG_SKETCH_MESSAGE.format(shape=shape, other_shape=other_shape))
+
+
+def _js_divergence(counts: np.ndarray, other_counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the Jensen-Shannon divergence (base 2) of count distributions along the last axis.
+
+    Args:
+        counts (np.ndarray): Counts of the first distribution.
+        other_counts (np.ndarray): Counts of the second distribution.
+
+    Returns:
+        np.ndarray: Divergence, 0 if one of the distributions is empty.
+    """
+    totals = counts.sum(axis=-1, keepdims=True)
+    other_totals = other_counts.sum(axis=-1, keepdims=True)
+    p = counts / np.maximum(totals, 1)
+    q = other_counts / np.maximum(other_totals, 1)
+    m = (p + q) / 2
+
+    def kl(a: np.ndarray) -> np.ndarray:
+        terms = np.zeros_like(a)
+        np.divide(a, m, out=terms, where=a > 0)
+        np.log2(terms, out=terms, where=a > 0)
+        return (a * terms).sum(axis=-1)
+
+    divergence = (kl(p) + kl(q)) / 2
+    return np.where((totals[..., 0] > 0) & (other_totals[..., 0] > 0), divergence, 0.0)
@@ -0,0 +1,182 @@
+from collections import deque
+from typing import Optional, Sequence
+from RAMPAGE.DomainSketch import DomainSketch
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_WINDOW_MESSAGE = """ERROR:
+
+Wrong window...
+
+Possible values: window_size >= buckets >= 1
+Window size: {window_size}
+Buckets: {buckets}
+"""
+
+# Divergences compared with the threshold
+DRIFT_METRICS = ("N-gram JSD", "Length JSD", "Entropy JSD", "TLD JSD")
+
+
+class DriftMonitor:
+    """
+    A streaming concept-drift monitor over sliding windows of domains.
+
+    It compares a reference DomainSketch (usually of the training split) with
+    a sketch of the latest domains of the stream (window_size when a bucket is
+    completed, at least window_size - window_size / buckets afterwards). The
+    window is a ring of buckets, each one a DomainSketch of window_size /
+    buckets domains, plus their running sum: incoming domains are added to the
+    current bucket and to the sum, and when the ring is full the oldest bucket
+    is subtracted from the sum and reused. Memory is bounded by buckets + 2
+    sketches, no domain is stored, and the divergences of the window are
+    computed every time a bucket is completed and kept in a bounded history.
+
+    Attributes:
+        reference (DomainSketch): Sketch the stream is compared with.
+        window_size (int): Number of domains of the window.
+        threshold (float): Divergence above which the window has drifted.
+        window (DomainSketch): Sketch of the current window.
+        history (deque[Result]): Divergences of the last completed buckets.
+        seen (int): Number of domains of the stream.
+    """
+
+    def __init__(
+        self,
+        reference: DomainSketch,
+        window_size: int = 100000,
+        buckets: int = 10,
+        threshold: float = 0.1,
+        history_size: int = 1000
+    ) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            reference (DomainSketch): Sketch the stream is compared with.
+            window_size (int, optional): Number of domains of the window. Defaults to 100000.
+            buckets (int, optional): Buckets the window slides by. Defaults to 10.
+            threshold (float, optional): Divergence above which the window has drifted. Defaults to 0.1.
+            history_size (int, optional): Completed buckets kept in the history. Defaults to 1000.
+
+        Raises:
+            Exception: If window_size or buckets are not valid.
+        """
+        if buckets < 1 or window_size < buckets:
+            raise Exception(WRONG_WINDOW_MESSAGE.format(window_size=window_size, buckets=buckets))
+        self.reference = reference
+        self.window_size = window_size
+        self.threshold = threshold
+        self.window = reference.copy()
+        self.history = deque(maxlen=history_size)
+        self.seen = 0
+
+        self._bucket_size = window_size // buckets
+        self._buckets = deque([reference.copy()], maxlen=buckets)
+
+    @classmethod
+    def from_split(cls, elements, batch_size: int = 65536, **kwargs) -> "DriftMonitor":
+        """
+        Create a monitor with the sketch of a dataset split as reference.
+
+        Args:
+            elements (Iterable[DataElement]): The split (e.g. the training set).
+            batch_size (int, optional): Domains per batch. Defaults to 65536.
+            **kwargs: Arguments of the constructor.
+
+        Returns:
+            DriftMonitor: The monitor.
+        """
+        domains = [element.domain for element in elements]
+        return cls(DomainSketch.from_domains(domains, batch_size), **kwargs)
+
+    def update(self, domains: Sequence[str]) -> list[Result]:
+        """
+        Add a batch of domains of the stream.
+
+        Args:
+            domains (Sequence[str]): Domains.
+
+        Returns:
+            list[Result]: Divergences of every bucket completed by this batch.
+        """
+        completed = []
+        start = 0
+        while start < len(domains):
+            bucket = self._buckets[-1]
+            chunk = domains[start:start + self._bucket_size - bucket.domains]
+            bucket.update(chunk)
+            self.window.update(chunk)
+            self.seen += len(chunk)
+            start += len(chunk)
+
+            if bucket.domains == self._bucket_size:
+                result = self.get_drift()
+                self.history.append(result)
+                completed.append(result)
+                self._rotate()
+        return completed
+
+    def get_drift(self) -> Result:
+        """
+        Compare the current window with the reference.
+
+        Returns:
+            Result: Domains seen, domains in the window, every divergence and
+                "Drift" (1 if a divergence is above the threshold, 0 otherwise).
+        """
+        divergence = self.reference.divergence(self.window)
+        metrics = dict(divergence.get_metrics())
+
+        result = Result()
+        result.add_metric("Seen", self.seen)
+        result.add_metric("Window", self.window.domains)
+        for name, value in divergence.get_metrics():
+            result.add_metric(name, value)
+        result.add_metric("Drift", int(any(metrics[name] > self.threshold for name in DRIFT_METRICS)))
+        return result
+
+    def is_drifting(self) -> bool:
+        """
+        Check whether the current window has drifted from the reference.
+
+        Returns:
+            bool: True if a divergence is above the threshold.
+        """
+        return bool(dict(self.get_drift().get_metrics())["Drift"])
+
+    def get_bytes(self) -> int:
+        """
+        Get the memory used by the sketches of the monitor, including the reference.
+
+        Returns:
+            int: Size in bytes.
+        """
+        sketches = [self.reference, self.window] + list(self._buckets)
+        return sum(sketch.get_bytes() for sketch in sketches)
+
+    def reset(self, reference: Optional[DomainSketch] = None) -> None:
+        """
+        Empty the window and history, optionally with a new reference (e.g. after retraining).
+
+        Args:
+            reference (DomainSketch, optional): New reference. Defaults to None (keep it).
+        """
+        if reference is not None:
+            self.reference = reference
+        self.window = self.reference.copy()
+        self._buckets = deque([self.reference.copy()], maxlen=self._buckets.maxlen)
+        self.history.clear()
+        self.seen = 0
+
+    def _rotate(self) -> None:
+        """
+        Start a new bucket, removing the oldest one from the window when the ring is full.
+        """
+        if len(self._buckets) == self._buckets.maxlen:
+            oldest = self._buckets.popleft()
+            self.window.subtract(oldest)
+            oldest.clear()
+            self._buckets.append(oldest)
+        else:
+            self._buckets.append(self.reference.copy())
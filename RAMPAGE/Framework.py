@@ -1,7 +1,35 @@
+import contextlib
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
 import warnings
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Callable, Iterator, Optional
+import numpy as np
+from RAMPAGE.BloomFilter import BloomFilter
 from RAMPAGE.Classifier import Classifier
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.Cascade import Cascade
+from RAMPAGE.Comparison import Comparison
+from RAMPAGE.CurveResult import CurveResult, DEFAULT_FPR_TARGETS
+from RAMPAGE.HistogramResult import HistogramResult, DEFAULT_BINS
+from RAMPAGE.InferenceBenchmark import InferenceBenchmark
+from RAMPAGE.MatrixResult import MatrixResult
 from RAMPAGE.Result import Result
+from RAMPAGE.ResultStore import ResultStore
+from RAMPAGE.ScoreResult import ScoreResult
+from RAMPAGE.SliceResult import SliceResult
+from RAMPAGE.SpilledSplit import SpilledSplit
 from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.DnsQueryReader import DnsQueryReader
+from RAMPAGE.DomainNormalizer import DomainNormalizer
+from RAMPAGE.DriftMonitor import DriftMonitor
 
 
 # Error and warning message templates
@@ -39,15 +67,103 @@ Debug mode is NOT activated
 Not allowed to execute {function_name} without debug mode
 """
 
+ERROR_OUTPUT_FORMAT = """
+ERROR:
+
+Wrong output format...
+
+Possible values: 'csv', 'binary'
+Output format: {output_format}
+"""
+
+ERROR_NOT_EVALUATED = """
+ERROR:
+
+Classifier has no raw scores...
+
+Evaluate it with evaluate_by_index before recomputing its metrics
+Index: {index}
+"""
+
+ERROR_NO_ELEMENTS = """
+ERROR:
+
+Result has no data elements to slice by...
+
+Only the built-in slices are available for spilled test splits
+Index: {index}
+Slice key: {by}
+"""
+
+ERROR_WRONG_SHARD = """
+ERROR:
+
+Wrong shard...
+
+Possible values: 0 <= shard < num_shards
+Shard: {shard}
+Number of shards: {num_shards}
+"""
+
+WARNING_NOT_SPILLED = """
+WARNING:
+
+Split cannot be spilled to disk, it stays in memory...
+
+Only plain DataElement objects can be spilled
+Split: {split}
+Element type: {element_type}
+"""
+
+ERROR_UNKNOWN_DATASET = """
+ERROR:
+
+Unknown dataset...
+
+Possible values: {names}
+Dataset: {name}
+"""
+
+ERROR_MATRIX_MODE = """
+ERROR:
+
+Wrong matrix mode...
+
+Possible values: 'test', 'evaluate'
+Mode: {mode}
+"""
+
+WARNING_NO_PARTIAL_TRAIN = """
+WARNING:
+
+Classifier does not implement partial_train, it is retrained from scratch...
+
+Classifier: {classifier}
+"""
+
+# Elements sampled to estimate the memory used by a split
+MEMORY_SAMPLE_SIZE = 1024
+
+# Split attributes of DatasetManager, in spilling order when sizes are equal
+SPLIT_NAMES = ("train", "validation", "test")
+
 class Framework:
     """
     A framework for managing machine learning classifiers and datasets.
     
     Attributes:
         debug (bool): Debug mode flag.
-        dataset_manager (DatasetManager): Manager for handling datasets.
+        dataset_manager (DatasetManager): Manager for handling datasets (the current one).
+        dataset_managers (dict[str, DatasetManager]): Named dataset managers, for matrix runs.
+        dataset_name (str): Name of the current dataset manager, or None if it is not named.
         classifiers (list[Classifier]): List of classifiers.
         results (list[Result]): List of results.
+        allowlist (BloomFilter): Optional known-benign pre-filter applied before classifiers.
+        result_store (ResultStore): Optional store every new result is appended to.
+        timings (list[dict[str, float]]): Seconds of the last train, test and evaluation of every classifier.
+        memory_budget (int): Optional bytes the in-memory splits may use before being spilled to disk.
+        spill_dir (str): Directory of the spilled splits.
+        benchmark (InferenceBenchmark): Optional inference benchmark run after every test or evaluation.
     """
 
     def __init__(self, debug_mode: bool = False) -> None:
@@ -59,8 +175,18 @@ class Framework:
         """
         self.debug = debug_mode
         self.dataset_manager = None
+        self.dataset_managers = {}
+        self.dataset_name = None
         self.classifiers = []
         self.results = []
+        self.allowlist = None
+        self.result_store = None
+        self.timings = []
+        self.memory_budget = None
+        self.spill_dir = None
+        self.benchmark = None
+        # id(dataset manager) -> (dataset manager, its version, its fingerprint), see _get_dataset_fingerprint
+        self._dataset_fingerprints = {}
 
         if self.debug:
             print("\n#############################################")
@@ -75,17 +201,60 @@ class Framework:
             dataset_manager (DatasetManager): The dataset manager to use.
         """
         self.dataset_manager = dataset_manager
+        self.dataset_name = None
+
+    def add_dataset_manager(self, name: str, dataset_manager: DatasetManager) -> None:
+        """
+        Register a named dataset manager and make it the current one.
 
-    def add_dataset(self, path: str, random_sets: bool) -> None:
+        Named managers are the datasets of run_matrix. The current one is used by
+        every other method (add_dataset, train, test, evaluate...), so datasets
+        are loaded by selecting each manager and adding its files.
+
+        Args:
+            name (str): Name of the dataset.
+            dataset_manager (DatasetManager): The dataset manager.
+        """
+        self.dataset_managers[name] = dataset_manager
+        self.use_dataset_manager(name)
+
+    def use_dataset_manager(self, name: str) -> None:
+        """
+        Make a named dataset manager the current one.
+
+        Args:
+            name (str): Name of the dataset.
+
+        Raises:
+            Exception: If no dataset manager has that name.
+        """
+        if name not in self.dataset_managers:
+            raise Exception(ERROR_UNKNOWN_DATASET.format(names=", ".join(self.dataset_managers), name=name))
+        self.dataset_manager = self.dataset_managers[name]
+        self.dataset_name = name
+
+    def get_dataset_names(self) -> list[str]:
+        """
+        Get the names of the registered dataset managers.
+
+        Returns:
+            list[str]: Names, in registration order.
+        """
+        return list(self.dataset_managers)
+
+    def add_dataset(self, path: str, random_sets: bool, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add and split dataset from file.
 
         Args:
             path (str): Path to dataset file.
             random_sets (bool): Whether to randomize the splits.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture,
+                whose labelled names are added. Defaults to None (dataset format).
         """
-        self.dataset_manager.add(path, random_sets)
-        
+        self.dataset_manager.add(path, random_sets, reader)
+        self._enforce_memory_budget()
+
         if self.debug:
             print("#############################################")
             print("###### NEW DataElements added to sets #######")
@@ -94,32 +263,151 @@ class Framework:
             print(f"  new size of VALIDATION set: {len(self.dataset_manager.get_validation())}")
             print(f"  new size of TEST set      : {len(self.dataset_manager.get_test())}\n")
 
-    def add_train_dataset(self, path: str) -> None:
+    def add_train_dataset(self, path: str, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add data to training set.
 
         Args:
             path (str): Path to training dataset file.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture. Defaults to None.
         """
-        self.dataset_manager.add_train(path)
+        self.dataset_manager.add_train(path, reader)
+        self._enforce_memory_budget()
 
-    def add_validation_dataset(self, path: str) -> None:
+    def add_validation_dataset(self, path: str, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add data to validation set.
 
         Args:
             path (str): Path to validation dataset file.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture. Defaults to None.
         """
-        self.dataset_manager.add_validation(path)
+        self.dataset_manager.add_validation(path, reader)
+        self._enforce_memory_budget()
 
-    def add_test_dataset(self, path: str) -> None:
+    def add_test_dataset(self, path: str, reader: Optional[DnsQueryReader] = None) -> None:
         """
         Add data to test set.
 
         Args:
             path (str): Path to test dataset file.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture. Defaults to None.
+        """
+        self.dataset_manager.add_test(path, reader)
+        self._enforce_memory_budget()
+
+    def set_allowlist(self, allowlist: Optional[BloomFilter]) -> None:
+        """
+        Set the known-benign pre-filter, or disable it with None.
+
+        Domains found in the allowlist are scored as legitimate (0.0) without
+        reaching any classifier. While it is set, classifiers are tested through
+        their predict method and get a ScoreResult with a "Filtered" metric.
+
+        Args:
+            allowlist (BloomFilter): The allowlist, or None.
+        """
+        self.allowlist = allowlist
+
+    def build_allowlist(self, path: Optional[str] = None, false_positive_rate: float = 0.001) -> BloomFilter:
+        """
+        Build and set a known-benign pre-filter.
+
+        Args:
+            path (str, optional): Domain list file (plain or dataset format). Defaults to None,
+                which uses the legitimate domains of the training set.
+            false_positive_rate (float, optional): Target false positive rate. Defaults to 0.001.
+
+        Returns:
+            BloomFilter: The allowlist.
+        """
+        if path is None:
+            allowlist = BloomFilter.from_data(self.dataset_manager.get_train(), false_positive_rate)
+        else:
+            allowlist = BloomFilter.from_file(path, false_positive_rate)
+        self.set_allowlist(allowlist)
+
+        if self.debug:
+            print("#############################################")
+            print("############# Allowlist created #############")
+            print("#############################################\n")
+            print(f"  domains     : {allowlist.capacity}")
+            print(f"  bytes       : {allowlist.nbytes}")
+            print(f"  hashes      : {allowlist.num_hashes}\n")
+
+        return allowlist
+
+    def set_result_store(self, result_store: Optional[ResultStore]) -> None:
+        """
+        Set the store every new test or evaluation result is appended to, or disable it with None.
+
+        Each result is stored with the classifier name, the fingerprints of its
+        configuration and of the dataset, and its timings.
+
+        Args:
+            result_store (ResultStore): The store, or None.
+        """
+        self.result_store = result_store
+
+    def set_memory_budget(self, max_bytes: Optional[int], spill_dir: Optional[str] = None) -> None:
+        """
+        Bound the memory used by the dataset splits, or remove the bound with None.
+
+        While the estimated size of the in-memory splits is above the budget,
+        the largest one is spilled to disk (SpilledSplit): its domains and labels
+        are written to memory-mapped files and the set is replaced by the
+        spilled split, which classifiers iterate chunk by chunk and
+        DatasetPipeline streams from a memory-mapped encoding. The budget is
+        enforced again every time data is added. Removing it loads every
+        spilled split back into memory and deletes its files.
+
+        Args:
+            max_bytes (int): Budget in bytes, or None.
+            spill_dir (str, optional): Directory of the spilled splits. Defaults to None
+                (a new temporary directory).
         """
-        self.dataset_manager.add_test(path)
+        self.memory_budget = max_bytes
+        if spill_dir is not None:
+            self.spill_dir = spill_dir
+
+        if max_bytes is None:
+            self._restore_splits()
+        else:
+            self._enforce_memory_budget()
+
+    def set_benchmark(self, benchmark: Optional[InferenceBenchmark]) -> None:
+        """
+        Set the inference benchmark run after every test or evaluation, or disable it with None.
+
+        Its latency, throughput, load time and model size metrics are appended
+        to the result of every classifier (see benchmark_by_index).
+
+        Args:
+            benchmark (InferenceBenchmark): The benchmark, or None.
+        """
+        self.benchmark = benchmark
+
+    def build_drift_monitor(self, **kwargs) -> DriftMonitor:
+        """
+        Build a drift monitor with the sketch of the training set as reference.
+
+        Args:
+            **kwargs: Arguments of DriftMonitor (window_size, buckets, threshold, history_size).
+
+        Returns:
+            DriftMonitor: The monitor, to be fed with the live domains.
+        """
+        monitor = DriftMonitor.from_split(self.dataset_manager.get_train(), **kwargs)
+
+        if self.debug:
+            print("#############################################")
+            print("########### Drift monitor created ###########")
+            print("#############################################\n")
+            print(f"  reference domains: {monitor.reference.domains}")
+            print(f"  window size      : {monitor.window_size}")
+            print(f"  bytes            : {monitor.get_bytes()}\n")
+
+        return monitor
 
     def add_classifier(self, classifier: Classifier) -> None:
         """
@@ -130,6 +418,39 @@ class Framework:
         """
         self.classifiers.append(classifier)
         self.results.append(None)
+        self.timings.append({})
+
+    def add_cascade(
+        self,
+        indices: list[int],
+        thresholds: list[tuple[float, float]],
+        threshold: float = 0.5
+    ) -> Cascade:
+        """
+        Chain registered classifiers into a cascade and register it.
+
+        The cascade is tested like any other classifier. Its result includes the
+        combined metrics and the traffic fraction and time of every stage.
+
+        Args:
+            indices (list[int]): Indices of the stage classifiers, cheapest first.
+            thresholds (list[tuple[float, float]]): (low, high) pairs for every stage but the last.
+                Domains scored strictly between them go to the next stage, and low <= threshold < high.
+            threshold (float, optional): Decision threshold of the final scores. Defaults to 0.5.
+
+        Returns:
+            Cascade: The registered cascade.
+
+        Raises:
+            IndexError: If an index is out of bounds.
+            Exception: If the thresholds do not match the stages or the decision threshold.
+        """
+        for index in indices:
+            self._validate_classifier_index(index)
+
+        cascade = Cascade([self.classifiers[index] for index in indices], thresholds, threshold)
+        self.add_classifier(cascade)
+        return cascade
 
     def get_classifier_by_index(self, index: int) -> Classifier:
         """
@@ -147,10 +468,27 @@ class Framework:
         self._validate_classifier_index(index)
         return self.classifiers[index]
 
+    def get_classifier_names(self) -> list[str]:
+        """
+        Get a unique name for every classifier, to key their results.
+
+        A classifier is named by its model_name attribute if it has one (e.g. the
+        bucketed and plain examples), otherwise by its class. Names shared by
+        several classifiers get the index of each one as suffix (e.g. "NGramClassifier-1").
+
+        Returns:
+            list[str]: Name of every classifier, in index order.
+        """
+        names = [getattr(classifier, "model_name", None) or classifier.__class__.__name__
+                 for classifier in self.classifiers]
+        counts = Counter(names)
+        return [name if counts[name] == 1 else f"{name}-{index}" for index, name in enumerate(names)]
+
     def clear_classifiers(self) -> None:
         """Clear all classifiers and results."""
         self.classifiers.clear()
         self.results.clear()
+        self.timings.clear()
 
     def run(self) -> None:
         """Train and test all classifiers."""
@@ -209,10 +547,73 @@ class Framework:
             IndexError: If index is out of bounds.
         """
         self._validate_classifier_index(index)
+        start = time.perf_counter()
         self.classifiers[index].train(
             self.dataset_manager.get_train(),
             self.dataset_manager.get_validation()
         )
+        self.timings[index]["train"] = time.perf_counter() - start
+        self._collect_garbage()
+
+    def update(self, path: str, random_sets: bool = True, reader: Optional[DnsQueryReader] = None) -> None:
+        """
+        Load new records and update every classifier with them only.
+
+        The records are split and added to the datasets as with add_dataset.
+        Every classifier is then updated through partial_train with the new
+        training records, validated on the new validation records (or the whole
+        validation set when the update has none), so the cost of an update
+        depends on the size of the new data, not on the history. Classifiers
+        without partial_train are retrained from scratch on the whole training set.
+
+        Args:
+            path (str): Path to the file with the new records.
+            random_sets (bool, optional): Whether to randomize the splits. Defaults to True.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture. Defaults to None.
+        """
+        new_train, new_validation, new_test = self.dataset_manager.add(path, random_sets, reader)
+        self._enforce_memory_budget()
+        validation = new_validation if new_validation else self.dataset_manager.get_validation()
+        for i in range(len(self.classifiers)):
+            self.partial_train_by_index(i, new_train, validation)
+
+        if self.debug:
+            print("#############################################")
+            print("############ Classifiers updated ############")
+            print("#############################################\n")
+            print(f"  new TRAIN elements     : {len(new_train)}")
+            print(f"  new VALIDATION elements: {len(new_validation)}")
+            print(f"  new TEST elements      : {len(new_test)}")
+            for classifier, timings in zip(self.classifiers, self.timings):
+                print(f"  {classifier.__class__.__name__:<23}: {timings.get('update', 0.0):.3f} s")
+            print()
+
+    def partial_train_by_index(self, index: int, new_train_set, validation_set) -> None:
+        """
+        Update the classifier at specified index with new training data only.
+
+        Falls back to a full train on the training set, with a warning, if the
+        classifier does not implement partial_train.
+
+        Args:
+            index (int): Index of the classifier to update.
+            new_train_set (Iterable[DataElement]): The new training data.
+            validation_set (Iterable[DataElement]): The validation data.
+
+        Raises:
+            IndexError: If index is out of bounds.
+        """
+        self._validate_classifier_index(index)
+        classifier = self.classifiers[index]
+        start = time.perf_counter()
+        # Checked up front, a NotImplementedError raised inside an implementation must not trigger a retrain
+        if type(classifier).partial_train is Classifier.partial_train:
+            warnings.warn(WARNING_NO_PARTIAL_TRAIN.format(classifier=classifier.__class__.__name__))
+            self.train_by_index(index)
+        else:
+            classifier.partial_train(new_train_set, validation_set)
+        self.timings[index]["update"] = time.perf_counter() - start
+        self._collect_garbage()
 
     def test(self) -> None:
         """Test all classifiers."""
@@ -241,9 +642,505 @@ class Framework:
             IndexError: If index is out of bounds.
         """
         self._validate_classifier_index(index)
-        self.results[index] = self.classifiers[index].test(
-            self.dataset_manager.get_test()
-        )
+        start = time.perf_counter()
+        if self.allowlist is None:
+            self.results[index] = self.classifiers[index].test(
+                self.dataset_manager.get_test()
+            )
+        else:
+            self.results[index] = self._test_with_allowlist(self.classifiers[index])
+        self.timings[index]["test"] = time.perf_counter() - start
+        self._append_benchmark(index)
+        self._store_result(index)
+        self._collect_garbage()
+
+    def benchmark_by_index(self, index: int, benchmark: Optional[InferenceBenchmark] = None) -> Result:
+        """
+        Benchmark the inference of the classifier at specified index.
+
+        The batches are cut from the first domains of the test split, and the
+        classifier is called directly, without the allowlist.
+
+        Args:
+            index (int): Index of the classifier to benchmark.
+            benchmark (InferenceBenchmark, optional): The benchmark. Defaults to None
+                (the one set with set_benchmark, or a default one).
+
+        Returns:
+            Result: Model size, load time and per batch size latency and throughput.
+
+        Raises:
+            IndexError: If index is out of bounds.
+        """
+        self._validate_classifier_index(index)
+        if benchmark is None:
+            benchmark = self.benchmark if self.benchmark is not None else InferenceBenchmark()
+
+        start = time.perf_counter()
+        result = self._run_benchmark(self.classifiers[index], self.dataset_manager.get_test(), benchmark)
+        self.timings[index]["benchmark"] = time.perf_counter() - start
+
+        if self.debug:
+            print("#############################################")
+            print("########### Inference benchmarked ###########")
+            print("#############################################\n")
+            print(f"  classifier          : {self.classifiers[index].__class__.__name__}")
+            for name, value in result.get_metrics():
+                print(f"  {name:<20}: {value}")
+            print()
+
+        return result
+
+    def evaluate(self, batch_size: int = 65536) -> None:
+        """
+        Evaluate all classifiers from their raw test scores.
+
+        Args:
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+        """
+        for i in range(len(self.classifiers)):
+            self.evaluate_by_index(i, batch_size=batch_size)
+
+    def evaluate_classifier(
+        self,
+        classifier: Classifier,
+        scores_path: Optional[str] = None,
+        batch_size: int = 65536
+    ) -> ScoreResult:
+        """
+        Evaluate a specific classifier from its raw test scores.
+
+        Args:
+            classifier (Classifier): The classifier to evaluate.
+            scores_path (str, optional): Path to save the scores to. Defaults to None.
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+
+        Returns:
+            ScoreResult: The result, or None if the classifier is not found.
+        """
+        index = self._get_classifier_index(classifier)
+        if index is None:
+            return None
+        return self.evaluate_by_index(index, scores_path, batch_size)
+
+    def evaluate_by_index(
+        self,
+        index: int,
+        scores_path: Optional[str] = None,
+        batch_size: int = 65536
+    ) -> ScoreResult:
+        """
+        Evaluate the classifier at specified index from its raw test scores.
+
+        Unlike test_by_index, the test split is scored once through the predict
+        method of the classifier, in large batches, and every metric is computed
+        from the per-domain scores, which are kept in the result (and saved, if a
+        path is given) to recompute metrics later without running inference.
+
+        Args:
+            index (int): Index of the classifier to evaluate.
+            scores_path (str, optional): Path to save the scores to (.npz). Defaults to None.
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+
+        Returns:
+            ScoreResult: The result, also stored as the result of the classifier.
+
+        Raises:
+            IndexError: If index is out of bounds.
+        """
+        self._validate_classifier_index(index)
+        classifier = self.classifiers[index]
+        result, filtered, elapsed = self._score_test_set(classifier, batch_size)
+        self.results[index] = result
+        self.timings[index]["evaluate"] = elapsed
+        self._append_benchmark(index)
+        self._store_result(index)
+        self._collect_garbage()
+
+        if scores_path is not None:
+            result.save(scores_path)
+
+        if self.debug:
+            print("#############################################")
+            print("############ Test split evaluated ###########")
+            print("#############################################\n")
+            print(f"  classifier: {classifier.__class__.__name__}")
+            print(f"  domains   : {len(result.scores)}")
+            print(f"  filtered  : {filtered}")
+            print(f"  seconds   : {elapsed:.3f}\n")
+
+        return result
+
+    def evaluate_shard(
+        self,
+        index: int,
+        shard: int,
+        num_shards: int,
+        bins: int = DEFAULT_BINS,
+        batch_size: int = 65536
+    ) -> HistogramResult:
+        """
+        Evaluate the classifier at specified index on one shard of the test split.
+
+        Test domains are assigned to shards by a CRC32 of the domain, which does not
+        depend on the process, so every process or node holding the same test split
+        evaluates a disjoint part of it. HistogramResult.merge_all() combines the
+        results of all the shards into the result of the whole split. The result is
+        not stored as the result of the classifier.
+
+        Args:
+            index (int): Index of the classifier to evaluate.
+            shard (int): Shard to evaluate, from 0 to num_shards - 1.
+            num_shards (int): Number of shards.
+            bins (int, optional): Number of score bins. Defaults to 4096.
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+
+        Returns:
+            HistogramResult: The mergeable result of the shard.
+
+        Raises:
+            IndexError: If index is out of bounds.
+            Exception: If the shard is not between 0 and num_shards - 1.
+        """
+        self._validate_classifier_index(index)
+        if not 0 <= shard < num_shards:
+            raise Exception(ERROR_WRONG_SHARD.format(shard=shard, num_shards=num_shards))
+
+        elements = [
+            element for element in self.dataset_manager.get_test()
+            if zlib.crc32(element.domain.encode("utf-8")) % num_shards == shard
+        ]
+        result, _, _ = self._score_test_set(self.classifiers[index], batch_size, elements)
+        return HistogramResult.from_scores(result.labels, result.scores, result.threshold, bins)
+
+    def rescore_by_index(self, index: int, threshold: float) -> ScoreResult:
+        """
+        Recompute the metrics of an evaluated classifier at another threshold.
+
+        Args:
+            index (int): Index of the classifier.
+            threshold (float): New decision threshold.
+
+        Returns:
+            ScoreResult: The result at the new threshold, also stored as the result of the classifier.
+
+        Raises:
+            IndexError: If index is out of bounds.
+            Exception: If the classifier has not been evaluated with evaluate_by_index.
+        """
+        self._validate_result_index(index)
+        if not isinstance(self.results[index], ScoreResult):
+            raise Exception(ERROR_NOT_EVALUATED.format(index=index))
+        self.results[index] = self.results[index].with_threshold(threshold)
+        return self.results[index]
+
+    def slice_by_index(self, index: int, by: str = "tld") -> SliceResult:
+        """
+        Compute every metric per slice of the test split for an evaluated classifier.
+
+        Args:
+            index (int): Index of the classifier.
+            by (str, optional): "tld", "length", "suffix" (public suffix, with the normalizer of
+                the dataset manager if set) or the name of a DataElement attribute (e.g. a DGA
+                family column of a DataElement subclass). Defaults to "tld".
+
+        Returns:
+            SliceResult: The metrics of every slice.
+
+        Raises:
+            IndexError: If index is out of bounds.
+            Exception: If the classifier has not been evaluated with evaluate_by_index, or
+                by is an attribute and the test split was spilled.
+        """
+        self._validate_result_index(index)
+        result = self.results[index]
+        if not isinstance(result, ScoreResult):
+            raise Exception(ERROR_NOT_EVALUATED.format(index=index))
+        if by in ("tld", "length"):
+            return result.slices(by)
+        if by == "suffix":
+            normalizer = getattr(self.dataset_manager, "normalizer", None) or DomainNormalizer()
+            return result.slices(normalizer.get_suffixes(result.domains))
+
+        if result.elements is None:
+            raise Exception(ERROR_NO_ELEMENTS.format(index=index, by=by))
+        return result.slices([getattr(element, by) for element in result.elements])
+
+    def compare_curves(
+        self,
+        max_points: Optional[int] = None,
+        fpr_targets: tuple[float, ...] = DEFAULT_FPR_TARGETS
+    ) -> Result:
+        """
+        Compare the ROC and precision-recall curves of every evaluated classifier.
+
+        Only classifiers evaluated with evaluate() or evaluate_by_index() are included,
+        named as in get_classifier_names().
+
+        Args:
+            max_points (int, optional): Keep about this many points per curve. Defaults to None.
+            fpr_targets (tuple[float, ...], optional): False positive rates to compare at.
+                Defaults to (1e-4, 1e-3, 1e-2).
+
+        Returns:
+            Result: AUC, average precision and true positive rate at every target of every classifier.
+        """
+        curves = {}
+        for name, result in zip(self.get_classifier_names(), self.results):
+            if isinstance(result, ScoreResult):
+                curves[name] = result.curve(max_points, fpr_targets)
+        return CurveResult.compare(curves, fpr_targets)
+
+    def compare_classifiers(self, resamples: int = 2000, confidence: float = 0.95, seed: Optional[int] = None) -> Comparison:
+        """
+        Build a statistical comparison of every evaluated classifier.
+
+        Only classifiers evaluated with evaluate() or evaluate_by_index() are included,
+        named as in get_classifier_names().
+
+        Args:
+            resamples (int, optional): Number of bootstrap resamples. Defaults to 2000.
+            confidence (float, optional): Confidence level of the intervals. Defaults to 0.95.
+            seed (int, optional): Seed of the resamples. Defaults to None.
+
+        Returns:
+            Comparison: Confidence intervals and paired tests by classifier name.
+        """
+        results = {
+            name: result
+            for name, result in zip(self.get_classifier_names(), self.results)
+            if isinstance(result, ScoreResult)
+        }
+        return Comparison(results, resamples, confidence, seed=seed)
+
+    def run_matrix(
+        self,
+        classifiers: dict[str, Callable[[], Classifier]],
+        datasets: Optional[list[str]] = None,
+        mode: str = "test",
+        workers: Optional[int] = None,
+        exclusive: bool = True,
+        share_encodings: bool = True
+    ) -> MatrixResult:
+        """
+        Train and test (or evaluate) every classifier on every named dataset.
+
+        Every dataset is loaded once, by its manager, and its splits are shared
+        by all the cells: they run in a thread pool over the same split objects,
+        and a new classifier is created for every cell. With share_encodings, the
+        splits are spilled first (SpilledSplit), so every encoding is computed
+        once per encoder fingerprint and memory-mapped by all the cells that use
+        it (see DatasetPipeline); they are loaded back afterwards unless a memory
+        budget is set. With exclusive, the cells of classifiers of the same class
+        train and test one after another, whatever their row names or arguments,
+        since classifiers may keep their models at paths fixed by their class
+        (as the examples do), and the other cells run in parallel. The allowlist,
+        benchmark and result store apply to every cell, and a failing cell is
+        recorded in the matrix without stopping the others.
+
+        Args:
+            classifiers (dict[str, Callable[[], Classifier]]): Function creating a new
+                classifier (e.g. its class) by name.
+            datasets (list[str], optional): Names of the dataset managers. Defaults to None (all of them).
+            mode (str, optional): 'test' or 'evaluate' (see evaluate_by_index). Defaults to 'test'.
+            workers (int, optional): Number of threads. Defaults to None (one per core).
+            exclusive (bool, optional): Whether the cells of classifiers of the same class run one at a
+                time. Defaults to True.
+            share_encodings (bool, optional): Whether the splits are spilled to share their encodings.
+                Defaults to True.
+
+        Returns:
+            MatrixResult: Result and timings of every (classifier, dataset) cell.
+
+        Raises:
+            Exception: If the mode or a dataset name is not valid.
+        """
+        if mode not in ("test", "evaluate"):
+            raise Exception(ERROR_MATRIX_MODE.format(mode=mode))
+        datasets = self.get_dataset_names() if datasets is None else list(datasets)
+        for name in datasets:
+            if name not in self.dataset_managers:
+                raise Exception(ERROR_UNKNOWN_DATASET.format(names=", ".join(self.dataset_managers), name=name))
+
+        spilled = []
+        if share_encodings:
+            for dataset in datasets:
+                dataset_manager = self.dataset_managers[dataset]
+                if any(self._spill_split(dataset_manager, name, dataset) is not None for name in SPLIT_NAMES):
+                    spilled.append(dataset_manager)
+
+        # The class of a classifier is only known once its factory creates it
+        class_locks = {}
+        class_locks_guard = threading.Lock()
+
+        def lock_class(instance: Classifier):
+            if not exclusive:
+                return contextlib.nullcontext()
+            with class_locks_guard:
+                return class_locks.setdefault(type(instance), threading.Lock())
+
+        # Cells of different classifiers first, so concurrent cells rarely wait on the same class
+        cells = [(classifier, dataset) for dataset in datasets for classifier in classifiers]
+
+        def run_cell(cell: tuple[str, str]) -> tuple:
+            classifier, dataset = cell
+            return cell + self._run_cell(classifiers[classifier], dataset, mode, lock_class)
+
+        matrix = MatrixResult(list(classifiers), datasets)
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(min(workers or os.cpu_count() or 1, len(cells)), 1)) as executor:
+                futures = [executor.submit(run_cell, cell) for cell in cells]
+                for future in as_completed(futures):
+                    classifier, dataset, instance, result, timings, error = future.result()
+                    matrix.set_cell(classifier, dataset, result, timings, error)
+                    # The store connection belongs to this thread, runs are stored under the row name
+                    if self.result_store is not None and result is not None:
+                        self.result_store.add(
+                            result,
+                            classifier,
+                            ResultStore.config_fingerprint(instance),
+                            self._get_dataset_fingerprint(self.dataset_managers[dataset]),
+                            timings
+                        )
+        finally:
+            if self.memory_budget is None:
+                self._restore_splits(spilled)
+            self._collect_garbage()
+
+        if self.debug:
+            print("#############################################")
+            print("########### Classifier matrix run ###########")
+            print("#############################################\n")
+            print(f"  classifiers: {len(matrix.classifiers)}")
+            print(f"  datasets   : {len(matrix.datasets)}")
+            print(f"  failed     : {len(matrix.errors)}")
+            print(f"  seconds    : {time.perf_counter() - start:.3f}\n")
+
+        return matrix
+
+    def predict_classifier(
+        self,
+        classifier: Classifier,
+        path: str,
+        output_path: str,
+        batch_size: int = 65536,
+        output_format: str = "csv",
+        reader: Optional[DnsQueryReader] = None
+    ) -> Result:
+        """
+        Score an unlabelled domain file with a specific classifier.
+
+        Args:
+            classifier (Classifier): The classifier to use.
+            path (str): Path to the file with one domain per line.
+            output_path (str): Path to the output file.
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+            output_format (str, optional): 'csv' or 'binary'. Defaults to 'csv'.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture. Defaults to None.
+
+        Returns:
+            Result: Throughput metrics, or None if the classifier is not found.
+        """
+        index = self._get_classifier_index(classifier)
+        if index is None:
+            return None
+        return self.predict_by_index(index, path, output_path, batch_size, output_format, reader)
+
+    def predict_by_index(
+        self,
+        index: int,
+        path: str,
+        output_path: str,
+        batch_size: int = 65536,
+        output_format: str = "csv",
+        reader: Optional[DnsQueryReader] = None
+    ) -> Result:
+        """
+        Score an unlabelled domain file with the classifier at specified index.
+
+        The file is streamed in batches, so memory does not grow with its size.
+        Lines in dataset format (<domain>;<label>) are also accepted, the label is
+        ignored. With a reader, the names queried in a DNS query log or pcap
+        capture are scored instead (once each, if it deduplicates). The 'csv'
+        output has one "<domain>,<score>" line per domain, blank lines are skipped.
+        The 'binary' output is a raw little-endian float32 array with one score
+        per input line in input order (readable with numpy.fromfile(path, "<f4")),
+        NaN for blank lines, so its positions match the line numbers.
+
+        Args:
+            index (int): Index of the classifier to use.
+            path (str): Path to the file with one domain per line.
+            output_path (str): Path to the output file.
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+            output_format (str, optional): 'csv' or 'binary'. Defaults to 'csv'.
+            reader (DnsQueryReader, optional): Reader of a DNS query log or pcap capture. Defaults to None.
+
+        Returns:
+            Result: Number of domains, elapsed seconds and domains per second.
+
+        Raises:
+            IndexError: If index is out of bounds.
+            Exception: If the output format is not valid.
+        """
+        self._validate_classifier_index(index)
+        if output_format not in ("csv", "binary"):
+            raise Exception(ERROR_OUTPUT_FORMAT.format(output_format=output_format))
+
+        classifier = self.classifiers[index]
+        total = 0
+        filtered = 0
+        start = time.perf_counter()
+
+        if reader is None:
+            batches = self._read_domain_batches(path, batch_size)
+        else:
+            batches = (
+                names[batch_start:batch_start + batch_size]
+                for names in reader.read_domains(path)
+                for batch_start in range(0, len(names), batch_size)
+            )
+
+        mode = "w" if output_format == "csv" else "wb"
+        with open(output_path, mode) as output:
+            for lines in batches:
+                domains = [domain for domain in lines if domain]
+                if domains:
+                    scores, filtered_batch = self._predict_with_allowlist(classifier, domains)
+                else:
+                    scores, filtered_batch = np.empty(0, dtype=np.float32), 0
+                scores = scores.astype("<f4")
+                filtered += filtered_batch
+                if output_format == "csv":
+                    output.writelines(f"{domain},{score}\n" for domain, score in zip(domains, scores.tolist()))
+                elif len(domains) < len(lines):
+                    # Blank lines keep their position in the binary output
+                    line_scores = np.full(len(lines), np.nan, dtype="<f4")
+                    line_scores[np.fromiter(map(bool, lines), dtype=bool, count=len(lines))] = scores
+                    line_scores.tofile(output)
+                else:
+                    scores.tofile(output)
+                total += len(domains)
+
+        elapsed = time.perf_counter() - start
+        throughput = total / elapsed if elapsed > 0 else 0.0
+
+        result = Result()
+        result.add_metric("Domains", total)
+        result.add_metric("Seconds", elapsed)
+        result.add_metric("Domains/s", throughput)
+        if self.allowlist is not None:
+            result.add_metric("Filtered", filtered / total if total else 0.0)
+
+        if self.debug:
+            print("#############################################")
+            print("########## Unlabelled domains scored ########")
+            print("#############################################\n")
+            print(f"  classifier: {classifier.__class__.__name__}")
+            print(f"  domains   : {total}")
+            print(f"  domains/s : {throughput:.1f}\n")
+
+        return result
 
     def get_results(self) -> list[Result]:
         """
@@ -307,6 +1204,336 @@ class Framework:
                 print(f"  - {element.domain} -> {element.is_dga}")
             print()
 
+    @staticmethod
+    def _read_domain_batches(path: str, batch_size: int) -> Iterator[list[str]]:
+        """
+        Stream the domains of a file with one domain per line (or in dataset format).
+
+        Args:
+            path (str): Path to the file.
+            batch_size (int): Lines read per batch.
+
+        Returns:
+            Iterator[list[str]]: Batches with the domain of every line, "" for blank lines.
+        """
+        with open(path, "r") as f:
+            while lines := list(islice(f, batch_size)):
+                yield [line.strip().split(";")[0] for line in lines]
+
+    def _run_cell(
+        self,
+        factory: Callable[[], Classifier],
+        dataset: str,
+        mode: str,
+        lock: Callable[[Classifier], contextlib.AbstractContextManager]
+    ) -> tuple:
+        """
+        Create, train and test (or evaluate) a classifier on a named dataset.
+
+        Args:
+            factory (Callable[[], Classifier]): Function creating the classifier.
+            dataset (str): Name of the dataset manager.
+            mode (str): 'test' or 'evaluate'.
+            lock (Callable[[Classifier], contextlib.AbstractContextManager]): Context held by the
+                created classifier from its training to its benchmark.
+
+        Returns:
+            tuple: The classifier, its result (None if it failed), the seconds of every
+                phase and the error message (None if it succeeded).
+        """
+        dataset_manager = self.dataset_managers[dataset]
+        classifier = None
+        timings = {}
+        try:
+            start = time.perf_counter()
+            classifier = factory()
+            timings["load"] = time.perf_counter() - start
+
+            with lock(classifier):
+                start = time.perf_counter()
+                classifier.train(dataset_manager.get_train(), dataset_manager.get_validation())
+                timings["train"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                if mode == "test" and self.allowlist is None:
+                    result = classifier.test(dataset_manager.get_test())
+                else:
+                    result = self._score_test_set(classifier, test_set=dataset_manager.get_test())[0]
+                timings[mode] = time.perf_counter() - start
+
+                if self.benchmark is not None:
+                    start = time.perf_counter()
+                    benchmark = self._run_benchmark(classifier, dataset_manager.get_test(), self.benchmark)
+                    timings["benchmark"] = time.perf_counter() - start
+                    for name, value in benchmark.get_metrics():
+                        result.add_metric(name, value)
+        except Exception as error:
+            return classifier, None, timings, f"{error.__class__.__name__}: {error}"
+        return classifier, result, timings, None
+
+    def _predict_with_allowlist(self, classifier: Classifier, domains: list[str]) -> tuple[np.ndarray, int]:
+        """
+        Score domains, short-circuiting the allowlisted ones.
+
+        Args:
+            classifier (Classifier): The classifier to use.
+            domains (list[str]): The domains to score.
+
+        Returns:
+            tuple[np.ndarray, int]: Scores and number of allowlisted domains.
+        """
+        if self.allowlist is None:
+            return np.asarray(classifier.predict(domains), dtype=np.float32).ravel(), 0
+
+        allowed = self.allowlist.contains(domains)
+        scores = np.zeros(len(domains), dtype=np.float32)
+        if not allowed.all():
+            remaining = [domain for domain, is_allowed in zip(domains, allowed) if not is_allowed]
+            scores[~allowed] = np.asarray(classifier.predict(remaining), dtype=np.float32).ravel()
+        return scores, int(allowed.sum())
+
+    def _test_with_allowlist(self, classifier: Classifier) -> Result:
+        """
+        Test a classifier through its predict method behind the allowlist.
+
+        Args:
+            classifier (Classifier): The classifier to test.
+
+        Returns:
+            Result: Metrics of the combined allowlist and classifier, and filtered fraction.
+        """
+        return self._score_test_set(classifier)[0]
+
+    def _score_test_set(
+        self,
+        classifier: Classifier,
+        batch_size: int = 65536,
+        elements: Optional[list[DataElement]] = None,
+        test_set=None
+    ) -> tuple[ScoreResult, int, float]:
+        """
+        Score the test split in batches, behind the allowlist if set.
+
+        Args:
+            classifier (Classifier): The classifier to use.
+            batch_size (int, optional): Domains scored per batch. Defaults to 65536.
+            elements (list[DataElement], optional): Part of the test split to score. Defaults to None (all of it).
+            test_set (Iterable[DataElement], optional): The test split. Defaults to None
+                (the one of the current dataset manager).
+
+        Returns:
+            tuple[ScoreResult, int, float]: The result ("Filtered" is added when an
+                allowlist is set), number of allowlisted domains and elapsed seconds.
+        """
+        if test_set is None:
+            test_set = self.dataset_manager.get_test()
+        if elements is None and isinstance(test_set, SpilledSplit):
+            # Read the columns directly instead of creating DataElement objects
+            domains = test_set.get_domains()
+            labels = np.array(test_set.labels)
+        else:
+            if elements is None:
+                elements = list(test_set)
+            domains = [element.domain for element in elements]
+            labels = np.fromiter((element.is_dga for element in elements), dtype=bool, count=len(elements))
+
+        start = time.perf_counter()
+        scores = np.empty(len(domains), dtype=np.float32)
+        filtered = 0
+        for batch_start in range(0, len(domains), batch_size):
+            batch = domains[batch_start:batch_start + batch_size]
+            scores[batch_start:batch_start + len(batch)], filtered_batch = self._predict_with_allowlist(classifier, batch)
+            filtered += filtered_batch
+        elapsed = time.perf_counter() - start
+
+        # The elements stay aligned with the scores, to slice by their attributes later
+        result = ScoreResult(labels, scores, domains=domains, elements=elements)
+        if self.allowlist is not None:
+            result.add_metric("Filtered", filtered / len(domains) if domains else 0.0)
+        return result, filtered, elapsed
+
+    def _enforce_memory_budget(self) -> None:
+        """
+        Spill the largest in-memory splits to disk until they fit in the memory budget, if set.
+        """
+        if self.memory_budget is None or self.dataset_manager is None:
+            return
+
+        sizes = {
+            name: self._estimate_split_bytes(getattr(self.dataset_manager, f"{name}_set"))
+            for name in SPLIT_NAMES
+        }
+        total = sum(sizes.values())
+        for name in sorted(SPLIT_NAMES, key=lambda name: -sizes[name]):
+            if total <= self.memory_budget or sizes[name] == 0:
+                break
+            spilled = self._spill_split(self.dataset_manager, name, self.dataset_name)
+            if spilled is None:
+                continue
+            total -= sizes[name]
+
+            if self.debug:
+                print("#############################################")
+                print("########### Split spilled to disk ###########")
+                print("#############################################\n")
+                print(f"  split     : {name.upper()}")
+                print(f"  domains   : {len(spilled)}")
+                print(f"  bytes     : {sizes[name]} -> {spilled.get_disk_bytes()} on disk\n")
+
+    def _spill_split(self, dataset_manager: DatasetManager, name: str, dataset_name: Optional[str]) -> SpilledSplit:
+        """
+        Replace an in-memory split of a dataset manager with a spilled split.
+
+        Args:
+            dataset_manager (DatasetManager): The dataset manager.
+            name (str): 'train', 'validation' or 'test'.
+            dataset_name (str): Name of the dataset manager, its splits are spilled
+                to their own subdirectory, or None.
+
+        Returns:
+            SpilledSplit: The spilled split, or None if it is empty, already spilled
+                or holds elements that cannot be spilled.
+        """
+        split = getattr(dataset_manager, f"{name}_set")
+        if isinstance(split, SpilledSplit) or len(split) == 0:
+            return None
+        element_type = type(next(iter(split)))
+        if element_type is not DataElement:
+            warnings.warn(WARNING_NOT_SPILLED.format(split=name, element_type=element_type.__name__))
+            return None
+
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="rampage-")
+        directory = self.spill_dir if dataset_name is None else os.path.join(self.spill_dir, dataset_name)
+        spilled = SpilledSplit.spill(split, directory, name)
+        setattr(dataset_manager, f"{name}_set", spilled)
+        del split
+        gc.collect()
+        return spilled
+
+    def _restore_splits(self, dataset_managers: Optional[list[DatasetManager]] = None) -> None:
+        """
+        Load every spilled split back into memory and delete its files.
+
+        Args:
+            dataset_managers (list[DatasetManager], optional): Managers whose splits are restored.
+                Defaults to None (the current and every named one).
+        """
+        if dataset_managers is None:
+            dataset_managers = [self.dataset_manager] + [
+                dataset_manager for dataset_manager in self.dataset_managers.values()
+                if dataset_manager is not self.dataset_manager
+            ]
+        for dataset_manager in dataset_managers:
+            if dataset_manager is None:
+                continue
+            for name in SPLIT_NAMES:
+                split = getattr(dataset_manager, f"{name}_set")
+                if isinstance(split, SpilledSplit):
+                    setattr(dataset_manager, f"{name}_set", split.to_set())
+                    split.delete()
+
+    def _collect_garbage(self) -> None:
+        """
+        Run a full garbage collection between phases when a memory budget is set.
+        """
+        if self.memory_budget is not None:
+            gc.collect()
+
+    @staticmethod
+    def _estimate_split_bytes(split) -> int:
+        """
+        Estimate the memory used by an in-memory split from a sample of its elements.
+
+        Args:
+            split (Iterable[DataElement]): The split.
+
+        Returns:
+            int: Estimated bytes of the container, elements, attribute dicts and domains,
+                0 for a spilled or empty split.
+        """
+        if isinstance(split, SpilledSplit) or len(split) == 0:
+            return 0
+        sample = list(islice(split, MEMORY_SAMPLE_SIZE))
+        element_bytes = sum(
+            sys.getsizeof(element) + sys.getsizeof(vars(element)) + sys.getsizeof(element.domain)
+            for element in sample
+        ) / len(sample)
+        return int(sys.getsizeof(split) + element_bytes * len(split))
+
+    @staticmethod
+    def _run_benchmark(classifier: Classifier, test_set, benchmark: InferenceBenchmark) -> Result:
+        """
+        Benchmark a classifier with batches cut from the first domains of a test split.
+
+        Args:
+            classifier (Classifier): The classifier.
+            test_set (Iterable[DataElement]): The test split.
+            benchmark (InferenceBenchmark): The benchmark.
+
+        Returns:
+            Result: The benchmark metrics.
+        """
+        sample_size = benchmark.get_sample_size()
+        if isinstance(test_set, SpilledSplit):
+            domains = test_set.get_domains(0, min(sample_size, len(test_set)))
+        else:
+            domains = [element.domain for element in islice(test_set, sample_size)]
+        return benchmark.run(classifier, domains)
+
+    def _append_benchmark(self, index: int) -> None:
+        """
+        Append the benchmark metrics to the result of a classifier, if a benchmark is set.
+
+        Args:
+            index (int): Index of the classifier.
+        """
+        if self.benchmark is None or self.results[index] is None:
+            return
+        for name, value in self.benchmark_by_index(index).get_metrics():
+            self.results[index].add_metric(name, value)
+
+    def _store_result(self, index: int) -> None:
+        """
+        Append the result of a classifier to the result store, if set.
+
+        The run is stored under the unique name of the classifier (see
+        get_classifier_names), so two configurations of a class do not share
+        leaderboard and trend entries.
+
+        Args:
+            index (int): Index of the classifier.
+        """
+        if self.result_store is None or self.results[index] is None:
+            return
+        classifier = self.classifiers[index]
+        self.result_store.add(
+            self.results[index],
+            self.get_classifier_names()[index],
+            ResultStore.config_fingerprint(classifier),
+            self._get_dataset_fingerprint(self.dataset_manager),
+            self.timings[index]
+        )
+
+    def _get_dataset_fingerprint(self, dataset_manager: DatasetManager) -> str:
+        """
+        Get the fingerprint of the splits of a dataset manager, cached until they change.
+
+        Fingerprinting sorts every domain of every split, so it is only
+        computed again when the version of the dataset manager changes.
+
+        Args:
+            dataset_manager (DatasetManager): The dataset manager.
+
+        Returns:
+            str: Hex fingerprint (see ResultStore.dataset_fingerprint).
+        """
+        cached = self._dataset_fingerprints.get(id(dataset_manager))
+        if cached is None or cached[1] != dataset_manager.version:
+            cached = (dataset_manager, dataset_manager.version, ResultStore.dataset_fingerprint(dataset_manager))
+            self._dataset_fingerprints[id(dataset_manager)] = cached
+        return cached[2]
+
     def _validate_classifier_index(self, index: int) -> None:
         """
         Validate classifier index.
@@ -0,0 +1,194 @@
+from functools import reduce
+from typing import Iterable
+import numpy as np
+from RAMPAGE.ConfusionResult import ConfusionResult
+
+
+# Error message templates
+WRONG_MERGE_MESSAGE = """ERROR:
+
+Results cannot be merged...
+
+Both results must have the same number of bins and threshold
+Bins: {bins} - {other_bins}
+Threshold: {threshold} - {other_threshold}
+"""
+
+# Score bins over [0, 1] by default
+DEFAULT_BINS = 4096
+
+
+class HistogramResult(ConfusionResult):
+    """
+    A classification result made only of sufficient statistics, so it can be merged.
+
+    It stores the confusion counts at its threshold and a histogram of the
+    scores of each class over fixed bins of [0, 1], all as integer counts, and
+    derives every metric from them. Partial results of disjoint shards of a
+    test set merge by adding their counts, which is associative and exact, so
+    shards can be evaluated in any order across processes or nodes and the
+    merged result equals the one of a single pass.
+
+    The AUC is computed from the histograms, counting scores within the same
+    bin as ties.
+
+    Attributes:
+        threshold (float): Scores above it are DGA.
+        positive_histogram (np.ndarray): Number of DGA domains per score bin.
+        negative_histogram (np.ndarray): Number of legitimate domains per score bin.
+    """
+
+    def __init__(
+        self,
+        tp: int,
+        tn: int,
+        fp: int,
+        fn: int,
+        positive_histogram: np.ndarray,
+        negative_histogram: np.ndarray,
+        threshold: float = 0.5
+    ) -> None:
+        """
+        Initialize HistogramResult and calculate all metrics.
+
+        Args:
+            tp (int): Number of true positives.
+            tn (int): Number of true negatives.
+            fp (int): Number of false positives.
+            fn (int): Number of false negatives.
+            positive_histogram (np.ndarray): Number of DGA domains per score bin.
+            negative_histogram (np.ndarray): Number of legitimate domains per score bin.
+            threshold (float, optional): Scores above it are DGA. Defaults to 0.5.
+        """
+        self.threshold = float(threshold)
+        self.positive_histogram = np.asarray(positive_histogram, dtype=np.int64)
+        self.negative_histogram = np.asarray(negative_histogram, dtype=np.int64)
+        super().__init__(tp, tn, fp, fn, self._histogram_auc())
+
+    @classmethod
+    def from_scores(
+        cls,
+        labels: np.ndarray,
+        scores: np.ndarray,
+        threshold: float = 0.5,
+        bins: int = DEFAULT_BINS
+    ) -> "HistogramResult":
+        """
+        Build the result from labels and scores.
+
+        Args:
+            labels (np.ndarray): 1 for DGA domains and 0 otherwise.
+            scores (np.ndarray): DGA score of every domain.
+            threshold (float, optional): Scores above it are DGA. Defaults to 0.5.
+            bins (int, optional): Number of score bins. Defaults to 4096.
+
+        Returns:
+            HistogramResult: The result.
+        """
+        labels = np.asarray(labels).astype(bool).ravel()
+        scores = np.asarray(scores, dtype=np.float32).ravel()
+        tp, tn, fp, fn = cls.confusion_counts(labels, scores > threshold)
+
+        # Bin of every score, scores outside [0, 1] fall in the first or last bin
+        score_bins = np.clip((scores.astype(np.float64) * bins).astype(np.int64), 0, bins - 1)
+        counts = np.bincount(score_bins * 2 + labels, minlength=bins * 2).reshape(bins, 2)
+        return cls(tp, tn, fp, fn, counts[:, 1], counts[:, 0], threshold)
+
+    @classmethod
+    def merge_all(cls, results: Iterable["HistogramResult"]) -> "HistogramResult":
+        """
+        Merge the results of several shards.
+
+        Args:
+            results (Iterable[HistogramResult]): The results, at least one.
+
+        Returns:
+            HistogramResult: The merged result.
+
+        Raises:
+            Exception: If two results have different bins or thresholds.
+        """
+        return reduce(cls.merge, results)
+
+    def merge(self, other: "HistogramResult") -> "HistogramResult":
+        """
+        Merge with the result of a disjoint shard of the test set.
+
+        Args:
+            other (HistogramResult): The other result.
+
+        Returns:
+            HistogramResult: The result of both shards.
+
+        Raises:
+            Exception: If the results have different bins or thresholds.
+        """
+        if len(self.positive_histogram) != len(other.positive_histogram) or self.threshold != other.threshold:
+            raise Exception(WRONG_MERGE_MESSAGE.format(
+                bins=len(self.positive_histogram),
+                other_bins=len(other.positive_histogram),
+                threshold=self.threshold,
+                other_threshold=other.threshold
+            ))
+
+        return HistogramResult(
+            self.tp + other.tp,
+            self.tn + other.tn,
+            self.fp + other.fp,
+            self.fn + other.fn,
+            self.positive_histogram + other.positive_histogram,
+            self.negative_histogram + other.negative_histogram,
+            self.threshold
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Save the counts in NumPy .npz format.
+
+        Args:
+            path (str): Output path.
+        """
+        np.savez(
+            path,
+            confusion=np.array([self.tp, self.tn, self.fp, self.fn], dtype=np.int64),
+            positive_histogram=self.positive_histogram,
+            negative_histogram=self.negative_histogram,
+            threshold=np.array(self.threshold)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "HistogramResult":
+        """
+        Load a result saved with save().
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            HistogramResult: The result.
+        """
+        with np.load(path) as data:
+            tp, tn, fp, fn = (int(count) for count in data["confusion"])
+            return cls(
+                tp, tn, fp, fn,
+                data["positive_histogram"],
+                data["negative_histogram"],
+                float(data["threshold"])
+            )
+
+    def _histogram_auc(self) -> float:
+        """
+        Calculate the ROC AUC from the score histograms (scores in the same bin count as ties).
+
+        Returns:
+            float: ROC AUC, or 0.0 if one of the classes is missing.
+        """
+        positives = int(self.positive_histogram.sum())
+        negatives = int(self.negative_histogram.sum())
+        if positives == 0 or negatives == 0:
+            return 0.0
+
+        below = np.cumsum(self.negative_histogram) - self.negative_histogram
+        # Exact integer sum of 2x the ranks, before the only division
+        doubled = int(np.sum(self.positive_histogram * (2 * below + self.negative_histogram)))
+        return doubled / (2 * positives * negatives)
@@ -0,0 +1,196 @@
+import gc
+import os
+import time
+from itertools import islice
+from typing import Optional, Sequence
+import numpy as np
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_BENCHMARK_MESSAGE = """ERROR:
+
+Wrong benchmark settings...
+
+Possible values: batch_sizes >= 1, warmup >= 0, repeats >= 1, load_repeats >= 0
+Batch sizes: {batch_sizes}
+Warm-up: {warmup}
+Repeats: {repeats}
+Load repeats: {load_repeats}
+"""
+
+NO_DOMAINS_MESSAGE = """ERROR:
+
+No domains to benchmark with...
+
+The benchmark needs at least one domain (e.g. a non-empty test split)
+"""
+
+DEFAULT_BATCH_SIZES = (1, 32, 1024, 16384)
+
+
+class InferenceBenchmark:
+    """
+    A latency and throughput harness for the inference of trained classifiers.
+
+    For every batch size, batches are cut from the given domains (repeated
+    when there are fewer domains than the batch size) and scored with the
+    classifier predict method: first warmup untimed calls, so lazy loading,
+    caches and graph tracing are out of the measures, then repeats timed calls
+    with the garbage collector disabled. It reports the median and 99th
+    percentile latency of one call and the domains per second over all the
+    timed calls, plus the size on disk of the model files and the median time
+    to load a new copy of the model from them (see Classifier.get_model_paths
+    and Classifier.load_model). The classifier itself is never modified.
+
+    Attributes:
+        batch_sizes (tuple[int, ...]): Domains per predict call, one measure per size.
+        warmup (int): Untimed calls before the timed ones, per batch size.
+        repeats (int): Timed calls per batch size.
+        load_repeats (int): Timed model loads, 0 to skip them.
+        max_seconds (float): Optional time budget of the timed calls of a batch size.
+    """
+
+    def __init__(
+        self,
+        batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+        warmup: int = 3,
+        repeats: int = 20,
+        load_repeats: int = 3,
+        max_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Initialize the benchmark.
+
+        Args:
+            batch_sizes (Sequence[int], optional): Domains per predict call. Defaults to (1, 32, 1024, 16384).
+            warmup (int, optional): Untimed calls per batch size. Defaults to 3.
+            repeats (int, optional): Timed calls per batch size. Defaults to 20.
+            load_repeats (int, optional): Timed model loads, 0 to skip them. Defaults to 3.
+            max_seconds (float, optional): Stop the timed calls of a batch size after this
+                many seconds (at least one call is timed). Defaults to None (no limit).
+
+        Raises:
+            Exception: If a setting is out of range.
+        """
+        if (not batch_sizes or any(size < 1 for size in batch_sizes)
+                or warmup < 0 or repeats < 1 or load_repeats < 0):
+            raise Exception(WRONG_BENCHMARK_MESSAGE.format(
+                batch_sizes=batch_sizes,
+                warmup=warmup,
+                repeats=repeats,
+                load_repeats=load_repeats
+            ))
+        self.batch_sizes = tuple(batch_sizes)
+        self.warmup = warmup
+        self.repeats = repeats
+        self.load_repeats = load_repeats
+        self.max_seconds = max_seconds
+
+    def get_sample_size(self) -> int:
+        """
+        Get the number of distinct domains the benchmark can use.
+
+        Returns:
+            int: The largest batch size.
+        """
+        return max(self.batch_sizes)
+
+    def run(self, classifier: Classifier, domains: Sequence[str]) -> Result:
+        """
+        Benchmark a trained classifier.
+
+        Args:
+            classifier (Classifier): The classifier, implementing predict.
+            domains (Sequence[str]): Domains the batches are cut from.
+
+        Returns:
+            Result: "Model bytes" and "Load s" (NaN when the classifier has no model
+                files or cannot load them), then "B<size> p50 ms", "B<size> p99 ms"
+                and "B<size> domains/s" for every batch size.
+
+        Raises:
+            Exception: If there are no domains.
+        """
+        if len(domains) == 0:
+            raise Exception(NO_DOMAINS_MESSAGE)
+
+        result = Result()
+        paths = [path for path in classifier.get_model_paths() if os.path.exists(path)]
+        result.add_metric("Model bytes", sum(os.path.getsize(path) for path in paths))
+        result.add_metric("Load s", self._time_load(classifier) if paths else float("nan"))
+
+        for batch_size in self.batch_sizes:
+            latencies = self._time_predict(classifier, self._get_batch(domains, batch_size))
+            result.add_metric(f"B{batch_size} p50 ms", float(np.percentile(latencies, 50)) * 1000)
+            result.add_metric(f"B{batch_size} p99 ms", float(np.percentile(latencies, 99)) * 1000)
+            result.add_metric(f"B{batch_size} domains/s", batch_size * len(latencies) / float(latencies.sum()))
+        return result
+
+    def _time_load(self, classifier: Classifier) -> float:
+        """
+        Time the loads of new copies of the model of a classifier, which are discarded.
+
+        Args:
+            classifier (Classifier): The classifier.
+
+        Returns:
+            float: Median seconds of a load, NaN if it cannot be loaded or load_repeats is 0.
+        """
+        timings = []
+        for _ in range(self.load_repeats):
+            start = time.perf_counter()
+            try:
+                classifier.load_model()
+            except NotImplementedError:
+                return float("nan")
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings)) if timings else float("nan")
+
+    def _time_predict(self, classifier: Classifier, batch: list[str]) -> np.ndarray:
+        """
+        Time the predict calls of one batch size.
+
+        Args:
+            classifier (Classifier): The classifier.
+            batch (list[str]): The batch scored by every call.
+
+        Returns:
+            np.ndarray: Seconds of every timed call.
+        """
+        for _ in range(self.warmup):
+            classifier.predict(batch)
+
+        latencies = np.empty(self.repeats)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            budget_start = time.perf_counter()
+            for i in range(self.repeats):
+                start = time.perf_counter()
+                classifier.predict(batch)
+                latencies[i] = time.perf_counter() - start
+                if self.max_seconds is not None and time.perf_counter() - budget_start > self.max_seconds:
+                    return latencies[:i + 1]
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return latencies
+
+    @staticmethod
+    def _get_batch(domains: Sequence[str], batch_size: int) -> list[str]:
+        """
+        Cut a batch from the domains, repeating them if there are not enough.
+
+        Args:
+            domains (Sequence[str]): The domains.
+            batch_size (int): Domains in the batch.
+
+        Returns:
+            list[str]: The batch.
+        """
+        batch = list(islice(domains, batch_size))
+        while len(batch) < batch_size:
+            batch.extend(batch[:batch_size - len(batch)])
+        return batch
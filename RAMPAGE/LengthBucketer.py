@@ -0,0 +1,172 @@
+import random
+from typing import Iterable, Iterator, Optional
+import numpy as np
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_BOUNDARIES_MESSAGE = """ERROR:
+
+Wrong bucket boundaries...
+
+Boundaries must be strictly increasing and the last one must be the encoder max_length
+
+Boundaries: {boundaries}
+max_length: {max_length}
+"""
+
+
+class LengthBucketer:
+    """
+    A class to build length-bucketed batches with dynamic padding.
+
+    Domains are grouped by length into buckets and every batch is padded only to
+    the upper bound of its bucket instead of the encoder max_length. Each bucket
+    yields a single batch shape, which keeps the number of traced graphs small.
+
+    Attributes:
+        encoder (DomainEncoder): Encoder used to convert domains to sequences.
+        boundaries (list[int]): Inclusive upper length of every bucket.
+        batch_size (int): Maximum number of elements per batch.
+    """
+
+    def __init__(self, encoder: DomainEncoder, boundaries: list[int], batch_size: int = 50) -> None:
+        """
+        Initialize the bucketer.
+
+        Args:
+            encoder (DomainEncoder): Encoder used to convert domains to sequences.
+            boundaries (list[int]): Inclusive upper length of every bucket, ending in max_length.
+            batch_size (int, optional): Maximum elements per batch. Defaults to 50.
+
+        Raises:
+            Exception: If boundaries are not increasing or do not end in max_length.
+        """
+        if (not boundaries
+                or any(low >= high for low, high in zip(boundaries, boundaries[1:]))
+                or boundaries[-1] != encoder.max_length):
+            raise Exception(WRONG_BOUNDARIES_MESSAGE.format(
+                boundaries=boundaries,
+                max_length=encoder.max_length
+            ))
+
+        self.encoder = encoder
+        self.boundaries = list(boundaries)
+        self.batch_size = batch_size
+
+    def lengths(self, domains: list[str]) -> np.ndarray:
+        """
+        Get the encoded length of every domain.
+
+        Args:
+            domains (list[str]): Domains.
+
+        Returns:
+            np.ndarray: Lengths clipped to the encoder max_length.
+        """
+        lengths = np.fromiter(map(len, domains), dtype=np.int64, count=len(domains))
+        return np.minimum(lengths, self.encoder.max_length)
+
+    def buckets(self, lengths: np.ndarray) -> np.ndarray:
+        """
+        Get the bucket index of every length.
+
+        Args:
+            lengths (np.ndarray): Encoded lengths.
+
+        Returns:
+            np.ndarray: Bucket index of every length.
+        """
+        return np.searchsorted(self.boundaries, lengths, side="left")
+
+    def batches(
+        self,
+        data: Iterable[DataElement],
+        shuffle: bool = False,
+        seed: Optional[int] = None
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield (domains, labels) batches padded to their bucket upper bound.
+
+        Args:
+            data (Iterable[DataElement]): Data elements.
+            shuffle (bool, optional): Whether to shuffle elements and batch order. Defaults to False.
+            seed (int, optional): Seed for the shuffling. Defaults to None.
+
+        Yields:
+            tuple[np.ndarray, np.ndarray]: Encoded domains and labels of one batch.
+        """
+        elements = data if isinstance(data, list) else list(data)
+        domains = [element.domain for element in elements]
+        labels = self.encoder.encode_labels(elements)
+
+        for indices, width in self.batch_indices(domains, shuffle, seed):
+            x_data = self.encoder.encode([domains[i] for i in indices])
+            yield x_data[:, :width], labels[indices]
+
+    def batch_indices(
+        self,
+        domains: list[str],
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> list[tuple[np.ndarray, int]]:
+        """
+        Group domain indices into bucketed batches.
+
+        Args:
+            domains (list[str]): Domains.
+            shuffle (bool, optional): Whether to shuffle elements and batch order. Defaults to False.
+            seed (int, optional): Seed for the shuffling. Defaults to None.
+            batch_size (int, optional): Overrides the bucketer batch size. Defaults to None.
+
+        Returns:
+            list[tuple[np.ndarray, int]]: Indices of every batch and its padded width.
+        """
+        batch_size = batch_size or self.batch_size
+        rng = np.random.default_rng(seed)
+        buckets = self.buckets(self.lengths(domains))
+        order = rng.permutation(len(domains)) if shuffle else np.arange(len(domains))
+        # Stable sort keeps the (shuffled) order inside every bucket
+        order = order[np.argsort(buckets[order], kind="stable")]
+
+        batches = []
+        bucket_ends = np.searchsorted(buckets[order], np.arange(len(self.boundaries)), side="right")
+        bucket_start = 0
+        for bucket, bucket_end in enumerate(bucket_ends):
+            for start in range(bucket_start, bucket_end, batch_size):
+                batches.append((order[start:min(start + batch_size, bucket_end)], self.boundaries[bucket]))
+            bucket_start = bucket_end
+
+        if shuffle:
+            random.Random(seed).shuffle(batches)
+        return batches
+
+    def padding_stats(self, domains: list[str]) -> Result:
+        """
+        Measure the padding waste of fixed and bucketed padding.
+
+        Args:
+            domains (list[str]): Domains.
+
+        Returns:
+            Result: Cells and padding fractions for both strategies.
+        """
+        lengths = self.lengths(domains)
+        used_cells = int(lengths.sum())
+        fixed_cells = len(domains) * self.encoder.max_length
+        bucketed_cells = sum(len(indices) * width for indices, width in self.batch_indices(domains))
+
+        fixed_waste = 1 - used_cells / fixed_cells if fixed_cells else 0.0
+        bucketed_waste = 1 - used_cells / bucketed_cells if bucketed_cells else 0.0
+
+        result = Result()
+        result.add_metric("Used cells", used_cells)
+        result.add_metric("Fixed cells", fixed_cells)
+        result.add_metric("Bucketed cells", bucketed_cells)
+        result.add_metric("Fixed waste", fixed_waste)
+        result.add_metric("Bucketed waste", bucketed_waste)
+        result.add_metric("Cell reduction", 1 - bucketed_cells / fixed_cells if fixed_cells else 0.0)
+        return result
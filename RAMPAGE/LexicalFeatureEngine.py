@@ -0,0 +1,553 @@
+import hashlib
+import os
+import time
+import types
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Iterable, Optional
+import numpy as np
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+WRONG_FEATURE_MESSAGE = """ERROR:
+
+Wrong feature name...
+
+Possible values: {features}
+Feature: {name}
+"""
+
+WRONG_SPLIT_MESSAGE = """ERROR:
+
+Wrong split name...
+
+Possible values: 'train', 'validation', 'test'
+Split: {split}
+"""
+
+NOT_FITTED_MESSAGE = """ERROR:
+
+The n-gram familiarity feature needs reference statistics...
+
+Call fit() with the training data before computing it
+"""
+
+# Longest domain name allowed by DNS, longer names are truncated
+MAX_DOMAIN_BYTES = 253
+
+# c * log2(c) of every possible character count, used by the entropy
+RUN_TERMS = np.concatenate(([0.0], np.arange(1, MAX_DOMAIN_BYTES + 1) * np.log2(np.arange(1, MAX_DOMAIN_BYTES + 1))))
+
+FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+FNV_PRIME = np.uint64(0x100000001b3)
+
+
+def _byte_table(characters: str) -> np.ndarray:
+    """
+    Build a 256-entry lookup table that marks some characters, in both cases.
+
+    Args:
+        characters (str): Characters to mark.
+
+    Returns:
+        np.ndarray: uint8 table with 1 for the marked bytes.
+    """
+    table = np.zeros(256, dtype=np.uint8)
+    for char in characters.lower() + characters.upper():
+        table[ord(char)] = 1
+    return table
+
+
+def _code_key(code: types.CodeType) -> bytes:
+    """
+    Serialize what a code object computes: its bytecode, names and constants.
+
+    Nested code objects (lambdas, comprehensions) are serialized recursively,
+    since their repr holds a memory address.
+
+    Args:
+        code (types.CodeType): Code object of a function.
+
+    Returns:
+        bytes: Key that only changes when the code changes.
+    """
+    parts = [code.co_code, repr(code.co_names).encode()]
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            parts.append(_code_key(constant))
+        elif isinstance(constant, frozenset):
+            # Set order depends on string hashing, which changes between runs
+            parts.append(repr(sorted(map(repr, constant))).encode())
+        else:
+            parts.append(repr(constant).encode())
+    return b";".join(parts)
+
+
+VOWELS = _byte_table("aeiou")
+CONSONANTS = _byte_table("bcdfghjklmnpqrstvwxyz")
+DIGITS = _byte_table("0123456789")
+
+
+class LexicalFeatureEngine:
+    """
+    A class to compute lexical features of whole dataset splits in batch.
+
+    Features are computed column-wise with NumPy over byte matrices of many
+    domains at once and returned as typed columns (one array per feature), so
+    no per-element Python objects are created. Domains are read as their
+    UTF-8 bytes, which are the characters of ASCII domains (IDNs can be
+    normalized to punycode first, see DomainNormalizer). The built-in features are:
+
+        * length (uint16): Number of bytes.
+        * entropy (float32): Shannon entropy of the bytes, in bits.
+        * vowel_ratio, consonant_ratio, digit_ratio (float32): Fraction of bytes of each kind.
+        * ngram_familiarity (float32): Mean log10 frequency of the character bigrams in
+          the legitimate domains given to fit().
+        * tld (uint32): 32-bit FNV-1a hash of the top-level domain.
+
+    More features can be registered with register(). Computed columns are
+    cached per dataset fingerprint, in memory and optionally on disk. The
+    fingerprint does not depend on the iteration order of the data, so the
+    columns of a split are found again in later runs.
+
+    Attributes:
+        names (list[str]): Features computed by compute().
+        cache_dir (str): Directory of the on-disk cache, or None.
+        max_cached (int): Number of computed splits kept in memory.
+        batch_size (int): Domains encoded per batch.
+    """
+
+    def __init__(
+        self,
+        names: Optional[list[str]] = None,
+        cache_dir: Optional[str] = None,
+        max_cached: int = 4,
+        batch_size: int = 65536
+    ) -> None:
+        """
+        Initialize the engine with the built-in features.
+
+        Args:
+            names (list[str], optional): Features to compute. Defaults to None (all registered).
+            cache_dir (str, optional): Directory of the on-disk cache. Defaults to None (memory only).
+            max_cached (int, optional): Number of computed splits kept in memory. Defaults to 4.
+            batch_size (int, optional): Domains encoded per batch. Defaults to 65536.
+        """
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self.batch_size = batch_size
+
+        # name -> (function(codes, lengths) -> column, dtype, version)
+        self._features = OrderedDict()
+        self.register("length", lambda codes, lengths: lengths, np.uint16)
+        self.register("entropy", self._entropy, np.float32)
+        self.register("vowel_ratio", lambda codes, lengths: self._ratio(VOWELS, codes, lengths), np.float32)
+        self.register("consonant_ratio", lambda codes, lengths: self._ratio(CONSONANTS, codes, lengths), np.float32)
+        self.register("digit_ratio", lambda codes, lengths: self._ratio(DIGITS, codes, lengths), np.float32)
+        self.register("ngram_familiarity", self._ngram_familiarity, np.float32)
+        self.register("tld", self._tld, np.uint32)
+        self.names = list(names) if names is not None else None
+
+        self._encoder = DomainEncoder(max_length=MAX_DOMAIN_BYTES, offset=0, truncating="post")
+        self._bigram_log_frequencies = None
+        self._cache = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._compute_seconds = 0.0
+
+    def register(
+        self,
+        name: str,
+        function: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        dtype: np.dtype,
+        version: str = ""
+    ) -> None:
+        """
+        Register a feature.
+
+        The function receives a batch as a uint8 UTF-8 byte matrix, zero-padded,
+        and the length in bytes of every domain, and returns one value per domain.
+        Cached columns are keyed by the code of the function, so changing it
+        computes the feature again. Values the code does not show (captured
+        variables, callables without Python code) need a new version instead.
+
+        Args:
+            name (str): Feature name, replaces a registered feature with the same name.
+            function (Callable[[np.ndarray, np.ndarray], np.ndarray]): Vectorized feature function.
+            dtype (np.dtype): Column dtype.
+            version (str, optional): Version of the feature, part of the cache key. Defaults to "".
+        """
+        self._features[name] = (function, np.dtype(dtype), version)
+
+    def get_feature_names(self) -> list[str]:
+        """
+        Get the features computed by compute().
+
+        Returns:
+            list[str]: Feature names.
+        """
+        return self.names if self.names is not None else list(self._features)
+
+    def fit(self, data: Iterable[DataElement]) -> None:
+        """
+        Learn the bigram frequencies of the legitimate domains, used by ngram_familiarity.
+
+        Args:
+            data (Iterable[DataElement]): Training data elements.
+        """
+        counts = np.zeros(1 << 16, dtype=np.int64)
+        for domains, _ in self._batches(element.domain for element in data if not element.is_dga):
+            codes, _ = self._encode(domains)
+            bigrams = codes[:, :-1].astype(np.uint16) << 8 | codes[:, 1:]
+            counts += np.bincount(bigrams.ravel(), minlength=1 << 16)
+
+        # Bigrams that end in padding are not counted and score zero
+        counts[::256] = 0
+        # Add-one smoothing, so unseen bigrams are the least familiar ones
+        log_frequencies = np.log10((counts + 1) / (counts.sum() + len(counts)))
+        log_frequencies[::256] = 0.0
+        self._bigram_log_frequencies = log_frequencies.astype(np.float32)
+
+    def compute(self, data: Iterable[DataElement]) -> dict[str, np.ndarray]:
+        """
+        Compute the feature columns of a dataset, or get them from the cache.
+
+        Args:
+            data (Iterable[DataElement]): Data elements.
+
+        Returns:
+            dict[str, np.ndarray]: Column of every feature, in the iteration order of data.
+
+        Raises:
+            Exception: If a feature is not registered or familiarity is needed before fit().
+        """
+        names = self.get_feature_names()
+        for name in names:
+            if name not in self._features:
+                raise Exception(WRONG_FEATURE_MESSAGE.format(features=list(self._features), name=name))
+        if "ngram_familiarity" in names and self._bigram_log_frequencies is None:
+            raise Exception(NOT_FITTED_MESSAGE)
+
+        domains = [element.domain for element in data]
+        hashes = np.zeros(len(domains), dtype=np.uint64)
+        for batch, start in self._batches(domains):
+            hashes[start:start + len(batch)] = self._hash(self._encode(batch)[0])
+        # Columns are cached in hash order, which does not depend on the order of data
+        order = np.argsort(hashes, kind="stable")
+        fingerprint = self._fingerprint(hashes[order], names)
+
+        columns = self._load(fingerprint)
+        if columns is None:
+            self._misses += 1
+            start = time.perf_counter()
+            columns = self._compute_columns([domains[i] for i in order], names)
+            self._compute_seconds += time.perf_counter() - start
+            self._store(fingerprint, columns)
+        else:
+            self._hits += 1
+
+        # Back to the order of data
+        output = {}
+        for name, column in columns.items():
+            output[name] = np.empty_like(column)
+            output[name][order] = column
+        return output
+
+    def compute_split(self, dataset_manager: DatasetManager, split: str) -> dict[str, np.ndarray]:
+        """
+        Compute the feature columns of a split of a dataset manager.
+
+        If n-gram familiarity is needed and the engine is not fitted yet, it is
+        fitted on the training split first.
+
+        Args:
+            dataset_manager (DatasetManager): Dataset manager with the splits.
+            split (str): 'train', 'validation' or 'test'.
+
+        Returns:
+            dict[str, np.ndarray]: Column of every feature, in the iteration order of the split.
+
+        Raises:
+            Exception: If the split name is not valid.
+        """
+        getters = {
+            "train": dataset_manager.get_train,
+            "validation": dataset_manager.get_validation,
+            "test": dataset_manager.get_test
+        }
+        if split not in getters:
+            raise Exception(WRONG_SPLIT_MESSAGE.format(split=split))
+
+        if "ngram_familiarity" in self.get_feature_names() and self._bigram_log_frequencies is None:
+            self.fit(dataset_manager.get_train())
+        return self.compute(getters[split]())
+
+    def to_matrix(self, columns: dict[str, np.ndarray], names: Optional[list[str]] = None) -> np.ndarray:
+        """
+        Stack feature columns into a float32 matrix, e.g. as model input.
+
+        Args:
+            columns (dict[str, np.ndarray]): Columns returned by compute().
+            names (list[str], optional): Columns to stack. Defaults to None (all, in order).
+
+        Returns:
+            np.ndarray: Matrix of shape (n, features).
+        """
+        names = names if names is not None else list(columns)
+        if not names:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.column_stack([columns[name].astype(np.float32) for name in names])
+
+    def get_stats(self) -> Result:
+        """
+        Get the cache counters.
+
+        Returns:
+            Result: Hits, misses and time spent computing features.
+        """
+        result = Result()
+        result.add_metric("Hits", self._hits)
+        result.add_metric("Misses", self._misses)
+        result.add_metric("Compute s", self._compute_seconds)
+        return result
+
+    def _compute_columns(self, domains: list[str], names: list[str]) -> dict[str, np.ndarray]:
+        """
+        Compute feature columns batch by batch.
+
+        Args:
+            domains (list[str]): Domains.
+            names (list[str]): Features to compute.
+
+        Returns:
+            dict[str, np.ndarray]: Column of every feature.
+        """
+        columns = {name: np.empty(len(domains), dtype=self._features[name][1]) for name in names}
+        for batch, start in self._batches(domains):
+            codes, lengths = self._encode(batch)
+            for name in names:
+                function, dtype, _ = self._features[name]
+                columns[name][start:start + len(batch)] = np.asarray(function(codes, lengths)).astype(dtype)
+        return columns
+
+    def _batches(self, domains: Iterable[str]):
+        """
+        Split domains in batches.
+
+        Args:
+            domains (Iterable[str]): Domains.
+
+        Yields:
+            tuple[list[str], int]: Batch and its start index.
+        """
+        iterator = iter(domains)
+        start = 0
+        while batch := list(islice(iterator, self.batch_size)):
+            yield batch, start
+            start += len(batch)
+
+    def _encode(self, domains: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Encode a batch of domains as a UTF-8 byte matrix trimmed to the longest domain.
+
+        Args:
+            domains (list[str]): Domains.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: uint8 byte matrix and length in bytes of every domain.
+        """
+        # IDNs are encoded as UTF-8, so no character collapses into the zero padding
+        codes, lengths = self._encoder.encode_utf8(domains)
+        lengths = np.minimum(lengths, MAX_DOMAIN_BYTES)
+        width = max(int(lengths.max()) if len(lengths) else 0, 1)
+        return codes[:, :width], lengths
+
+    def _hash(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Hash every domain of a byte matrix with 64-bit FNV-1a.
+
+        Args:
+            codes (np.ndarray): uint8 byte matrix.
+
+        Returns:
+            np.ndarray: uint64 hash of every domain.
+        """
+        hashes = np.full(len(codes), FNV_OFFSET, dtype=np.uint64)
+        # Transposed, so every column is contiguous
+        for values in np.ascontiguousarray(codes.T).astype(np.uint64):
+            hashes = np.where(values != 0, (hashes ^ values) * FNV_PRIME, hashes)
+        return hashes
+
+    def _fingerprint(self, sorted_hashes: np.ndarray, names: list[str]) -> str:
+        """
+        Fingerprint a dataset and the features computed on it.
+
+        Args:
+            sorted_hashes (np.ndarray): Sorted domain hashes.
+            names (list[str]): Feature names.
+
+        Returns:
+            str: Hexadecimal fingerprint.
+        """
+        digest = hashlib.blake2b(sorted_hashes.tobytes(), digest_size=16)
+        for name in names:
+            function, dtype, version = self._features[name]
+            code = getattr(function, "__code__", None)
+            digest.update(f"{name}:{version}:{dtype.str}:".encode())
+            digest.update(_code_key(code) if code is not None else type(function).__qualname__.encode())
+            digest.update(b";")
+        if "ngram_familiarity" in names:
+            digest.update(self._bigram_log_frequencies.tobytes())
+        return digest.hexdigest()
+
+    def _load(self, fingerprint: str) -> Optional[dict[str, np.ndarray]]:
+        """
+        Get cached columns from memory or disk.
+
+        Args:
+            fingerprint (str): Dataset fingerprint.
+
+        Returns:
+            dict[str, np.ndarray]: Cached columns, or None.
+        """
+        if fingerprint in self._cache:
+            self._cache.move_to_end(fingerprint)
+            return self._cache[fingerprint]
+
+        path = self._cache_path(fingerprint)
+        if path is None or not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            columns = {name: data[name] for name in data.files}
+        self._remember(fingerprint, columns)
+        return columns
+
+    def _store(self, fingerprint: str, columns: dict[str, np.ndarray]) -> None:
+        """
+        Cache columns in memory and, if configured, on disk.
+
+        Args:
+            fingerprint (str): Dataset fingerprint.
+            columns (dict[str, np.ndarray]): Columns.
+        """
+        self._remember(fingerprint, columns)
+        path = self._cache_path(fingerprint)
+        if path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez(path, **columns)
+
+    def _remember(self, fingerprint: str, columns: dict[str, np.ndarray]) -> None:
+        """
+        Keep columns in the in-memory cache, evicting the least recently used ones.
+
+        Args:
+            fingerprint (str): Dataset fingerprint.
+            columns (dict[str, np.ndarray]): Columns.
+        """
+        self._cache[fingerprint] = columns
+        self._cache.move_to_end(fingerprint)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _cache_path(self, fingerprint: str) -> Optional[str]:
+        """
+        Get the on-disk cache path of a fingerprint.
+
+        Args:
+            fingerprint (str): Dataset fingerprint.
+
+        Returns:
+            str: Path, or None without on-disk cache.
+        """
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"lexical_{fingerprint}.npz")
+
+    def _entropy(self, codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Calculate the Shannon entropy of the bytes of every domain.
+
+        Sorting every row groups equal bytes in runs, so the byte counts are
+        the run lengths.
+
+        Args:
+            codes (np.ndarray): uint8 byte matrix.
+            lengths (np.ndarray): Domain lengths.
+
+        Returns:
+            np.ndarray: Entropy in bits.
+        """
+        rows, width = codes.shape
+        if rows == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        # Stable sorting of bytes is a radix sort
+        ordered = np.sort(codes, axis=1, kind="stable")
+        run_starts = np.ones(ordered.shape, dtype=bool)
+        run_starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        starts = np.flatnonzero(run_starts)
+        counts = np.diff(np.append(starts, rows * width))
+
+        # Padding is sorted first as a run of zeros, whose term is removed
+        sums = np.bincount(starts // width, weights=RUN_TERMS[counts], minlength=rows)
+        sums -= RUN_TERMS[width - lengths]
+
+        safe_lengths = np.maximum(lengths, 1)
+        return np.where(lengths > 0, np.log2(safe_lengths) - sums / safe_lengths, 0.0)
+
+    def _ratio(self, table: np.ndarray, codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Calculate the fraction of characters marked in a lookup table.
+
+        Args:
+            table (np.ndarray): 256-entry lookup table.
+            codes (np.ndarray): uint8 byte matrix.
+            lengths (np.ndarray): Domain lengths.
+
+        Returns:
+            np.ndarray: Fraction of every domain.
+        """
+        counts = table[codes].sum(axis=1, dtype=np.int64)
+        return counts / np.maximum(lengths, 1)
+
+    def _ngram_familiarity(self, codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Calculate the mean log10 frequency of the bigrams of every domain.
+
+        Args:
+            codes (np.ndarray): uint8 byte matrix.
+            lengths (np.ndarray): Domain lengths.
+
+        Returns:
+            np.ndarray: Familiarity, 0.0 for domains without bigrams.
+        """
+        bigrams = codes[:, :-1].astype(np.uint16) << 8 | codes[:, 1:]
+        # Bigrams that end in padding have a zero frequency in the table
+        sums = self._bigram_log_frequencies[bigrams].sum(axis=1, dtype=np.float64)
+        return sums / np.maximum(lengths - 1, 1)
+
+    def _tld(self, codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Hash the top-level domain (the characters after the last dot) of every domain.
+
+        Args:
+            codes (np.ndarray): uint8 byte matrix.
+            lengths (np.ndarray): Domain lengths.
+
+        Returns:
+            np.ndarray: uint32 FNV-1a hash of every top-level domain.
+        """
+        rows, width = codes.shape
+        positions = np.arange(width)
+        last_dots = np.where(codes == ord("."), positions, -1).max(axis=1) if width else np.full(rows, -1)
+
+        hashes = np.full(rows, 0x811c9dc5, dtype=np.uint32)
+        for column, values in enumerate(np.ascontiguousarray(codes.T).astype(np.uint32)):
+            inside = (column > last_dots) & (values != 0)
+            hashes = np.where(inside, (hashes ^ values) * np.uint32(0x01000193), hashes)
+        return hashes
@@ -0,0 +1,222 @@
+from typing import Optional
+import numpy as np
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+UNKNOWN_CELL_MESSAGE = """ERROR:
+
+Unknown matrix cell...
+
+Classifiers: {classifiers}
+Datasets: {datasets}
+Cell: {classifier} x {dataset}
+"""
+
+
+class MatrixResult:
+    """
+    The results of every classifier on every dataset.
+
+    Rows are classifiers and columns are datasets. Every cell keeps the full
+    Result of the classifier on the dataset and the seconds of each phase, and
+    any metric can be read as a (classifiers, datasets) NumPy matrix. Cells
+    that failed hold None and their error, so one failing cell does not lose
+    the rest of the matrix.
+
+    Attributes:
+        classifiers (list[str]): Classifier names, one per row.
+        datasets (list[str]): Dataset names, one per column.
+        results (dict[tuple[str, str], Result]): Result by (classifier, dataset), None for failed cells.
+        timings (dict[tuple[str, str], dict[str, float]]): Seconds of every phase by (classifier, dataset).
+        errors (dict[tuple[str, str], str]): Error message of every failed cell.
+    """
+
+    def __init__(self, classifiers: list[str], datasets: list[str]) -> None:
+        """
+        Initialize an empty matrix.
+
+        Args:
+            classifiers (list[str]): Classifier names, one per row.
+            datasets (list[str]): Dataset names, one per column.
+        """
+        self.classifiers = list(classifiers)
+        self.datasets = list(datasets)
+        self.results = {(classifier, dataset): None for classifier in classifiers for dataset in datasets}
+        self.timings = {cell: {} for cell in self.results}
+        self.errors = {}
+
+    def set_cell(
+        self,
+        classifier: str,
+        dataset: str,
+        result: Optional[Result],
+        timings: dict[str, float],
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Store the outcome of a cell.
+
+        Args:
+            classifier (str): Classifier name.
+            dataset (str): Dataset name.
+            result (Result): The result, or None if the cell failed.
+            timings (dict[str, float]): Seconds of every phase.
+            error (str, optional): Error message of a failed cell. Defaults to None.
+
+        Raises:
+            Exception: If the cell is not in the matrix.
+        """
+        cell = self._get_cell(classifier, dataset)
+        self.results[cell] = result
+        self.timings[cell] = timings
+        if error is not None:
+            self.errors[cell] = error
+
+    def get_result(self, classifier: str, dataset: str) -> Optional[Result]:
+        """
+        Get the result of a cell.
+
+        Args:
+            classifier (str): Classifier name.
+            dataset (str): Dataset name.
+
+        Returns:
+            Result: The result, or None if the cell failed or has not run.
+
+        Raises:
+            Exception: If the cell is not in the matrix.
+        """
+        return self.results[self._get_cell(classifier, dataset)]
+
+    def get_metric(self, metric: str) -> np.ndarray:
+        """
+        Get a metric of every cell.
+
+        Args:
+            metric (str): Metric name (e.g. "Accuracy", or a timing such as "train").
+
+        Returns:
+            np.ndarray: (classifiers, datasets) matrix, NaN where the cell has no such metric.
+        """
+        matrix = np.full((len(self.classifiers), len(self.datasets)), np.nan)
+        for row, classifier in enumerate(self.classifiers):
+            for column, dataset in enumerate(self.datasets):
+                cell = (classifier, dataset)
+                values = dict(self.results[cell].get_metrics()) if self.results[cell] is not None else {}
+                values.update(self.timings[cell])
+                if metric in values:
+                    matrix[row, column] = values[metric]
+        return matrix
+
+    def best(self, metric: str, higher_is_better: bool = True) -> dict[str, tuple[str, float]]:
+        """
+        Get the best classifier on every dataset.
+
+        Args:
+            metric (str): Metric name.
+            higher_is_better (bool, optional): False for metrics such as FPR or seconds. Defaults to True.
+
+        Returns:
+            dict[str, tuple[str, float]]: Classifier name and value by dataset, only
+                for datasets with at least one value.
+        """
+        matrix = self.get_metric(metric)
+        best = {}
+        for column, dataset in enumerate(self.datasets):
+            values = matrix[:, column]
+            if np.isnan(values).all():
+                continue
+            row = int(np.nanargmax(values) if higher_is_better else np.nanargmin(values))
+            best[dataset] = (self.classifiers[row], float(values[row]))
+        return best
+
+    def format_metric(self, metric: str) -> str:
+        """
+        Format a metric of every cell as a table.
+
+        Args:
+            metric (str): Metric name.
+
+        Returns:
+            str: One line per classifier and one column per dataset.
+        """
+        matrix = self.get_metric(metric)
+        width = max([len(metric)] + [len(name) for name in self.classifiers])
+        lines = [f"{metric:<{width}} " + " ".join(f"{dataset:>12}" for dataset in self.datasets)]
+        for classifier, values in zip(self.classifiers, matrix.tolist()):
+            lines.append(f"{classifier:<{width}} " + " ".join(f"{value:>12.4f}" for value in values))
+        return "\n".join(lines)
+
+    def get_csv_rows(self, separator: str) -> list[str]:
+        """
+        Convert every cell to a CSV row (classifier, dataset, its metrics and timings).
+
+        Columns are the metrics of the first cell with a result, so every cell
+        should be produced by the same kind of run.
+
+        Args:
+            separator (str): The delimiter to use between CSV fields.
+
+        Returns:
+            list[str]: Header row followed by one row per cell.
+        """
+        names = next((
+            [name for name, _ in result.get_metrics()]
+            for result in self.results.values() if result is not None
+        ), [])
+        phases = sorted({phase for timings in self.timings.values() for phase in timings})
+
+        header = separator.join(
+            ["classifier", "dataset"] + [name.lower() for name in names] + [f"{phase} seconds" for phase in phases]
+        )
+        rows = [header]
+        for (classifier, dataset), result in self.results.items():
+            values = dict(result.get_metrics()) if result is not None else {}
+            timings = self.timings[(classifier, dataset)]
+            rows.append(separator.join(
+                [classifier, dataset]
+                + [str(values.get(name, "")) for name in names]
+                + [str(timings.get(phase, "")) for phase in phases]
+            ))
+        return rows
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the matrix.
+
+        Returns:
+            str: Every cell with its result, or its error.
+        """
+        blocks = []
+        for (classifier, dataset), result in self.results.items():
+            blocks.append(f"{classifier} x {dataset}")
+            if result is not None:
+                blocks.append(str(result))
+            else:
+                blocks.append(f" * Error      -> {self.errors.get((classifier, dataset), 'not run')}")
+        return "\n".join(blocks)
+
+    def _get_cell(self, classifier: str, dataset: str) -> tuple[str, str]:
+        """
+        Get the key of a cell.
+
+        Args:
+            classifier (str): Classifier name.
+            dataset (str): Dataset name.
+
+        Returns:
+            tuple[str, str]: The key.
+
+        Raises:
+            Exception: If the cell is not in the matrix.
+        """
+        cell = (classifier, dataset)
+        if cell not in self.results:
+            raise Exception(UNKNOWN_CELL_MESSAGE.format(
+                classifiers=", ".join(self.classifiers),
+                datasets=", ".join(self.datasets),
+                classifier=classifier,
+                dataset=dataset
+            ))
+        return cell
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+from RAMPAGE.Result import Result
+
+
+class ModelRegistry:
+    """
+    An in-process registry of trained model artifacts.
+
+    Artifacts are loaded lazily on first use and shared between all callers.
+    Recently used models are kept in memory while the total size of their
+    artifacts fits in the byte budget; the least recently used ones are evicted
+    first. An artifact that changes on disk (e.g. a new checkpoint) is reloaded.
+
+    Attributes:
+        loader (Callable[[str], Any]): Function that loads an artifact from its path.
+        max_bytes (int): Byte budget for the cached models.
+    """
+
+    def __init__(self, loader: Callable[[str], Any], max_bytes: int = 2 * 1024 ** 3) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            loader (Callable[[str], Any]): Function that loads an artifact from its path.
+            max_bytes (int, optional): Byte budget for the cached models. Defaults to 2 GiB.
+        """
+        self.loader = loader
+        self.max_bytes = max_bytes
+
+        # path -> (model, size in bytes, artifact mtime)
+        self._models = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._path_locks = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load_seconds = 0.0
+
+    def get(self, path: str) -> Any:
+        """
+        Get the shared model of an artifact, loading it if needed.
+
+        Args:
+            path (str): Path to the artifact.
+
+        Returns:
+            Any: The loaded model.
+        """
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+
+        with self._lock:
+            if self._is_cached(path, mtime):
+                self._hits += 1
+                return self._models[path][0]
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+
+        # Only one thread loads a given artifact, the others wait for it
+        with path_lock:
+            with self._lock:
+                if self._is_cached(path, mtime):
+                    self._hits += 1
+                    return self._models[path][0]
+                self._misses += 1
+
+            start = time.perf_counter()
+            model = self.loader(path)
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._load_seconds += elapsed
+                self._remove(path)
+                size = os.path.getsize(path)
+                self._models[path] = (model, size, mtime)
+                self._bytes += size
+                self._evict()
+            return model
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop the cached model of an artifact.
+
+        Args:
+            path (str): Path to the artifact.
+        """
+        with self._lock:
+            self._remove(os.path.abspath(path))
+
+    def clear(self) -> None:
+        """Drop all cached models."""
+        with self._lock:
+            self._models.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Result:
+        """
+        Get the registry counters.
+
+        Returns:
+            Result: Hits, misses, hit rate, evictions, load latency and cache usage.
+        """
+        with self._lock:
+            requests = self._hits + self._misses
+            result = Result()
+            result.add_metric("Hits", self._hits)
+            result.add_metric("Misses", self._misses)
+            result.add_metric("Hit rate", self._hits / requests if requests else 0.0)
+            result.add_metric("Evictions", self._evictions)
+            result.add_metric("Load s", self._load_seconds)
+            result.add_metric("Mean load s", self._load_seconds / self._misses if self._misses else 0.0)
+            result.add_metric("Models", len(self._models))
+            result.add_metric("Bytes", self._bytes)
+            return result
+
+    def _is_cached(self, path: str, mtime: float) -> bool:
+        """
+        Check whether an up-to-date model is cached, marking it as recently used.
+
+        Args:
+            path (str): Absolute path to the artifact.
+            mtime (float): Current modification time of the artifact.
+
+        Returns:
+            bool: True if the cached model can be used.
+        """
+        if path not in self._models or self._models[path][2] != mtime:
+            return False
+        self._models.move_to_end(path)
+        return True
+
+    def _remove(self, path: str) -> None:
+        """
+        Remove a model from the cache, if present.
+
+        Args:
+            path (str): Absolute path to the artifact.
+        """
+        if path in self._models:
+            self._bytes -= self._models.pop(path)[1]
+
+    def _evict(self) -> None:
+        """Evict least recently used models until the budget is met, keeping the newest one."""
+        while self._bytes > self.max_bytes and len(self._models) > 1:
+            _, (_, size, _) = self._models.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
@@ -0,0 +1,311 @@
+import hashlib
+import json
+import socket
+import sqlite3
+import time
+from typing import Optional
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+UNKNOWN_RUN_MESSAGE = """ERROR:
+
+Unknown run...
+
+Run: {run_id}
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    classifier TEXT NOT NULL,
+    config TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    host TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    classifier TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_classifier ON runs (classifier, created);
+CREATE INDEX IF NOT EXISTS runs_dataset ON runs (dataset, classifier);
+CREATE INDEX IF NOT EXISTS metrics_leaderboard ON metrics (name, classifier, value, run_id);
+CREATE INDEX IF NOT EXISTS metrics_dataset_leaderboard ON metrics (name, dataset, classifier, value, run_id);
+CREATE UNIQUE INDEX IF NOT EXISTS metrics_run_name ON metrics (run_id, name);
+"""
+
+
+class ResultStore:
+    """
+    A persistent store of results in an SQLite database.
+
+    Every stored result is a run with its classifier name, a fingerprint of the
+    classifier configuration, a fingerprint of the dataset, the host, the
+    creation time and named timings. Metrics are stored one per row, with the
+    classifier and dataset of their run, and indexed by name, classifier and
+    value, so leaderboards, trends and comparisons between runs are answered
+    by index lookups instead of scanning the whole history. The database uses
+    write-ahead logging, so it can be read while other processes append to it.
+
+    Attributes:
+        path (str): Path to the database file.
+        connection (sqlite3.Connection): Open connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (or create) a store.
+
+        Args:
+            path (str): Path to the database file, ":memory:" for a temporary store.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def add(
+        self,
+        result: Result,
+        classifier: str,
+        config: str = "",
+        dataset: str = "",
+        timings: Optional[dict[str, float]] = None,
+        host: Optional[str] = None
+    ) -> int:
+        """
+        Append a result as a new run.
+
+        Args:
+            result (Result): The result.
+            classifier (str): Classifier name.
+            config (str, optional): Configuration fingerprint (see config_fingerprint). Defaults to "".
+            dataset (str, optional): Dataset fingerprint (see dataset_fingerprint). Defaults to "".
+            timings (dict[str, float], optional): Seconds by name (e.g. "train", "test"). Defaults to None.
+            host (str, optional): Host name. Defaults to None (this host).
+
+        Returns:
+            int: Identifier of the run.
+        """
+        host = host if host is not None else socket.gethostname()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created, classifier, config, dataset, host) VALUES (?, ?, ?, ?, ?)",
+                (time.time(), classifier, config, dataset, host)
+            )
+            run_id = cursor.lastrowid
+            # A later metric with a repeated name replaces the earlier one
+            metrics = {name: value for name, value in result.get_metrics()}
+            self.connection.executemany(
+                "INSERT INTO metrics (run_id, position, name, value, classifier, dataset) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, position, name, float(value), classifier, dataset)
+                    for position, (name, value) in enumerate(metrics.items())
+                ]
+            )
+            self.connection.executemany(
+                "INSERT INTO timings (run_id, name, seconds) VALUES (?, ?, ?)",
+                [(run_id, name, float(seconds)) for name, seconds in (timings or {}).items()]
+            )
+        return run_id
+
+    def get_result(self, run_id: int) -> Result:
+        """
+        Get the result of a run.
+
+        Args:
+            run_id (int): Identifier of the run.
+
+        Returns:
+            Result: Its metrics, in their original order.
+
+        Raises:
+            Exception: If the run does not exist.
+        """
+        self.get_run(run_id)
+        result = Result()
+        for name, value in self.connection.execute(
+            "SELECT name, value FROM metrics WHERE run_id = ? ORDER BY position", (run_id,)
+        ):
+            result.add_metric(name, value)
+        return result
+
+    def get_run(self, run_id: int) -> dict:
+        """
+        Get the metadata of a run.
+
+        Args:
+            run_id (int): Identifier of the run.
+
+        Returns:
+            dict: id, created, classifier, config, dataset, host and timings (dict).
+
+        Raises:
+            Exception: If the run does not exist.
+        """
+        row = self.connection.execute(
+            "SELECT id, created, classifier, config, dataset, host FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise Exception(UNKNOWN_RUN_MESSAGE.format(run_id=run_id))
+
+        run = dict(zip(("id", "created", "classifier", "config", "dataset", "host"), row))
+        run["timings"] = dict(self.connection.execute(
+            "SELECT name, seconds FROM timings WHERE run_id = ?", (run_id,)
+        ).fetchall())
+        return run
+
+    def leaderboard(
+        self,
+        metric: str,
+        limit: int = 10,
+        descending: bool = True,
+        dataset: Optional[str] = None
+    ) -> list[tuple[str, float, int]]:
+        """
+        Rank classifiers by the best value of a metric over all their runs.
+
+        Args:
+            metric (str): Metric name (e.g. "Accuracy").
+            limit (int, optional): Number of classifiers. Defaults to 10.
+            descending (bool, optional): True if higher is better, False for metrics such as FPR. Defaults to True.
+            dataset (str, optional): Only runs on this dataset fingerprint. Defaults to None.
+
+        Returns:
+            list[tuple[str, float, int]]: Classifier, best value and run of that value, best first.
+        """
+        # One index seek per classifier for its best run, instead of scanning every run
+        order = "DESC" if descending else "ASC"
+        dataset_filter = "AND dataset = :dataset" if dataset is not None else ""
+        query = f"""
+            SELECT classifiers.classifier, best.value, best.run_id
+            FROM (SELECT DISTINCT classifier FROM runs WHERE 1 {dataset_filter}) AS classifiers
+            JOIN metrics AS best ON best.name = :metric AND best.run_id = (
+                SELECT run_id FROM metrics
+                WHERE name = :metric AND classifier = classifiers.classifier {dataset_filter} AND value IS NOT NULL
+                ORDER BY value {order}
+                LIMIT 1
+            )
+            ORDER BY best.value {order}
+            LIMIT :limit
+        """
+        parameters = {"metric": metric, "dataset": dataset, "limit": limit}
+        return self.connection.execute(query, parameters).fetchall()
+
+    def trend(self, classifier: str, metric: str, limit: Optional[int] = None) -> list[tuple[int, float, float]]:
+        """
+        Get the value of a metric across the runs of a classifier.
+
+        Args:
+            classifier (str): Classifier name.
+            metric (str): Metric name.
+            limit (int, optional): Only the latest runs. Defaults to None (all of them).
+
+        Returns:
+            list[tuple[int, float, float]]: Run, creation time and value, oldest first.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT runs.id, runs.created, metrics.value
+            FROM runs JOIN metrics ON metrics.run_id = runs.id AND metrics.name = ?
+            WHERE runs.classifier = ?
+            ORDER BY runs.created DESC
+            LIMIT ?
+            """,
+            (metric, classifier, limit if limit is not None else -1)
+        ).fetchall()
+        return rows[::-1]
+
+    def delta(self, run_id: int, baseline_id: int) -> Result:
+        """
+        Calculate the difference of every metric shared by two runs.
+
+        Args:
+            run_id (int): Run to compare.
+            baseline_id (int): Reference run.
+
+        Returns:
+            Result: value(run) - value(baseline) of every shared metric, in the order of the run.
+
+        Raises:
+            Exception: If a run does not exist.
+        """
+        self.get_run(run_id)
+        self.get_run(baseline_id)
+        result = Result()
+        for name, value in self.connection.execute(
+            """
+            SELECT current.name, current.value - baseline.value
+            FROM metrics AS current JOIN metrics AS baseline
+                ON baseline.run_id = ? AND baseline.name = current.name
+            WHERE current.run_id = ?
+            ORDER BY current.position
+            """,
+            (baseline_id, run_id)
+        ):
+            result.add_metric(name, value)
+        return result
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.connection.close()
+
+    @staticmethod
+    def config_fingerprint(classifier: object) -> str:
+        """
+        Fingerprint the configuration of a classifier.
+
+        Only public attributes holding plain values (numbers, strings, booleans,
+        None and lists, tuples or dicts of them) are considered, so models,
+        encoders, weights or private state do not change the fingerprint.
+
+        Args:
+            classifier (object): The classifier.
+
+        Returns:
+            str: Hex fingerprint of its class name and configuration.
+        """
+        def is_plain(value) -> bool:
+            if value is None or isinstance(value, (bool, int, float, str)):
+                return True
+            if isinstance(value, (list, tuple)):
+                return all(is_plain(item) for item in value)
+            if isinstance(value, dict):
+                return all(isinstance(key, str) and is_plain(item) for key, item in value.items())
+            return False
+
+        config = {name: value for name, value in vars(classifier).items()
+                  if not name.startswith("_") and is_plain(value)}
+        payload = json.dumps([type(classifier).__qualname__, config], sort_keys=True)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def dataset_fingerprint(dataset_manager) -> str:
+        """
+        Fingerprint the splits of a dataset manager, independently of their iteration order.
+
+        Args:
+            dataset_manager (DatasetManager): The dataset manager.
+
+        Returns:
+            str: Hex fingerprint of the domains and labels of every split.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for split in (dataset_manager.get_train(), dataset_manager.get_validation(), dataset_manager.get_test()):
+            lines = sorted(f"{element.domain};{element.is_dga}" for element in split)
+            digest.update("\n".join(lines).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
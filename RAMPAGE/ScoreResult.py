@@ -0,0 +1,183 @@
+from typing import Hashable, Optional, Sequence, Union
+import numpy as np
+from RAMPAGE.ConfusionResult import ConfusionResult
+from RAMPAGE.CurveResult import CurveResult, DEFAULT_FPR_TARGETS
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.SliceResult import SliceResult
+
+
+# Error message templates
+NO_DOMAINS_MESSAGE = """ERROR:
+
+The result has no domains...
+
+Slicing by "{by}" needs the domain of every score
+"""
+
+WRONG_SLICE_MESSAGE = """ERROR:
+
+Wrong slice key...
+
+Possible values: "tld", "length" or one key per domain
+Slice key: {by}
+"""
+
+
+class ScoreResult(ConfusionResult):
+    """
+    A classification result that keeps the raw score of every domain.
+
+    The confusion matrix and every common metric are computed from the stored
+    labels and scores in one vectorized pass. Since the scores are kept (and can
+    be saved and loaded), metrics can be recomputed at another threshold, or new
+    ones derived, without running inference again.
+
+    Attributes:
+        labels (np.ndarray): Boolean ground truth of every domain.
+        scores (np.ndarray): float32 DGA score of every domain.
+        threshold (float): Scores above it are DGA.
+        domains (list[str]): Optional domain of every score.
+        elements (list[DataElement]): Optional scored data element of every score, to slice
+            by their attributes. Not saved.
+    """
+
+    def __init__(
+        self,
+        labels: np.ndarray,
+        scores: np.ndarray,
+        threshold: float = 0.5,
+        domains: Optional[list[str]] = None,
+        elements: Optional[list[DataElement]] = None
+    ) -> None:
+        """
+        Initialize ScoreResult and calculate all metrics.
+
+        Args:
+            labels (np.ndarray): 1 for DGA domains and 0 otherwise.
+            scores (np.ndarray): DGA score of every domain.
+            threshold (float, optional): Scores above it are DGA. Defaults to 0.5.
+            domains (list[str], optional): Domain of every score. Defaults to None.
+            elements (list[DataElement], optional): Data element of every score. Defaults to None.
+        """
+        self.labels = np.asarray(labels).astype(bool).ravel()
+        self.scores = np.asarray(scores, dtype=np.float32).ravel()
+        self.threshold = float(threshold)
+        self.domains = list(domains) if domains is not None else None
+        self.elements = elements
+
+        tp, tn, fp, fn = self.confusion_counts(self.labels, self.scores > self.threshold)
+        super().__init__(tp, tn, fp, fn, self.roc_auc(self.labels, self.scores.astype(np.float64)))
+
+    @classmethod
+    def from_scores(cls, labels: np.ndarray, scores: np.ndarray, threshold: float = 0.5) -> "ScoreResult":
+        """
+        Build the result from labels and scores.
+
+        Args:
+            labels (np.ndarray): 1 for DGA domains and 0 otherwise.
+            scores (np.ndarray): DGA score of every domain.
+            threshold (float, optional): Scores above it are DGA. Defaults to 0.5.
+
+        Returns:
+            ScoreResult: The result.
+        """
+        return cls(labels, scores, threshold)
+
+    def with_threshold(self, threshold: float) -> "ScoreResult":
+        """
+        Recompute all metrics at another threshold from the stored scores.
+
+        Args:
+            threshold (float): New threshold.
+
+        Returns:
+            ScoreResult: The result at the new threshold.
+        """
+        return ScoreResult(self.labels, self.scores, threshold, self.domains, self.elements)
+
+    def slices(self, by: Union[str, Sequence[Hashable]] = "tld") -> SliceResult:
+        """
+        Compute every metric per slice of the stored scores.
+
+        Args:
+            by (Union[str, Sequence[Hashable]], optional): "tld", "length" or the slice key of
+                every domain. Defaults to "tld".
+
+        Returns:
+            SliceResult: The metrics of every slice.
+
+        Raises:
+            Exception: If by is another string, or it is "tld" or "length" and the result has no domains.
+        """
+        if isinstance(by, str):
+            if by not in ("tld", "length"):
+                raise Exception(WRONG_SLICE_MESSAGE.format(by=by))
+            if self.domains is None:
+                raise Exception(NO_DOMAINS_MESSAGE.format(by=by))
+            by = SliceResult.tld_keys(self.domains) if by == "tld" else SliceResult.length_keys(self.domains)
+        return SliceResult.from_scores(self.labels, self.scores, by, self.threshold)
+
+    def curve(
+        self,
+        max_points: Optional[int] = None,
+        fpr_targets: tuple[float, ...] = DEFAULT_FPR_TARGETS
+    ) -> CurveResult:
+        """
+        Compute the ROC and precision-recall curves from the stored scores.
+
+        Args:
+            max_points (int, optional): Keep about this many points. Defaults to None (every threshold).
+            fpr_targets (tuple[float, ...], optional): False positive rates reported as metrics.
+                Defaults to (1e-4, 1e-3, 1e-2).
+
+        Returns:
+            CurveResult: The curves.
+        """
+        return CurveResult.from_scores(self.labels, self.scores, max_points, fpr_targets)
+
+    def at_fpr(self, target_fpr: float) -> "ScoreResult":
+        """
+        Recompute all metrics at the threshold with the highest recall whose false positive rate does not exceed a target.
+
+        Args:
+            target_fpr (float): Maximum false positive rate.
+
+        Returns:
+            ScoreResult: The result at that threshold.
+        """
+        return self.with_threshold(self.curve().threshold_at_fpr(target_fpr))
+
+    def save(self, path: str) -> None:
+        """
+        Save labels, scores and threshold (and domains, if present) in NumPy .npz format.
+
+        Args:
+            path (str): Output path.
+        """
+        arrays = {
+            "labels": self.labels,
+            "scores": self.scores,
+            "threshold": np.array(self.threshold)
+        }
+        if self.domains is not None:
+            # Newline-separated UTF-8 bytes, far smaller than a fixed-width string array
+            arrays["domains"] = np.frombuffer("\n".join(self.domains).encode("utf-8"), dtype=np.uint8)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ScoreResult":
+        """
+        Load a result saved with save(), recomputing its metrics.
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            ScoreResult: The result.
+        """
+        with np.load(path) as data:
+            labels = data["labels"]
+            domains = None
+            if "domains" in data.files:
+                domains = data["domains"].tobytes().decode("utf-8").split("\n") if len(labels) else []
+            return cls(labels, data["scores"], float(data["threshold"]), domains)
@@ -0,0 +1,379 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import numpy as np
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.Framework import Framework
+from RAMPAGE.Result import Result
+
+
+# Protocol message templates
+ERROR_UNKNOWN_CLASSIFIER = "ERROR Unknown classifier: {name}\n"
+ERROR_EMPTY_REQUEST = "ERROR Empty request, expected: <classifier> <domain> [<domain> ...]\n"
+# The error is escaped, so it never spans several lines
+ERROR_PREDICT = "ERROR {name} failed: {error}\n"
+ERROR_LONG_REQUEST = "ERROR Request longer than {limit} bytes\n"
+ERROR_ENCODING = "ERROR Request is not valid UTF-8\n"
+
+
+class ScoringServer:
+    """
+    A local asyncio scoring service with dynamic micro-batching.
+
+    Clients connect over TCP (localhost) or a Unix socket and send one request
+    per line, ``<classifier> <domain> [<domain> ...]``, and receive one line with
+    the space-separated scores in the same order. The line ``STATS`` returns the
+    server counters as JSON. Requests may be pipelined on a connection.
+
+    Concurrent requests for the same classifier are coalesced into a single
+    predict() call until max_batch_size domains are queued or the oldest
+    request has waited max_latency seconds. Every classifier runs its batches
+    on its own worker thread, so the event loop never blocks on inference. A
+    connection stops being read while max_pending of its requests wait for
+    their response, so a client that pipelines faster than it is served
+    cannot grow the memory of the server without bound. Lines longer than
+    max_line_bytes or not valid UTF-8 are answered with an ERROR line, and
+    the connection keeps being served.
+
+    Attributes:
+        classifiers (dict[str, Classifier]): Trained classifiers by name.
+        max_batch_size (int): Maximum number of domains per predict() call.
+        max_latency (float): Maximum seconds a request waits for its batch to fill.
+        max_pending (int): Maximum requests of a connection waiting for their response.
+        max_line_bytes (int): Maximum length of a request line.
+    """
+
+    def __init__(
+        self,
+        classifiers: dict[str, Classifier],
+        max_batch_size: int = 1024,
+        max_latency: float = 0.005,
+        latency_window: int = 100000,
+        max_pending: int = 1024,
+        max_line_bytes: int = 1 << 24
+    ) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            classifiers (dict[str, Classifier]): Trained classifiers by name.
+            max_batch_size (int, optional): Maximum domains per batch. Defaults to 1024.
+            max_latency (float, optional): Batching deadline in seconds. Defaults to 0.005.
+            latency_window (int, optional): Latencies kept for percentiles. Defaults to 100000.
+            max_pending (int, optional): Requests of a connection waiting for their response
+                before it stops being read. Defaults to 1024.
+            max_line_bytes (int, optional): Maximum length of a request line. Defaults to 16 MiB.
+        """
+        self.classifiers = classifiers
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_pending = max_pending
+        self.max_line_bytes = max_line_bytes
+
+        self._latencies = deque(maxlen=latency_window)
+        self._requests = 0
+        self._domains = 0
+        self._batches = 0
+        self._started = None
+        self._queues = {}
+        self._workers = []
+        self._servers = []
+        self._connections = {}
+        self._executor = None
+
+    @classmethod
+    def from_framework(cls, framework: Framework, **kwargs) -> "ScoringServer":
+        """
+        Create a server for all the classifiers of a framework, named as in Framework.get_classifier_names.
+
+        Args:
+            framework (Framework): Framework with trained classifiers.
+            **kwargs: Additional ScoringServer arguments.
+
+        Returns:
+            ScoringServer: The server.
+        """
+        classifiers = dict(zip(framework.get_classifier_names(), framework.classifiers))
+        return cls(classifiers, **kwargs)
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Start listening on a TCP address.
+
+        Args:
+            host (str, optional): Address to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind, 0 picks a free one. Defaults to 0.
+
+        Returns:
+            int: The bound port.
+        """
+        self._start_workers()
+        server = await asyncio.start_server(self._handle_connection, host, port, limit=self.max_line_bytes)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str) -> None:
+        """
+        Start listening on a Unix socket.
+
+        Args:
+            path (str): Path of the socket.
+        """
+        self._start_workers()
+        server = await asyncio.start_unix_server(self._handle_connection, path, limit=self.max_line_bytes)
+        self._servers.append(server)
+
+    async def close(self) -> None:
+        """Stop listening and stop the batching workers."""
+        for server in self._servers:
+            server.close()
+        # Closing the transports ends the connection loops at their next read
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+        self._servers.clear()
+        self._workers.clear()
+        self._queues.clear()
+        self._executor = None
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0, unix_path: Optional[str] = None) -> None:
+        """
+        Run the server until interrupted.
+
+        Args:
+            host (str, optional): Address to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind. Defaults to 0.
+            unix_path (str, optional): Unix socket path, used instead of TCP if set. Defaults to None.
+        """
+        async def run() -> None:
+            if unix_path is not None:
+                await self.start_unix(unix_path)
+                print(f"Scoring server listening on {unix_path}")
+            else:
+                bound_port = await self.start_tcp(host, port)
+                print(f"Scoring server listening on {host}:{bound_port}")
+            try:
+                await asyncio.gather(*(server.serve_forever() for server in self._servers))
+            finally:
+                await self.close()
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            pass
+
+    async def score(self, name: str, domains: list[str]) -> np.ndarray:
+        """
+        Score domains through the micro-batching queue of a classifier.
+
+        Args:
+            name (str): Name of the classifier.
+            domains (list[str]): Domains to score.
+
+        Returns:
+            np.ndarray: Scores in the same order as the domains.
+
+        Raises:
+            KeyError: If the classifier is not served.
+        """
+        self._start_workers()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        arrival = loop.time()
+        self._queues[name].put_nowait((domains, future, arrival))
+
+        scores = await future
+        self._latencies.append(loop.time() - arrival)
+        self._requests += 1
+        self._domains += len(domains)
+        return scores
+
+    def get_stats(self) -> Result:
+        """
+        Get the server counters.
+
+        Returns:
+            Result: Requests, domains, batches, p50/p99 latency and throughput.
+        """
+        latencies = np.fromiter(self._latencies, dtype=np.float64)
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+
+        result = Result()
+        result.add_metric("Requests", self._requests)
+        result.add_metric("Domains", self._domains)
+        result.add_metric("Batches", self._batches)
+        result.add_metric("Mean batch", self._domains / self._batches if self._batches else 0.0)
+        result.add_metric("p50 ms", float(np.percentile(latencies, 50)) * 1000 if len(latencies) else 0.0)
+        result.add_metric("p99 ms", float(np.percentile(latencies, 99)) * 1000 if len(latencies) else 0.0)
+        result.add_metric("Domains/s", self._domains / elapsed if elapsed > 0 else 0.0)
+        return result
+
+    def _start_workers(self) -> None:
+        """Create the queues and batching workers if they are not running."""
+        if self._workers:
+            return
+
+        self._started = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.classifiers), 1))
+        for name in self.classifiers:
+            self._queues[name] = asyncio.Queue()
+            self._workers.append(asyncio.create_task(self._batch_worker(name)))
+
+    async def _batch_worker(self, name: str) -> None:
+        """
+        Coalesce queued requests of a classifier into batches and score them.
+
+        Args:
+            name (str): Name of the classifier.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._queues[name]
+        classifier = self.classifiers[name]
+
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0][0])
+            deadline = batch[0][2] + self.max_latency
+
+            while size < self.max_batch_size:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                batch.append(item)
+                size += len(item[0])
+
+            domains = [domain for item in batch for domain in item[0]]
+            try:
+                scores = await loop.run_in_executor(self._executor, classifier.predict, domains)
+                scores = np.asarray(scores).ravel()
+            except Exception as error:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            self._batches += 1
+            offset = 0
+            for item_domains, future, _ in batch:
+                if not future.done():
+                    future.set_result(scores[offset:offset + len(item_domains)])
+                offset += len(item_domains)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve the requests of a connection, answering them in order.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader.
+            writer (asyncio.StreamWriter): Connection writer.
+        """
+        # Bounded, so reading pauses while too many requests of this connection are pending
+        responses = asyncio.Queue(maxsize=self.max_pending)
+
+        async def respond() -> None:
+            # Keeps consuming after the client goes away, so the reader never waits on a full queue forever
+            while True:
+                response = await responses.get()
+                if response is None:
+                    break
+                line = await response
+                if writer.is_closing():
+                    continue
+                writer.write(line.encode())
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    pass
+
+        connection = asyncio.current_task()
+        self._connections[connection] = writer
+        responder = asyncio.create_task(respond())
+        try:
+            while (line := await self._read_line(reader)) != b"":
+                await responses.put(asyncio.ensure_future(self._handle_line(line)))
+        finally:
+            await responses.put(None)
+            await asyncio.gather(responder, return_exceptions=True)
+            writer.close()
+            self._connections.pop(connection, None)
+
+    async def _read_line(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """
+        Read a request line, discarding it if it is too long.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader, limited to max_line_bytes.
+
+        Returns:
+            Optional[bytes]: The line, empty at the end of the connection, or None if it
+                was longer than max_line_bytes.
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            # Last line without a newline
+            return error.partial
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+        # The overrun bytes are left in the buffer, drop them until the end of the line arrives
+        while True:
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return None
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+
+    async def _handle_line(self, line: Optional[bytes]) -> str:
+        """
+        Answer a single request line.
+
+        Args:
+            line (bytes): Raw request line, None if it was too long.
+
+        Returns:
+            str: Response line.
+        """
+        if line is None:
+            return ERROR_LONG_REQUEST.format(limit=self.max_line_bytes)
+        try:
+            fields = line.decode("utf-8").split()
+        except UnicodeDecodeError:
+            return ERROR_ENCODING
+
+        if fields == ["STATS"]:
+            return json.dumps(dict(self.get_stats().get_metrics())) + "\n"
+        if len(fields) < 2:
+            return ERROR_EMPTY_REQUEST
+
+        name, domains = fields[0], fields[1:]
+        if name not in self.classifiers:
+            return ERROR_UNKNOWN_CLASSIFIER.format(name=name)
+
+        try:
+            scores = await self.score(name, domains)
+        except Exception as error:
+            escaped = str(error).encode("unicode_escape").decode("ascii")
+            return ERROR_PREDICT.format(name=name, error=escaped)
+        return " ".join(f"{score:.6f}" for score in scores.tolist()) + "\n"
@@ -0,0 +1,255 @@
+from typing import Hashable, Sequence
+import numpy as np
+from RAMPAGE.ConfusionResult import ConfusionResult, METRIC_NAMES
+from RAMPAGE.Result import Result
+
+
+# Error message templates
+UNKNOWN_SLICE_MESSAGE = """ERROR:
+
+Unknown slice...
+
+Slice: {key}
+"""
+
+UNKNOWN_METRIC_MESSAGE = """ERROR:
+
+Unknown metric...
+
+Possible values: {names}
+Metric: {metric}
+"""
+
+# Upper bounds of the default domain length buckets
+DEFAULT_LENGTH_BOUNDARIES = (8, 12, 16, 20, 24, 32)
+
+
+class SliceResult(Result):
+    """
+    The common classification metrics of every slice of a test set.
+
+    Slices are given by one key per domain (its TLD, a length bucket, a DGA
+    family or any other column). Keys are mapped to integer slice codes and the
+    confusion matrix of every slice is one bincount over (slice, label,
+    prediction) cells; the exact AUC of every slice comes from one sort by
+    (slice, score) and a rank-sum per slice. All metrics are then computed as
+    columns (ConfusionResult.metrics_table), so thousands of slices over
+    millions of domains take about the time of a sort.
+
+    Attributes:
+        keys (list): Key of every slice, in order of first appearance.
+        sizes (np.ndarray): Number of domains of every slice.
+        table (np.ndarray): (slices, metrics) matrix in METRIC_NAMES order.
+    """
+
+    def __init__(
+        self,
+        keys: list,
+        tp: np.ndarray,
+        tn: np.ndarray,
+        fp: np.ndarray,
+        fn: np.ndarray,
+        auc: np.ndarray
+    ) -> None:
+        """
+        Initialize SliceResult from the confusion matrix and AUC of every slice.
+
+        Args:
+            keys (list): Key of every slice.
+            tp (np.ndarray): True positives of every slice.
+            tn (np.ndarray): True negatives of every slice.
+            fp (np.ndarray): False positives of every slice.
+            fn (np.ndarray): False negatives of every slice.
+            auc (np.ndarray): ROC AUC of every slice.
+        """
+        super().__init__()
+        self.keys = list(keys)
+        self._index = {key: position for position, key in enumerate(self.keys)}
+        self._counts = np.stack([tp, tn, fp, fn], axis=1).astype(np.int64)
+        self._auc = np.asarray(auc, dtype=np.float64)
+        self.sizes = self._counts.sum(axis=1)
+        self.table = ConfusionResult.metrics_table(tp, tn, fp, fn, self._auc)
+
+        self.add_metric("Slices", len(self.keys))
+
+    @classmethod
+    def from_scores(
+        cls,
+        labels: np.ndarray,
+        scores: np.ndarray,
+        keys: Sequence[Hashable],
+        threshold: float = 0.5
+    ) -> "SliceResult":
+        """
+        Build the result from labels, scores and the slice key of every domain.
+
+        Args:
+            labels (np.ndarray): 1 for DGA domains and 0 otherwise.
+            scores (np.ndarray): DGA score of every domain.
+            keys (Sequence[Hashable]): Slice key of every domain.
+            threshold (float, optional): Scores above it are DGA. Defaults to 0.5.
+
+        Returns:
+            SliceResult: The result.
+        """
+        labels = np.asarray(labels).astype(bool).ravel()
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        slice_keys, codes = cls._factorize(keys)
+        count = len(slice_keys)
+
+        # Cell index per slice: 0 tn, 1 fp, 2 fn, 3 tp (as ConfusionResult.confusion_counts)
+        cells = codes * 4 + labels * 2 + (scores > threshold)
+        tn, fp, fn, tp = np.bincount(cells, minlength=count * 4).reshape(count, 4).T
+
+        # Average rank of every domain within its slice, ties count half
+        order = np.lexsort((scores, codes))
+        sorted_codes = codes[order]
+        sorted_scores = scores[order]
+        group_starts = np.flatnonzero(np.r_[
+            True,
+            (sorted_codes[1:] != sorted_codes[:-1]) | (sorted_scores[1:] != sorted_scores[:-1])
+        ])
+        group_sizes = np.diff(np.r_[group_starts, len(order)])
+        slice_starts = np.searchsorted(sorted_codes, np.arange(count))
+        group_ranks = group_starts - slice_starts[sorted_codes[group_starts]] + (group_sizes + 1) / 2
+        ranks = np.repeat(group_ranks, group_sizes)
+
+        positives = (tp + fn).astype(np.float64)
+        negatives = (tn + fp).astype(np.float64)
+        rank_sums = np.bincount(sorted_codes, weights=ranks * labels[order], minlength=count)
+        pairs = positives * negatives
+        auc = np.divide(rank_sums - positives * (positives + 1) / 2, pairs, out=np.zeros(count), where=pairs != 0)
+
+        return cls(slice_keys, tp, tn, fp, fn, auc)
+
+    def get_slice(self, key: Hashable) -> ConfusionResult:
+        """
+        Get the metrics of one slice.
+
+        Args:
+            key (Hashable): Slice key.
+
+        Returns:
+            ConfusionResult: Its metrics.
+
+        Raises:
+            Exception: If the slice does not exist.
+        """
+        if key not in self._index:
+            raise Exception(UNKNOWN_SLICE_MESSAGE.format(key=key))
+        position = self._index[key]
+        tp, tn, fp, fn = (int(count) for count in self._counts[position])
+        return ConfusionResult(tp, tn, fp, fn, float(self._auc[position]))
+
+    def get_column(self, metric: str) -> np.ndarray:
+        """
+        Get one metric of every slice.
+
+        Args:
+            metric (str): Metric name (e.g. "Accuracy").
+
+        Returns:
+            np.ndarray: Value of every slice, in the order of keys.
+
+        Raises:
+            Exception: If the metric does not exist.
+        """
+        if metric not in METRIC_NAMES:
+            raise Exception(UNKNOWN_METRIC_MESSAGE.format(names=", ".join(METRIC_NAMES), metric=metric))
+        return self.table[:, METRIC_NAMES.index(metric)]
+
+    def worst(
+        self,
+        metric: str,
+        count: int = 10,
+        min_size: int = 1,
+        higher_is_better: bool = True
+    ) -> list[tuple[Hashable, float, int]]:
+        """
+        Get the slices with the worst value of a metric.
+
+        Args:
+            metric (str): Metric name (e.g. "Accuracy").
+            count (int, optional): Number of slices. Defaults to 10.
+            min_size (int, optional): Ignore slices with fewer domains. Defaults to 1.
+            higher_is_better (bool, optional): False for metrics such as FPR. Defaults to True.
+
+        Returns:
+            list[tuple[Hashable, float, int]]: Key, value and size of every slice, worst first.
+
+        Raises:
+            Exception: If the metric does not exist.
+        """
+        values = self.get_column(metric)
+        candidates = np.flatnonzero(self.sizes >= min_size)
+        ranking = values[candidates] if higher_is_better else -values[candidates]
+        selected = candidates[np.argsort(ranking, kind="stable")[:count]]
+        return [(self.keys[position], float(values[position]), int(self.sizes[position])) for position in selected]
+
+    def get_csv_rows(self, separator: str) -> list[str]:
+        """
+        Convert every slice to a CSV row (slice, size and every metric).
+
+        Args:
+            separator (str): The delimiter to use between CSV fields.
+
+        Returns:
+            list[str]: Header row followed by one row per slice.
+        """
+        header = separator.join(["slice", "size"] + [name.lower() for name in METRIC_NAMES])
+        # Counts are written as integers
+        counts = {METRIC_NAMES.index(name) for name in ("FP", "FN", "TP", "TN")}
+        rows = [
+            separator.join(
+                [str(key), str(int(size))]
+                + [str(int(value)) if column in counts else str(value) for column, value in enumerate(values)]
+            )
+            for key, size, values in zip(self.keys, self.sizes, self.table.tolist())
+        ]
+        return [header] + rows
+
+    @staticmethod
+    def tld_keys(domains: Sequence[str]) -> list[str]:
+        """
+        Get the TLD (text after the last dot, lowercased) of every domain.
+
+        Args:
+            domains (Sequence[str]): Domains.
+
+        Returns:
+            list[str]: TLD of every domain.
+        """
+        return [domain.rstrip(".").rpartition(".")[2].lower() for domain in domains]
+
+    @staticmethod
+    def length_keys(domains: Sequence[str], boundaries: Sequence[int] = DEFAULT_LENGTH_BOUNDARIES) -> np.ndarray:
+        """
+        Get the length bucket of every domain.
+
+        Args:
+            domains (Sequence[str]): Domains.
+            boundaries (Sequence[int], optional): Increasing upper bounds of the buckets.
+                Defaults to (8, 12, 16, 20, 24, 32).
+
+        Returns:
+            np.ndarray: Bucket name of every domain ("1-8", "9-12", ..., ">32").
+        """
+        bounds = list(boundaries)
+        names = [f"{low + 1}-{high}" for low, high in zip([0] + bounds[:-1], bounds)] + [f">{bounds[-1]}"]
+        lengths = np.fromiter(map(len, domains), dtype=np.int64, count=len(domains))
+        return np.array(names, dtype=object)[np.searchsorted(bounds, lengths, side="left")]
+
+    @staticmethod
+    def _factorize(keys: Sequence[Hashable]) -> tuple[list, np.ndarray]:
+        """
+        Map every key to the code of its slice.
+
+        Args:
+            keys (Sequence[Hashable]): Slice key of every domain.
+
+        Returns:
+            tuple[list, np.ndarray]: Distinct keys in order of first appearance and code of every domain.
+        """
+        index = {}
+        codes = np.fromiter((index.setdefault(key, len(index)) for key in keys), dtype=np.int64, count=len(keys))
+        return list(index), codes
@@ -0,0 +1,257 @@
+import os
+import threading
+from itertools import islice
+from typing import Iterable, Iterator
+import numpy as np
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DomainEncoder import DomainEncoder
+
+
+# Domains written or decoded per chunk
+CHUNK_SIZE = 65536
+
+
+class SpilledSplit:
+    """
+    A dataset split stored in memory-mapped files instead of Python objects.
+
+    Domains are stored as one UTF-8 byte buffer with an offset per domain, and
+    labels as a boolean array. Only the pages being read are resident, so a
+    spilled split costs almost no memory until it is used, and the operating
+    system can drop those pages under memory pressure.
+
+    It behaves like the set it replaces for the framework: it is sized and
+    iterable, yielding plain DataElement objects chunk by chunk, and supports
+    update() and clear() (DataElement sets never merge elements, so appending is
+    equivalent). Encoded matrices are also written to memory-mapped files
+    (encode()), once per encoding, so streaming pipelines read them without
+    creating any DataElement.
+
+    Attributes:
+        directory (str): Directory of the files.
+        name (str): Prefix of the files.
+        offsets (np.ndarray): Memory-mapped int64 start of every domain, plus the end.
+        labels (np.ndarray): Memory-mapped boolean label of every domain.
+    """
+
+    def __init__(self, directory: str, name: str) -> None:
+        """
+        Open a spilled split, creating an empty one if its files do not exist.
+
+        Args:
+            directory (str): Directory of the files.
+            name (str): Prefix of the files.
+        """
+        self.directory = directory
+        self.name = name
+        # Encodings are written once even when threads request them together
+        self._encode_lock = threading.Lock()
+        if not os.path.exists(self._path("labels.npy")):
+            os.makedirs(directory, exist_ok=True)
+            self._write(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=bool), truncate=True)
+        self._open()
+
+    @classmethod
+    def spill(cls, elements: Iterable[DataElement], directory: str, name: str) -> "SpilledSplit":
+        """
+        Write data elements to a new spilled split, replacing any previous one with the same name.
+
+        Args:
+            elements (Iterable[DataElement]): Data elements (their domain and label are kept).
+            directory (str): Directory of the files.
+            name (str): Prefix of the files.
+
+        Returns:
+            SpilledSplit: The spilled split.
+        """
+        split = cls(directory, name)
+        split.clear()
+        split.update(elements)
+        return split
+
+    def __len__(self) -> int:
+        """
+        Get the number of domains.
+
+        Returns:
+            int: Number of domains.
+        """
+        return len(self.labels)
+
+    def __iter__(self) -> Iterator[DataElement]:
+        """
+        Iterate over the split as DataElement objects, decoding one chunk at a time.
+
+        Returns:
+            Iterator[DataElement]: The data elements.
+        """
+        for start in range(0, len(self), CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, len(self))
+            yield from map(DataElement, self.get_domains(start, stop), self.labels[start:stop].tolist())
+
+    def update(self, elements: Iterable[DataElement]) -> None:
+        """
+        Append data elements to the split.
+
+        Args:
+            elements (Iterable[DataElement]): Data elements (their domain and label are kept).
+        """
+        lengths, labels = [], []
+        iterator = iter(elements)
+        with open(self._path("domains.bin"), "ab") as f:
+            while chunk := list(islice(iterator, CHUNK_SIZE)):
+                encoded = [element.domain.encode("utf-8") for element in chunk]
+                f.write(b"".join(encoded))
+                lengths.append(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+                labels.append(np.fromiter((element.is_dga for element in chunk), dtype=bool, count=len(chunk)))
+        if not lengths:
+            return
+
+        offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum(np.concatenate(lengths))])
+        self._write(offsets, np.concatenate([self.labels] + labels))
+        self._open()
+
+    def clear(self) -> None:
+        """
+        Remove every element of the split.
+        """
+        self._write(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=bool), truncate=True)
+        self._open()
+
+    def get_domains(self, start: int = 0, stop: int = None) -> list[str]:
+        """
+        Decode a range of domains.
+
+        Args:
+            start (int, optional): First domain. Defaults to 0.
+            stop (int, optional): End of the range. Defaults to None (last domain).
+
+        Returns:
+            list[str]: The domains.
+        """
+        stop = len(self) if stop is None else stop
+        offsets = self.offsets[start:stop + 1]
+        if len(offsets) < 2:
+            return []
+        raw = self._data[offsets[0]:offsets[-1]].tobytes()
+        bounds = (offsets - offsets[0]).tolist()
+        pairs = zip(bounds, bounds[1:])
+        if raw.isascii():
+            # One character per byte, so decode once and slice the string
+            text = raw.decode("ascii")
+            return [text[begin:end] for begin, end in pairs]
+        return [raw[begin:end].decode("utf-8") for begin, end in pairs]
+
+    def encode(self, encoder: DomainEncoder) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the split encoded by an encoder, from memory-mapped files.
+
+        The files are written the first time an encoding is requested and reused
+        afterwards by every encoder with the same fingerprint, until the split
+        changes. Concurrent requests wait for the first one to write them.
+
+        Args:
+            encoder (DomainEncoder): The encoder.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Memory-mapped (n, max_length) encoded matrix and
+                int32 length of every domain (at most max_length).
+        """
+        fingerprint = encoder.get_fingerprint()
+        codes_path = self._path(f"{fingerprint}.codes.npy")
+        lengths_path = self._path(f"{fingerprint}.lengths.npy")
+        with self._encode_lock:
+            if not os.path.exists(lengths_path):
+                shape = (len(self), encoder.max_length)
+                codes = np.lib.format.open_memmap(codes_path, mode="w+", dtype=encoder.dtype, shape=shape)
+                lengths = np.empty(len(self), dtype=np.int32)
+                for start in range(0, len(self), CHUNK_SIZE):
+                    domains = self.get_domains(start, start + CHUNK_SIZE)
+                    codes[start:start + len(domains)] = encoder.encode(domains)
+                    lengths[start:start + len(domains)] = np.fromiter(map(len, domains), dtype=np.int32, count=len(domains))
+                codes.flush()
+                del codes
+                # The lengths file is written last, it marks the encoding as complete
+                np.save(lengths_path, np.minimum(lengths, encoder.max_length))
+        return np.load(codes_path, mmap_mode="r"), np.load(lengths_path, mmap_mode="r")
+
+    def to_set(self) -> set[DataElement]:
+        """
+        Load the split back into memory.
+
+        Returns:
+            set[DataElement]: The data elements.
+        """
+        return set(self)
+
+    def get_disk_bytes(self) -> int:
+        """
+        Get the size of the files of the split, including its encodings.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return sum(os.path.getsize(path) for path in self._files())
+
+    def delete(self) -> None:
+        """
+        Close the memory maps and remove the files of the split, including its encodings.
+        """
+        self.offsets = self.labels = self._data = None
+        for path in self._files():
+            os.remove(path)
+
+    def _open(self) -> None:
+        """
+        Map the files of the split.
+        """
+        self.offsets = np.load(self._path("offsets.npy"), mmap_mode="r")
+        self.labels = np.load(self._path("labels.npy"), mmap_mode="r")
+        # A zero-byte file cannot be mapped
+        self._data = np.memmap(self._path("domains.bin"), dtype=np.uint8, mode="r") \
+            if self.offsets[-1] else np.zeros(0, dtype=np.uint8)
+
+    def _write(self, offsets: np.ndarray, labels: np.ndarray, truncate: bool = False) -> None:
+        """
+        Replace the offsets and labels files, and drop the encodings of the previous content.
+
+        Files are replaced, not overwritten, so arrays still mapped by a running
+        pipeline keep reading the previous content.
+
+        Args:
+            offsets (np.ndarray): New offsets.
+            labels (np.ndarray): New labels.
+            truncate (bool, optional): Also empty the domains file. Defaults to False.
+        """
+        for path in self._files():
+            if path.endswith((".codes.npy", ".lengths.npy")):
+                os.remove(path)
+        for suffix, array in (("offsets.npy", offsets), ("labels.npy", labels)):
+            with open(self._path(f"{suffix}.tmp"), "wb") as f:
+                np.save(f, array)
+            os.replace(self._path(f"{suffix}.tmp"), self._path(suffix))
+        if truncate:
+            open(self._path("domains.bin.tmp"), "wb").close()
+            os.replace(self._path("domains.bin.tmp"), self._path("domains.bin"))
+
+    def _files(self) -> list[str]:
+        """
+        Get the paths of every file of the split.
+
+        Returns:
+            list[str]: The paths.
+        """
+        prefix = f"{self.name}."
+        return [entry.path for entry in os.scandir(self.directory) if entry.name.startswith(prefix)]
+
+    def _path(self, suffix: str) -> str:
+        """
+        Get the path of one of the files of the split.
+
+        Args:
+            suffix (str): File suffix.
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.directory, f"{self.name}.{suffix}")
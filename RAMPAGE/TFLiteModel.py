@@ -0,0 +1,166 @@
+import os
+import tempfile
+import time
+import numpy as np
+import tensorflow as tf
+from RAMPAGE.Result import Result
+
+
+class TFLiteModel:
+    """
+    A class to export Keras models to TensorFlow Lite and score with them.
+
+    TFLite inference avoids most of the per-call overhead of Keras on CPU. The
+    export can optionally apply dynamic-range quantization, which stores the
+    weights as int8 and computes the heavy ops with int8 kernels.
+
+    Attributes:
+        path (str): Path to the .tflite artifact.
+        batch_size (int): Number of domains scored per interpreter call, fixed at export.
+    """
+
+    def __init__(self, path: str, num_threads: int = None) -> None:
+        """
+        Load a .tflite artifact.
+
+        Args:
+            path (str): Path to the .tflite artifact.
+            num_threads (int, optional): Interpreter threads. Defaults to None (TFLite default).
+        """
+        self.path = path
+
+        self._interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+        try:
+            self._interpreter.allocate_tensors()
+        except RuntimeError:
+            # XNNPACK rejects some quantized layers (e.g. single-unit hybrid dense), use the builtin kernels
+            self._interpreter = tf.lite.Interpreter(
+                model_path=path,
+                num_threads=num_threads,
+                experimental_op_resolver_type=tf.lite.experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+            )
+            self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self.batch_size, self._width = (int(size) for size in self._input["shape"])
+
+    @staticmethod
+    def export(
+        model: tf.keras.Model,
+        path: str,
+        max_length: int,
+        batch_size: int = 1024,
+        quantize: bool = False
+    ) -> int:
+        """
+        Convert a Keras model that takes encoded domains to a .tflite artifact.
+
+        The input shape is fixed to (batch_size, max_length): static shapes let
+        the converter lower recurrent layers to builtin ops and spare the
+        interpreter from resizing its tensors between calls.
+
+        Args:
+            model (tf.keras.Model): Trained Keras model.
+            path (str): Output path.
+            max_length (int): Width of the encoded domains.
+            batch_size (int, optional): Domains scored per interpreter call. Defaults to 1024.
+            quantize (bool, optional): Whether to apply dynamic-range int8 quantization. Defaults to False.
+
+        Returns:
+            int: Size of the artifact in bytes.
+        """
+        with tempfile.TemporaryDirectory() as saved_model_dir:
+            # Going through a SavedModel freezes the Keras variables
+            model.export(
+                saved_model_dir,
+                input_signature=[tf.TensorSpec([batch_size, max_length], tf.int32)],
+                verbose=False
+            )
+            converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+            if quantize:
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            artifact = converter.convert()
+
+        with open(path, "wb") as f:
+            f.write(artifact)
+        return os.path.getsize(path)
+
+    def predict(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Score encoded domains.
+
+        Args:
+            x_data (np.ndarray): Encoded domains, narrower matrices are padded to the model width.
+
+        Returns:
+            np.ndarray: Score of every domain.
+        """
+        scores = np.empty(len(x_data), dtype=np.float32)
+        batch = np.zeros((self.batch_size, self._width), dtype=self._input["dtype"])
+
+        for start in range(0, len(x_data), self.batch_size):
+            chunk = x_data[start:start + self.batch_size]
+            batch[:] = 0
+            batch[:len(chunk), :chunk.shape[1]] = chunk
+
+            self._interpreter.set_tensor(self._input["index"], batch)
+            self._interpreter.invoke()
+            scores[start:start + len(chunk)] = self._interpreter.get_tensor(self._output["index"])[:len(chunk)].ravel()
+        return scores
+
+    def compare(
+        self,
+        model: tf.keras.Model,
+        x_data: np.ndarray,
+        y_data: np.ndarray,
+        model_path: str = None,
+        threshold: float = 0.5,
+        repetitions: int = 3
+    ) -> Result:
+        """
+        Compare accuracy, latency and throughput against the original Keras model.
+
+        Both models score the same data in batches of batch_size; the best of
+        several repetitions is reported after a warm-up batch.
+
+        Args:
+            model (tf.keras.Model): Original Keras model.
+            x_data (np.ndarray): Encoded domains.
+            y_data (np.ndarray): Labels.
+            model_path (str, optional): Keras artifact, to report its size. Defaults to None.
+            threshold (float, optional): Decision threshold. Defaults to 0.5.
+            repetitions (int, optional): Timed repetitions. Defaults to 3.
+
+        Returns:
+            Result: Accuracy, batch latency, throughput and size of both models.
+        """
+        labels = np.asarray(y_data).astype(bool)
+
+        def keras_predict(data: np.ndarray) -> np.ndarray:
+            scores = np.empty(len(data), dtype=np.float32)
+            for start in range(0, len(data), self.batch_size):
+                chunk = data[start:start + self.batch_size]
+                scores[start:start + len(chunk)] = np.ravel(model.predict_on_batch(chunk))
+            return scores
+
+        results = {}
+        for name, predict in [("Keras", keras_predict), ("TFLite", self.predict)]:
+            predict(x_data[:self.batch_size])
+            best = float("inf")
+            for _ in range(repetitions):
+                start = time.perf_counter()
+                scores = predict(x_data)
+                best = min(best, time.perf_counter() - start)
+            results[name] = (scores, best)
+
+        num_batches = max((len(x_data) + self.batch_size - 1) // self.batch_size, 1)
+        result = Result()
+        for name, (scores, seconds) in results.items():
+            result.add_metric(f"{name} accuracy", float(((scores > threshold) == labels).mean() * 100) if len(labels) else 0.0)
+            result.add_metric(f"{name} ms/batch", seconds / num_batches * 1000)
+            result.add_metric(f"{name} domains/s", len(x_data) / seconds if seconds > 0 else 0.0)
+        result.add_metric("Max score diff", float(np.abs(results["Keras"][0] - results["TFLite"][0]).max()) if len(x_data) else 0.0)
+        if model_path is not None:
+            result.add_metric("Keras bytes", os.path.getsize(model_path))
+        result.add_metric("TFLite bytes", os.path.getsize(self.path))
+        return result
@@ -0,0 +1,5 @@
+import sys
+from RAMPAGE.CommandLine import main
+
+
+sys.exit(main())
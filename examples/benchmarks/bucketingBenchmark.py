@@ -0,0 +1,100 @@
+import random
+import string
+import time
+
+from RAMPAGE.DataElement import DataElement
+from classifiers.LSTM import LSTMExample
+from classifiers.CNN import CNNExample
+
+
+def main():
+    """
+    Compare fixed padding with length bucketing on the sequence classifiers.
+
+    Run from the examples/ directory: python -m benchmarks.bucketingBenchmark
+    """
+    # Benchmark configuration
+    NUM_DOMAINS = 50_000
+
+    data = generate_data(NUM_DOMAINS)
+
+    print("\n=== Length Bucketing Benchmark ===\n")
+    print_padding_stats(data)
+
+    for classifier_class in [LSTMExample, CNNExample]:
+        fixed_train, fixed_inference = measure(classifier_class(bucketing=False), data)
+        bucketed_train, bucketed_inference = measure(classifier_class(bucketing=True), data)
+
+        print(f"\nClassifier: {classifier_class.__name__}")
+        print("-" * 40)
+        print(f"  train epoch fixed (s)     : {fixed_train:.3f}")
+        print(f"  train epoch bucketed (s)  : {bucketed_train:.3f}")
+        print(f"  train speedup             : {fixed_train / bucketed_train:.2f}x")
+        print(f"  inference fixed (s)       : {fixed_inference:.3f}")
+        print(f"  inference bucketed (s)    : {bucketed_inference:.3f}")
+        print(f"  inference speedup         : {fixed_inference / bucketed_inference:.2f}x")
+    print()
+
+
+def generate_data(count: int) -> list[DataElement]:
+    """
+    Generate labelled domains with realistic lengths (mostly 10-20 characters).
+
+    Args:
+        count: Number of domains to generate.
+
+    Returns:
+        List of DataElement objects.
+    """
+    alphabet = string.ascii_lowercase + string.digits
+    tlds = ["com", "net", "org", "es", "info"]
+    data = []
+    for _ in range(count):
+        length = max(1, min(60, int(random.gauss(12, 5))))
+        domain = "".join(random.choices(alphabet, k=length)) + "." + random.choice(tlds)
+        data.append(DataElement(domain, random.random() < 0.5))
+    return data
+
+
+def print_padding_stats(data: list[DataElement]) -> None:
+    """
+    Print the padding waste of fixed and bucketed padding.
+
+    Args:
+        data: Data elements.
+    """
+    bucketer = LSTMExample(bucketing=True).bucketer
+    print(bucketer.padding_stats([element.domain for element in data]))
+
+
+def measure(classifier, data: list[DataElement]) -> tuple[float, float]:
+    """
+    Measure one training epoch and one inference pass, after a warm-up epoch.
+
+    Args:
+        classifier: Example classifier to measure.
+        data: Data elements.
+
+    Returns:
+        Training and inference wall times in seconds.
+    """
+    train_data = classifier._prepare_dataset(data, shuffle=True)
+    test_data = classifier._prepare_dataset(data)
+
+    # Warm-up traces every bucket shape
+    classifier.model.fit(train_data, epochs=1, verbose=0)
+    classifier.model.predict(test_data, verbose=0)
+
+    start = time.perf_counter()
+    classifier.model.fit(train_data, epochs=1, verbose=0)
+    train_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classifier.model.predict(test_data, verbose=0)
+    inference_time = time.perf_counter() - start
+
+    return train_time, inference_time
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import random
+import string
+import time
+
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.NGramClassifier import NGramClassifier
+
+
+def main():
+    """
+    Measure the training time, test metrics and scoring throughput of NGramClassifier.
+    """
+    # Benchmark configuration
+    NUM_TRAIN = 200_000
+    NUM_TEST = 20_000
+    NUM_SCORED = 1_000_000
+    REPETITIONS = 3
+
+    train_set = generate_elements(NUM_TRAIN)
+    validation_set = generate_elements(NUM_TEST)
+    test_set = generate_elements(NUM_TEST)
+    domains = [element.domain for element in generate_elements(NUM_SCORED)]
+
+    classifier = NGramClassifier(seed=0)
+    start = time.perf_counter()
+    classifier.train(train_set, validation_set)
+    train_time = time.perf_counter() - start
+    result = classifier.test(test_set)
+
+    best = float("inf")
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        classifier.predict(domains)
+        best = min(best, time.perf_counter() - start)
+
+    print("\n=== N-gram Classifier Benchmark ===\n")
+    print(f"  train domains       : {NUM_TRAIN}")
+    print(f"  train time (s)      : {train_time:.3f}")
+    print(f"  scored domains      : {NUM_SCORED}")
+    print(f"  predict time (s)    : {best:.3f}")
+    print(f"  domains/s           : {NUM_SCORED / best:,.0f}\n")
+    print(result)
+
+
+def generate_elements(count: int) -> set[DataElement]:
+    """
+    Generate random DGA-like and word-like domains, half of each.
+
+    Args:
+        count: Number of domains to generate.
+
+    Returns:
+        Set of labelled data elements.
+    """
+    syllables = ["ba", "co", "de", "fi", "go", "la", "ma", "ne", "ri", "so", "ta", "ve", "news", "shop", "mail"]
+    alphabet = string.ascii_lowercase + string.digits
+    tlds = ["com", "net", "org", "es", "info"]
+
+    elements = set()
+    for index in range(count):
+        if index % 2:
+            name = "".join(random.choices(alphabet, k=random.randint(8, 30)))
+        else:
+            name = "".join(random.choices(syllables, k=random.randint(2, 6)))
+        elements.add(DataElement(f"{name}.{random.choice(tlds)}", bool(index % 2)))
+    return elements
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
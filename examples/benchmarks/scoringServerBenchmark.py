@@ -0,0 +1,90 @@
+import asyncio
+import random
+import string
+import time
+
+from RAMPAGE.ScoringServer import ScoringServer
+from classifiers.LSTM import LSTMExample
+from classifiers.CNN import CNNExample
+from classifiers.baseline import BaselineExample
+
+
+def main():
+    """
+    Load the trained example classifiers in a local scoring server and query it
+    with concurrent single-domain clients over localhost.
+
+    Run from the examples/ directory after main.py has trained the models:
+    python -m benchmarks.scoringServerBenchmark
+    """
+    # Benchmark configuration
+    NUM_CLIENTS = 64
+    REQUESTS_PER_CLIENT = 200
+    MAX_BATCH_SIZE = 1024
+    MAX_LATENCY = 0.005
+
+    classifiers = {
+        classifier_class.__name__: classifier_class()
+        for classifier_class in [LSTMExample, CNNExample, BaselineExample]
+    }
+
+    for name in classifiers:
+        server = ScoringServer({name: classifiers[name]}, MAX_BATCH_SIZE, MAX_LATENCY)
+        elapsed = asyncio.run(run_clients(server, name, NUM_CLIENTS, REQUESTS_PER_CLIENT))
+
+        print(f"\nClassifier: {name}")
+        print("-" * 40)
+        print(f"  wall time (s): {elapsed:.3f}")
+        print(server.get_stats())
+    print()
+
+
+async def run_clients(server: ScoringServer, name: str, num_clients: int, requests: int) -> float:
+    """
+    Start the server on localhost and run concurrent clients against it.
+
+    Args:
+        server: Scoring server.
+        name: Classifier to query.
+        num_clients: Number of concurrent connections.
+        requests: Requests sent by every client, one at a time.
+
+    Returns:
+        Wall time in seconds.
+    """
+    port = await server.start_tcp("127.0.0.1", 0)
+
+    # Warm-up loads the model outside of the measurement
+    await client(port, name, 1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, name, requests) for _ in range(num_clients)))
+    elapsed = time.perf_counter() - start
+
+    await server.close()
+    return elapsed
+
+
+async def client(port: int, name: str, requests: int) -> None:
+    """
+    Send single-domain requests and wait for every answer before the next one.
+
+    Args:
+        port: Server port.
+        name: Classifier to query.
+        requests: Number of requests.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(requests):
+        domain = "".join(random.choices(string.ascii_lowercase, k=random.randint(6, 20))) + ".com"
+        writer.write(f"{name} {domain}\n".encode())
+        await writer.drain()
+        response = await reader.readline()
+        if response.startswith(b"ERROR"):
+            raise Exception(response.decode())
+    writer.close()
+    await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    main()
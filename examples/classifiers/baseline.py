@@ -1,3 +1,4 @@
+import os
 from typing import Set
 import numpy as np
 import tensorflow as tf
@@ -9,13 +10,15 @@ from tensorflow.keras.layers import (
    Activation,
    Flatten
 )
-from keras.utils import pad_sequences
 from keras.callbacks import ModelCheckpoint
 
 from RAMPAGE.Classifier import Classifier
 from RAMPAGE.Result import Result
+from RAMPAGE.ScoreResult import ScoreResult
 from RAMPAGE.DataElement import DataElement
-from common.resultCommon import ResultCommon
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.DatasetPipeline import DatasetPipeline
+from RAMPAGE.TFLiteModel import TFLiteModel
 from common.commonData import CommonData
 
 
@@ -30,6 +33,7 @@ class BaselineExample(Classifier):
        model_name (str): Name identifier for the model.
        max_length (int): Maximum length of input sequences.
        save_file (str): Path to save the trained model.
+       tflite_file (str): Path to the exported TFLite model.
    """
 
    def __init__(self) -> None:
@@ -38,6 +42,13 @@ class BaselineExample(Classifier):
        self.commonData = CommonData()
        self.max_length = self.commonData.max_length
        self.save_file = f"./classifiers/models/{self.model_name}.keras"
+       self.tflite_file = f"./classifiers/models/{self.model_name}.tflite"
+       self.encoder = DomainEncoder(max_length=self.max_length)
+       self.pipeline = DatasetPipeline(
+           self.encoder,
+           batch_size=self.commonData.batch_size,
+           shuffle_buffer=self.commonData.shuffle_buffer
+       )
        
        self._build_model()
 
@@ -68,28 +79,19 @@ class BaselineExample(Classifier):
            metrics=self.commonData.metrics
        )
 
-   def _prepare_data(self, data: Set[DataElement]) -> tuple[np.ndarray, np.ndarray]:
+   def _prepare_dataset(self, data: Set[DataElement], shuffle: bool = False) -> tf.data.Dataset:
        """
-       Convert domain data to numerical sequences.
+       Build a streaming dataset of numerical sequences.
        
        Args:
            data: Set of DataElement objects.
+           shuffle: Whether to shuffle the elements every epoch.
            
        Returns:
-           tuple: (features, labels) as numpy arrays.
+           tf.data.Dataset of (features, labels) batches.
        """
-       x_data = []
-       y_data = []
-       
-       for element in data:
-           # Convert domain characters to numerical values
-           data_vec = [ord(char) - 33 for char in element.domain]  # 33 is '!'
-           x_data.append(data_vec)
-           y_data.append(1 if element.is_dga else 0)
-       
-       # Pad sequences and convert to numpy arrays
-       x_data = pad_sequences(x_data, padding='post', maxlen=self.max_length)
-       return np.array(x_data, dtype=float), np.array(y_data, dtype=float)
+       # Encode domains as uint8 sequences (ord(char) - 33, post-padded) on the fly
+       return self.pipeline.build(data, shuffle=shuffle)
 
    def train(self, train_set: Set[DataElement], validation_set: Set[DataElement]) -> None:
        """
@@ -99,9 +101,12 @@ class BaselineExample(Classifier):
            train_set: Training dataset.
            validation_set: Validation dataset.
        """
+       # The best model checkpoint is about to change
+       self.commonData.model_registry.invalidate(self.save_file)
+       
        # Prepare training and validation data
-       x_train, y_train = self._prepare_data(train_set)
-       x_val, y_val = self._prepare_data(validation_set)
+       train_data = self._prepare_dataset(train_set, shuffle=True)
+       validation_data = self._prepare_dataset(validation_set)
        
        # Define model checkpoint for saving best model
        checkpoint = ModelCheckpoint(
@@ -115,12 +120,55 @@ class BaselineExample(Classifier):
        
        # Train the model
        self.model.fit(
-           x_train,
-           y_train,
+           train_data,
            epochs=self.commonData.epochs,
            verbose=self.commonData.verbose,
-           validation_data=(x_val, y_val),
-           batch_size=self.commonData.batch_size,
+           validation_data=validation_data,
+           callbacks=[checkpoint]
+       )
+
+   def partial_train(self, new_train_set: Set[DataElement], validation_set: Set[DataElement]) -> None:
+       """
+       Fine-tune the best baseline model on new training data only.
+       
+       Training continues from the best checkpoint with a lower learning rate,
+       and the checkpoint is only replaced if the validation accuracy improves.
+       
+       Args:
+           new_train_set: New training dataset.
+           validation_set: Validation dataset.
+       """
+       if not os.path.exists(self.save_file):
+           self.train(new_train_set, validation_set)
+           return
+       
+       # A private copy of the best model, the registry one is shared with predict
+       self.model = load_model(self.save_file)
+       self.model.optimizer.learning_rate = self.commonData.finetune_learning_rate
+       
+       # Prepare new training and validation data
+       train_data = self._prepare_dataset(new_train_set, shuffle=True)
+       validation_data = self._prepare_dataset(validation_set)
+       best_accuracy = self.model.evaluate(validation_data, verbose=0, return_dict=True)['accuracy']
+       
+       # The best model checkpoint may change
+       self.commonData.model_registry.invalidate(self.save_file)
+       checkpoint = ModelCheckpoint(
+           self.save_file,
+           monitor='val_accuracy',
+           verbose=self.commonData.verbose,
+           save_best_only=True,
+           save_weights_only=False,
+           mode='max',
+           initial_value_threshold=best_accuracy
+       )
+       
+       # Fine-tune the model
+       self.model.fit(
+           train_data,
+           epochs=self.commonData.finetune_epochs,
+           verbose=self.commonData.verbose,
+           validation_data=validation_data,
            callbacks=[checkpoint]
        )
 
@@ -132,25 +180,87 @@ class BaselineExample(Classifier):
            test_set: Test dataset.
            
        Returns:
-           ResultCommon: Object containing evaluation metrics.
-       """
-       # Load the best model
-       best_model = load_model(self.save_file)
-       
-       # Prepare test data
-       x_test, y_test = self._prepare_data(test_set)
-       
-       # Evaluate model
-       scores = best_model.evaluate(x_test, y_test, batch_size=10)
-       
-       # Return metrics
-       return ResultCommon(
-           accuracy=scores[1] * 100,
-           precision=scores[2] * 100,
-           recall=scores[3] * 100,
-           fp=scores[4],
-           fn=scores[5],
-           tp=scores[6],
-           tn=scores[7],
-           auc=scores[8]
-       )
\ No newline at end of file
+           ScoreResult with the evaluation metrics and the raw scores.
+       """
+       # Score the whole test set once, in large batches, and keep the raw scores
+       elements = list(test_set)
+       domains = [element.domain for element in elements]
+       result = ScoreResult(
+           self.encoder.encode_labels(elements), self.predict(domains), domains=domains, elements=elements
+       )
+       
+       if self.commonData.use_tflite:
+           # Compare the exported TFLite model with the Keras one on the test data
+           best_model = self.commonData.model_registry.get(self.save_file)
+           x_test, y_test = self.encoder.prepare(test_set)
+           comparison = self._get_tflite_model().compare(best_model, x_test, y_test, model_path=self.save_file)
+           for name, value in comparison.get_metrics():
+               result.add_metric(name, value)
+       
+       return result
+
+   def predict(self, domains: list[str]) -> np.ndarray:
+       """
+       Score unlabelled domains with the best trained model.
+       
+       Args:
+           domains: Domains to score.
+           
+       Returns:
+           DGA score of every domain as a numpy array.
+       """
+       if self.commonData.use_tflite:
+           # Score with the exported TFLite model instead of Keras
+           return self._get_tflite_model().predict(self.encoder.encode(domains))
+       
+       # Get the best model, shared through the model registry
+       best_model = self.commonData.model_registry.get(self.save_file)
+       
+       x_data = self.encoder.encode(domains)
+       batch_size = self.commonData.predict_batch_size
+       
+       # predict_on_batch avoids the per-call setup cost of predict()
+       scores = np.empty(len(domains), dtype=np.float32)
+       for start in range(0, len(domains), batch_size):
+           end = start + batch_size
+           scores[start:end] = np.ravel(best_model.predict_on_batch(x_data[start:end]))
+       return scores
+
+   def get_model_paths(self) -> list[str]:
+       """
+       Get the files of the model used to score domains.
+       
+       Returns:
+           Path of the TFLite artifact or of the best Keras model, empty if not trained yet.
+       """
+       path = self.tflite_file if self.commonData.use_tflite else self.save_file
+       return [path] if os.path.exists(path) else []
+
+   def load_model(self):
+       """
+       Load a new copy of the model used to score domains from disk, leaving the shared copy as is.
+       
+       Returns:
+           The loaded TFLite or Keras model.
+       """
+       if self.commonData.use_tflite:
+           return self.commonData.tflite_registry.loader(self.tflite_file)
+       return self.commonData.model_registry.loader(self.save_file)
+
+   def _get_tflite_model(self) -> TFLiteModel:
+       """
+       Get the TFLite model, exporting the best Keras model first if needed.
+       
+       Returns:
+           TFLiteModel shared through the TFLite registry.
+       """
+       # Export again whenever the Keras checkpoint is newer than the artifact
+       if (not os.path.exists(self.tflite_file)
+               or os.path.getmtime(self.tflite_file) < os.path.getmtime(self.save_file)):
+           TFLiteModel.export(
+               self.commonData.model_registry.get(self.save_file),
+               self.tflite_file,
+               self.max_length,
+               quantize=self.commonData.tflite_quantize
+           )
+       return self.commonData.tflite_registry.get(self.tflite_file)
\ No newline at end of file
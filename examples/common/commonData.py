@@ -7,6 +7,15 @@ from tensorflow.keras.metrics import (
     TrueNegatives,
     AUC
 )
+from tensorflow.keras.models import load_model
+
+from RAMPAGE.ModelRegistry import ModelRegistry
+from RAMPAGE.TFLiteModel import TFLiteModel
+
+
+# Trained models shared by every classifier in the process
+MODEL_REGISTRY = ModelRegistry(load_model, max_bytes=2 * 1024 ** 3)
+TFLITE_REGISTRY = ModelRegistry(TFLiteModel, max_bytes=2 * 1024 ** 3)
 
 
 class CommonData:
@@ -18,19 +27,39 @@ class CommonData:
 
     Attributes:
         epochs (int): Number of training epochs.
+        finetune_epochs (int): Number of epochs of an incremental update (partial_train).
+        finetune_learning_rate (float): Learning rate of an incremental update.
         max_length (int): Maximum length for domain name sequences.
         batch_size (int): Size of batches for training.
+        predict_batch_size (int): Size of batches for scoring unlabelled domains.
+        shuffle_buffer (int): Number of elements held in the training shuffle buffer.
+        bucket_boundaries (list): Inclusive upper lengths of the buckets used with length bucketing.
         verbose (int): Verbosity level for training output (0: silent, 1: progress bar, 2: one line per epoch).
         metrics (list): List of metrics to track during training and evaluation.
+        model_registry (ModelRegistry): Shared registry used to load trained models.
+        use_tflite (bool): Whether to export trained models to TFLite, score with them and compare them with Keras.
+        tflite_quantize (bool): Whether the TFLite export applies dynamic-range int8 quantization.
+        tflite_registry (ModelRegistry): Shared registry used to load exported TFLite models.
     """
 
     def __init__(self) -> None:
         """Initialize CommonData with default configuration values."""
         # Training parameters
         self.epochs = 1
+        self.finetune_epochs = 1
+        self.finetune_learning_rate = 0.0001
         self.max_length = 70  # Maximum domain name length
         self.batch_size = 50
+        self.predict_batch_size = 8192
+        self.shuffle_buffer = 10000
+        self.bucket_boundaries = [12, 16, 20, 25, 32, 45, self.max_length]
         self.verbose = 1
+        self.model_registry = MODEL_REGISTRY
+
+        # TFLite inference
+        self.use_tflite = False
+        self.tflite_quantize = True
+        self.tflite_registry = TFLITE_REGISTRY
 
         # Metrics configuration
         self.metrics = [
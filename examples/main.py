@@ -1,5 +1,6 @@
 from RAMPAGE.Framework import Framework
 from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.NGramClassifier import NGramClassifier
 
 from classifiers.LSTM import LSTMExample
 from classifiers.CNN import CNNExample
@@ -77,7 +78,8 @@ def run_classifiers(framework: Framework) -> None:
     classifier_classes = [
         LSTMExample,
         CNNExample,
-        BaselineExample
+        BaselineExample,
+        NGramClassifier  # Fast NumPy reference point
     ]
     
     # Initialize and add classifiers to framework
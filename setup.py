@@ -5,7 +5,12 @@ setup(
     version="1.0",                     # The version of your package
     packages=find_packages(),          # Automatically finds sub-packages
     install_requires=[                 # Dependencies required for your package
+        "numpy",
     ],
+    entry_points={                     # Console script and built-in classifier plugins
+        "console_scripts": ["rampage = RAMPAGE.CommandLine:main"],
+        "rampage.classifiers": ["NGramClassifier = RAMPAGE.NGramClassifier:NGramClassifier"],
+    },
     author="Tomas Pelayo Benedet",                # The author of the package
     author_email="tpelayo@unizar.es", # Author's email
     description="A short description of your package",
@@ -0,0 +1,53 @@
+import random
+import string
+
+import numpy as np
+import pytest
+
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.DataElement import DataElement
+
+
+SYLLABLES = ["ba", "co", "de", "fi", "go", "la", "ma", "ne", "ri", "so", "ta", "ve", "news", "shop", "mail"]
+ALPHABET = string.ascii_lowercase + string.digits
+TLDS = ["com", "net", "org", "es", "info"]
+
+
+def generate_elements(count: int, seed: int = 0) -> list[DataElement]:
+    """
+    Generate random DGA-like and word-like domains, alternating.
+
+    Args:
+        count (int): Number of domains to generate.
+        seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Returns:
+        list[DataElement]: Labelled data elements, odd positions are DGA.
+    """
+    rng = random.Random(seed)
+    elements = []
+    for index in range(count):
+        if index % 2:
+            name = "".join(rng.choices(ALPHABET, k=rng.randint(8, 30)))
+        else:
+            name = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 6)))
+        elements.append(DataElement(f"{name}.{rng.choice(TLDS)}", bool(index % 2)))
+    return elements
+
+
+class FixedScorer(Classifier):
+    """A classifier with a fixed score per domain."""
+
+    def __init__(self, scores: dict[str, float], model_name: str = None) -> None:
+        self.scores = scores
+        if model_name is not None:
+            self.model_name = model_name
+
+    def predict(self, domains: list[str]) -> np.ndarray:
+        return np.array([self.scores[domain] for domain in domains], dtype=np.float32)
+
+
+@pytest.fixture
+def toy_sets() -> tuple[list[DataElement], list[DataElement], list[DataElement]]:
+    """Small train, validation and test sets of separable DGA-like and word-like domains."""
+    return generate_elements(4000, seed=1), generate_elements(1000, seed=2), generate_elements(1000, seed=3)
@@ -0,0 +1,60 @@
+import pytest
+
+from RAMPAGE import BloomFilter as bloom_module
+from RAMPAGE.BloomFilter import BloomFilter
+from conftest import generate_elements
+
+
+def test_no_false_negatives_and_bounded_false_positives():
+    members = [f"member{index}.com" for index in range(20000)]
+    others = [f"other{index}.net" for index in range(20000)]
+    bloom_filter = BloomFilter(len(members), false_positive_rate=0.01)
+    bloom_filter.add(members)
+
+    assert bloom_filter.contains(members).all()
+    assert bloom_filter.contains(others).mean() < 0.02
+
+
+def test_from_data_skips_dga_domains():
+    elements = generate_elements(200)
+    bloom_filter = BloomFilter.from_data(elements)
+    benign = [element.domain for element in elements if not element.is_dga]
+    assert bloom_filter.capacity == len(benign)
+    assert bloom_filter.contains(benign).all()
+
+
+def test_from_file_parses_labels(tmp_path):
+    path = tmp_path / "allowlist.txt"
+    path.write_text("plain.com\n\nbenign.com;False\nzero.com;0\ndga.com;True\none.com;1\n")
+    bloom_filter = BloomFilter.from_file(str(path), batch_size=2)
+    assert bloom_filter.contains(["plain.com", "benign.com", "zero.com"]).all()
+    assert not bloom_filter.contains(["dga.com", "one.com"]).any()
+
+
+def test_from_file_rejects_unknown_labels(tmp_path):
+    path = tmp_path / "allowlist.txt"
+    path.write_text("benign.com;__import__('os')\n")
+    with pytest.raises(Exception, match="Wrong label"):
+        BloomFilter.from_file(str(path))
+
+
+def test_add_hashes_in_batches(monkeypatch):
+    domains = [f"domain{index}.org" for index in range(1000)]
+    whole = BloomFilter(len(domains))
+    whole.add(domains)
+
+    monkeypatch.setattr(bloom_module, "BATCH_SIZE", 64)
+    batched = BloomFilter(len(domains))
+    batched.add(domains)
+    assert (batched._bits == whole._bits).all()
+
+
+def test_save_and_load(tmp_path):
+    bloom_filter = BloomFilter(100)
+    bloom_filter.add(["bücher.de", "example.com"])
+    path = str(tmp_path / "allowlist.npz")
+    bloom_filter.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert loaded.contains(["bücher.de", "example.com"]).all()
+    assert (loaded._bits == bloom_filter._bits).all()
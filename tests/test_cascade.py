@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.Cascade import Cascade
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.ScoreResult import ScoreResult
+from conftest import FixedScorer
+
+
+CHEAP = {"a.com": 0.05, "b.com": 0.5, "c.com": 0.95, "d.com": 0.4}
+EXPENSIVE = {"a.com": 0.0, "b.com": 0.9, "c.com": 1.0, "d.com": 0.1}
+
+
+class CountingScorer(FixedScorer):
+    """A fixed scorer that records the domains it is asked to score."""
+
+    def __init__(self, scores: dict[str, float]) -> None:
+        super().__init__(scores)
+        self.seen = []
+
+    def predict(self, domains: list[str]) -> np.ndarray:
+        self.seen.extend(domains)
+        return super().predict(domains)
+
+
+def test_only_uncertain_domains_reach_the_next_stage():
+    expensive = CountingScorer(EXPENSIVE)
+    cascade = Cascade([FixedScorer(CHEAP), expensive], [(0.1, 0.9)])
+
+    scores, decided_by, reached, _ = cascade.run(list(CHEAP))
+    assert expensive.seen == ["b.com", "d.com"]
+    np.testing.assert_allclose(scores, [0.05, 0.9, 0.95, 0.1])
+    assert decided_by.tolist() == [0, 1, 0, 1]
+    assert reached == [4, 2]
+
+
+def test_reports_the_traffic_of_every_stage():
+    cascade = Cascade([FixedScorer(CHEAP), FixedScorer(EXPENSIVE)], [(0.1, 0.9)])
+    labels = {"a.com": False, "b.com": True, "c.com": True, "d.com": False}
+    test_set = [DataElement(domain, is_dga) for domain, is_dga in labels.items()]
+    result = cascade.test(test_set)
+    metrics = dict(result.get_metrics())
+
+    assert metrics["Accuracy"] == 100.0
+    assert metrics["Stage 0 traffic"] == 1.0
+    assert metrics["Stage 1 traffic"] == metrics["Stage 1 decided"] == 0.5
+    # The final scores are kept, so comparisons and curves include the cascade
+    assert isinstance(result, ScoreResult)
+    np.testing.assert_allclose(result.scores, [0.05, 0.9, 0.95, 0.1])
+
+
+def test_thresholds_must_match_the_stages():
+    with pytest.raises(Exception):
+        Cascade([FixedScorer(CHEAP), FixedScorer(EXPENSIVE)], [])
+    with pytest.raises(Exception):
+        Cascade([FixedScorer(CHEAP), FixedScorer(EXPENSIVE)], [(0.9, 0.1)])
+    # A verdict of an early stage could be reversed by the decision threshold
+    with pytest.raises(Exception):
+        Cascade([FixedScorer(CHEAP), FixedScorer(EXPENSIVE)], [(0.6, 0.9)], threshold=0.5)
+    with pytest.raises(Exception):
+        Cascade([FixedScorer(CHEAP), FixedScorer(EXPENSIVE)], [(0.1, 0.5)], threshold=0.5)
+    Cascade([FixedScorer(CHEAP), FixedScorer(EXPENSIVE)], [(0.5, 0.6)], threshold=0.5)
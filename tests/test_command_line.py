@@ -0,0 +1,88 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+from RAMPAGE.ClassifierRegistry import ClassifierRegistry
+from RAMPAGE.CommandLine import CommandLine
+from RAMPAGE.Result import Result
+from conftest import FixedScorer
+
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+
+@pytest.fixture
+def example_config(tmp_path) -> str:
+    """A copy of the example configuration and its sample data, so runs write their output elsewhere."""
+    shutil.copy(os.path.join(EXAMPLES, "rampage.toml"), tmp_path)
+    shutil.copytree(os.path.join(EXAMPLES, "data"), tmp_path / "data")
+    return str(tmp_path / "rampage.toml")
+
+
+def test_registry_imports_lazily():
+    registry = ClassifierRegistry(discover=False)
+    assert registry.get_names() == ["NGramClassifier"]
+    assert registry.get_module("NGramClassifier") == "RAMPAGE.NGramClassifier"
+    assert not registry.is_loaded("NGramClassifier")
+
+    classifier = registry.create("NGramClassifier", epochs=1)
+    assert registry.is_loaded("NGramClassifier")
+    assert classifier.epochs == 1
+
+
+def test_registry_checks_targets():
+    registry = ClassifierRegistry(discover=False)
+    registry.register("Fixed", FixedScorer)
+    assert registry.targets["Fixed"] == "conftest:FixedScorer"
+    assert registry.load("Fixed") is FixedScorer
+
+    with pytest.raises(Exception, match="Wrong classifier target"):
+        registry.register("Broken", "no_class_name")
+    registry.register("NotAClassifier", "RAMPAGE.Result:Result")
+    with pytest.raises(Exception):
+        registry.load("NotAClassifier")
+    with pytest.raises(Exception, match="Unknown classifier"):
+        registry.load("Missing")
+
+
+def test_validate_example_config(capsys):
+    config = os.path.join(EXAMPLES, "rampage.toml")
+    assert CommandLine(ClassifierRegistry(discover=False)).run(["validate", config]) == 0
+    output = capsys.readouterr().out
+    assert "TRAIN     : 1400 domains" in output
+    assert "classifier LSTMExample: classifiers.LSTM found" in output
+    # Checking the plugins must not import them
+    assert "classifiers.LSTM" not in sys.modules
+
+
+def test_run_example_config(example_config, tmp_path, capsys):
+    status = CommandLine(ClassifierRegistry(discover=False)).run(
+        ["run", example_config, "--classifier", "NGramClassifier"]
+    )
+    assert status == 0
+    header = (tmp_path / "results.csv").read_text().splitlines()[0]
+    assert header.startswith("classifier,accuracy,")
+
+
+def test_run_names_repeated_classifiers_apart(tmp_path):
+    config = tmp_path / "rampage.toml"
+    config.write_text(f"""
+[dataset]
+files = ["{EXAMPLES}/data/sample_dga.txt", "{EXAMPLES}/data/sample_non_dga.txt"]
+
+[run]
+output = "results.csv"
+
+[[classifiers]]
+name = "NGramClassifier"
+args = {{ epochs = 1 }}
+
+[[classifiers]]
+name = "NGramClassifier"
+args = {{ epochs = 1, ngram_sizes = [3] }}
+""")
+    assert CommandLine(ClassifierRegistry(discover=False)).run(["run", str(config)]) == 0
+    rows = (tmp_path / "results.csv").read_text().splitlines()[1:]
+    assert [row.split(",")[0] for row in rows] == ["NGramClassifier-0", "NGramClassifier-1"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.Comparison import Comparison
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.ScoreResult import ScoreResult
+from conftest import FixedScorer
+
+
+@pytest.fixture
+def results() -> dict[str, ScoreResult]:
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, 2000)
+    good = np.clip(labels * 0.5 + rng.random(2000) * 0.5, 0, 1)
+    noisy = np.clip(labels * 0.1 + rng.random(2000) * 0.9, 0, 1)
+    return {"good": ScoreResult(labels, good), "noisy": ScoreResult(labels, noisy)}
+
+
+def test_confidence_intervals_contain_the_estimate(results):
+    intervals = Comparison(results, resamples=200, seed=0).confidence_intervals()
+    metrics = dict(intervals["good"].get_metrics())
+    for name in ("Accuracy", "AUC"):
+        assert metrics[f"{name} low"] <= metrics[name] <= metrics[f"{name} high"]
+
+
+def test_paired_tests_detect_the_better_classifier(results):
+    comparison = Comparison(results, resamples=200, seed=0)
+    metrics = dict(comparison.compare("good", "noisy").get_metrics())
+    assert metrics["Accuracy diff"] > 0
+    assert metrics["McNemar p-value"] < 0.01
+    assert metrics["Accuracy p-value"] < 0.05
+
+
+def test_same_classifier_is_not_different(results):
+    comparison = Comparison({"a": results["good"], "b": results["good"]}, resamples=200, seed=0)
+    assert comparison.mcnemar("a", "b") == (0.0, 1.0)
+
+
+def test_seed_is_reproducible(results):
+    first = Comparison(results, resamples=100, seed=3).confidence_intervals()["good"].get_metrics()
+    second = Comparison(results, resamples=100, seed=3).confidence_intervals()["good"].get_metrics()
+    assert first == second
+
+
+def test_unknown_name(results):
+    with pytest.raises(Exception):
+        Comparison(results, resamples=10).mcnemar("good", "missing")
+
+
+def test_framework_keeps_instances_of_one_class():
+    manager = DatasetManager()
+    manager.test_set.update([DataElement("a.com", False), DataElement("b.com", True), DataElement("c.com", True)])
+    framework = Framework()
+    framework.set_dataset_manager(manager)
+    framework.add_classifier(FixedScorer({"a.com": 0.1, "b.com": 0.9, "c.com": 0.8}))
+    framework.add_classifier(FixedScorer({"a.com": 0.9, "b.com": 0.1, "c.com": 0.2}, model_name="inverted"))
+    framework.add_classifier(FixedScorer({"a.com": 0.2, "b.com": 0.7, "c.com": 0.6}))
+    framework.evaluate()
+
+    comparison = framework.compare_classifiers(resamples=10, seed=0)
+    assert list(comparison.results) == ["FixedScorer-0", "inverted", "FixedScorer-2"]
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.ConfusionResult import ConfusionResult, METRIC_NAMES
+
+
+def test_metrics():
+    metrics = dict(ConfusionResult(tp=40, tn=45, fp=5, fn=10, auc=0.9).get_metrics())
+    assert list(metrics) == list(METRIC_NAMES)
+    assert metrics["Accuracy"] == pytest.approx(85.0)
+    assert metrics["Precision"] == pytest.approx(40 / 45 * 100)
+    assert metrics["Recall"] == pytest.approx(80.0)
+    assert metrics["FPR"] == pytest.approx(0.1)
+    assert metrics["MCC"] == pytest.approx((40 * 45 - 5 * 10) / np.sqrt(45 * 50 * 50 * 55))
+    assert metrics["Kappa"] == pytest.approx((0.85 - 0.6925) / (1 - 0.6925))
+    assert (metrics["TP"], metrics["TN"], metrics["FP"], metrics["FN"]) == (40, 45, 5, 10)
+    assert isinstance(metrics["TP"], int)
+
+
+def test_empty_matrix_has_zero_metrics():
+    metrics = dict(ConfusionResult(0, 0, 0, 0, 0.0).get_metrics())
+    assert all(value == 0 for value in metrics.values())
+
+
+def test_from_scores_and_auc():
+    labels = np.array([0, 0, 1, 1, 0, 1])
+    scores = np.array([0.1, 0.6, 0.7, 0.4, 0.4, 0.9])
+    result = ConfusionResult.from_scores(labels, scores)
+    assert (result.tp, result.tn, result.fp, result.fn) == (2, 2, 1, 1)
+    # 7 of the 9 (DGA, legitimate) pairs are ordered, one is tied
+    assert result.auc == pytest.approx(7.5 / 9)
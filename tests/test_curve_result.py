@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.CurveResult import CurveResult
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.ScoreResult import ScoreResult
+from conftest import FixedScorer
+
+
+def test_perfect_and_random_curves():
+    labels = np.array([0, 0, 1, 1])
+    perfect = CurveResult.from_scores(labels, np.array([0.1, 0.2, 0.8, 0.9]))
+    assert perfect.roc_auc() == pytest.approx(1.0)
+    assert perfect.average_precision() == pytest.approx(1.0)
+    assert perfect.tpr_at_fpr(0.0) == pytest.approx(1.0)
+
+    inverted = CurveResult.from_scores(labels, np.array([0.9, 0.8, 0.2, 0.1]))
+    assert inverted.roc_auc() == pytest.approx(0.0)
+
+
+def test_auc_matches_score_result():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, 1000)
+    scores = np.clip(labels * 0.3 + rng.random(1000) * 0.7, 0, 1)
+    curve = CurveResult.from_scores(labels, scores)
+    assert curve.roc_auc() == pytest.approx(dict(ScoreResult(labels, scores).get_metrics())["AUC"])
+
+
+def test_threshold_at_fpr_respects_target():
+    rng = np.random.default_rng(1)
+    labels = rng.integers(0, 2, 5000)
+    scores = rng.random(5000) * 0.6 + labels * 0.4
+    result = ScoreResult(labels, scores)
+    at_target = result.at_fpr(0.01)
+    assert dict(at_target.get_metrics())["FPR"] <= 0.01
+
+
+def test_reduced_curve_keeps_exact_points():
+    rng = np.random.default_rng(2)
+    labels = rng.integers(0, 2, 10000)
+    scores = rng.random(10000)
+    curve = CurveResult.from_scores(labels, scores, max_points=100)
+    assert len(curve.thresholds) <= 200
+    assert curve.tps[-1] == labels.sum()
+    assert curve.fps[-1] == len(labels) - labels.sum()
+
+
+def test_wrong_target():
+    curve = CurveResult.from_scores(np.array([0, 1]), np.array([0.2, 0.8]))
+    with pytest.raises(Exception, match="Wrong target false positive rate"):
+        curve.threshold_at_fpr(1.5)
+
+
+def test_compare_curves_keeps_instances_of_one_class():
+    manager = DatasetManager()
+    manager.test_set.update([DataElement("a.com", False), DataElement("b.com", True), DataElement("c.com", True)])
+    good = {"a.com": 0.1, "b.com": 0.9, "c.com": 0.8}
+    bad = {"a.com": 0.9, "b.com": 0.1, "c.com": 0.2}
+
+    framework = Framework()
+    framework.set_dataset_manager(manager)
+    framework.add_classifier(FixedScorer(good))
+    framework.add_classifier(FixedScorer(bad))
+    framework.evaluate()
+
+    metrics = dict(framework.compare_curves().get_metrics())
+    assert metrics["FixedScorer-0 AUC"] == pytest.approx(1.0)
+    assert metrics["FixedScorer-1 AUC"] == pytest.approx(0.0)
+
+
+def test_save_and_load(tmp_path):
+    curve = CurveResult.from_scores(np.array([0, 1, 0, 1]), np.array([0.3, 0.7, 0.4, 0.6]))
+    curve.save(str(tmp_path / "curve.npz"))
+    loaded = CurveResult.load(str(tmp_path / "curve.npz"))
+    assert loaded.get_metrics() == curve.get_metrics()
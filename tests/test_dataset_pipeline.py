@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from RAMPAGE.DatasetPipeline import DatasetPipeline
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.SpilledSplit import SpilledSplit
+from conftest import generate_elements
+
+
+def collect(dataset) -> tuple[np.ndarray, np.ndarray]:
+    batches = list(dataset.as_numpy_iterator())
+    return np.concatenate([x_data for x_data, _ in batches]), np.concatenate([y_data for _, y_data in batches])
+
+
+def test_streams_every_element_in_order():
+    elements = generate_elements(1000)
+    encoder = DomainEncoder(max_length=32)
+    dataset = DatasetPipeline(encoder, batch_size=64, chunk_size=100).build(elements)
+
+    assert dataset.cardinality().numpy() == 16
+    x_data, y_data = collect(dataset)
+    expected_x, expected_y = encoder.prepare(elements)
+    np.testing.assert_array_equal(x_data, expected_x)
+    np.testing.assert_array_equal(y_data, expected_y)
+
+
+def test_shuffle_keeps_every_element():
+    elements = generate_elements(500)
+    encoder = DomainEncoder(max_length=32)
+    x_data, y_data = collect(DatasetPipeline(encoder, batch_size=50, chunk_size=64, seed=1).build(elements, shuffle=True))
+
+    expected_x, expected_y = encoder.prepare(elements)
+    assert sorted(map(bytes, x_data)) == sorted(map(bytes, expected_x))
+    assert y_data.sum() == expected_y.sum()
+
+
+def test_spilled_split_streams_the_same_batches(tmp_path):
+    elements = generate_elements(300)
+    pipeline = DatasetPipeline(DomainEncoder(max_length=32), batch_size=40, chunk_size=64)
+    spilled = SpilledSplit.spill(elements, str(tmp_path), "train")
+
+    memory_x, memory_y = collect(pipeline.build(elements))
+    spilled_x, spilled_y = collect(pipeline.build(spilled))
+    np.testing.assert_array_equal(memory_x, spilled_x)
+    np.testing.assert_array_equal(memory_y, spilled_y)
+
@@ -0,0 +1,89 @@
+import struct
+
+import pytest
+
+from RAMPAGE.DnsQueryReader import DnsQueryReader
+
+
+LOGS = {
+    "bind": "client @0x7f01 192.0.2.1#53000 ({name}): query: {name} IN A +E(0)K (192.0.2.53)\n",
+    "dnsmasq": "Oct 19 10:00:00 dnsmasq[1234]: query[A] {name} from 192.0.2.1\n",
+    "unbound": "[1700000000] unbound[1234:0] info: 192.0.2.1 {name}. A IN\n",
+    "plain": "{name}\n",
+}
+NAMES = ["Example.COM", "kq3vx9zt.net", "example.com", "mail.example.org"]
+
+
+def write_log(path, log_format: str) -> str:
+    path.write_text("".join(LOGS[log_format].format(name=name) for name in NAMES), encoding="utf-8")
+    return str(path)
+
+
+def dns_packet(name: str, response: bool = False, port: int = 53) -> bytes:
+    question = b"".join(bytes([len(label)]) + label.encode() for label in name.split(".")) + b"\0\0\1\0\1"
+    dns = struct.pack(">HHHHHH", 1, 0x8180 if response else 0x0100, 1, 0, 0, 0) + question
+    udp = struct.pack(">HHHH", 40000, port, 8 + len(dns), 0) + dns
+    ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(udp), 0, 0, 64, 17, 0, bytes(4), bytes(4)) + udp
+    return bytes(6) + bytes(6) + b"\x08\x00" + ip
+
+
+def write_pcap(path, packets: list[bytes]) -> str:
+    data = struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)
+    for packet in packets:
+        data += struct.pack("<IIII", 0, 0, len(packet), len(packet)) + packet
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("log_format", LOGS)
+def test_logs_are_detected_and_deduplicated(tmp_path, log_format):
+    path = write_log(tmp_path / "queries.log", log_format)
+    # A tiny chunk size splits lines across chunks
+    names = [name for batch in DnsQueryReader(chunk_size=16).read_domains(path) for name in batch]
+    assert names == ["example.com", "kq3vx9zt.net", "mail.example.org"]
+
+    names = [name for batch in DnsQueryReader(log_format, deduplicate=False).read_domains(path) for name in batch]
+    assert len(names) == 4
+
+
+def test_pcap_questions(tmp_path):
+    packets = [
+        dns_packet("Example.com"),
+        dns_packet("example.com", response=True),
+        dns_packet("kq3vx9zt.net", response=True),
+        dns_packet("other.org", port=80),
+        dns_packet("truncated.org")[:50],
+    ]
+    path = write_pcap(tmp_path / "capture.pcap", packets)
+
+    reader = DnsQueryReader(queries_only=True, chunk_size=64, batch_size=1)
+    assert [name for batch in reader.read_domains(path) for name in batch] == ["example.com"]
+    assert dict(reader.get_stats().get_metrics())["Malformed"] == 1
+
+    names = [name for batch in DnsQueryReader().read_domains(path) for name in batch]
+    assert names == ["example.com", "kq3vx9zt.net"]
+
+
+def test_wrong_captures_and_formats(tmp_path):
+    path = tmp_path / "capture.pcapng"
+    path.write_bytes(b"\x0a\x0d\x0d\x0a" + bytes(28))
+    with pytest.raises(Exception):
+        list(DnsQueryReader().read_domains(str(path)))
+    with pytest.raises(Exception):
+        DnsQueryReader("syslog")
+
+
+def test_labelled_elements(tmp_path):
+    dga_path = tmp_path / "dga.txt"
+    dga_path.write_text("KQ3VX9ZT.net;True\n", encoding="utf-8")
+    benign_path = tmp_path / "benign.txt"
+    benign_path.write_text("example.com\n", encoding="utf-8")
+    reader = DnsQueryReader(dga_path=str(dga_path), benign_path=str(benign_path))
+
+    elements = list(reader.read_elements(write_log(tmp_path / "queries.log", "dnsmasq")))
+    assert [(element.domain, element.is_dga) for element in elements] == [("example.com", False), ("kq3vx9zt.net", True)]
+    metrics = dict(reader.get_stats().get_metrics())
+    assert (metrics["Names"], metrics["Unique"], metrics["DGA"], metrics["Benign"]) == (4, 3, 1, 1)
+
+    reader.reset()
+    assert len(list(reader.read_elements(write_log(tmp_path / "queries.log", "dnsmasq")))) == 2
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.DomainEncoder import DomainEncoder
+from conftest import generate_elements
+
+
+def reference_encode(domains: list[str], max_length: int) -> np.ndarray:
+    """The per-character encoding of the example classifiers: ord - 33, pre-truncated, post-padded."""
+    output = np.zeros((len(domains), max_length), dtype=np.uint8)
+    for row, domain in enumerate(domains):
+        codes = [ord(char) - 33 for char in domain][-max_length:]
+        output[row, :len(codes)] = [code if 0 <= code <= 255 else 0 for code in codes]
+    return output
+
+
+def test_matches_the_per_character_encoding():
+    domains = [element.domain for element in generate_elements(500)] + ["", "a" * 100, "bücher.de", "例え.jp"]
+    np.testing.assert_array_equal(DomainEncoder(max_length=40).encode(domains), reference_encode(domains, 40))
+
+
+def test_post_truncation_and_alphabet():
+    encoder = DomainEncoder(max_length=4, alphabet="abc", truncating="post", dtype=np.int32, unknown_value=9)
+    np.testing.assert_array_equal(encoder.encode(["abcab", "cz"]), [[1, 2, 3, 1], [3, 9, 0, 0]])
+
+
+def test_encode_buffer_matches_encode():
+    domains = [element.domain for element in generate_elements(100)]
+    encoder = DomainEncoder(max_length=32)
+    buffer = "".join(f"{domain}\n" for domain in domains).encode("ascii")
+    np.testing.assert_array_equal(encoder.encode_buffer(buffer), encoder.encode(domains))
+    assert encoder.encode([]).shape == (0, 32)
+
+
+def test_encode_utf8_keeps_every_domain():
+    encoder = DomainEncoder(max_length=16, offset=0, truncating="post")
+    domains = ["a.com", "bücher.de", ""]
+    codes, lengths = encoder.encode_utf8(domains)
+    assert codes.shape == (3, 16)
+    assert lengths.tolist() == [5, 10, 0]
+    assert bytes(codes[1, :10]) == "bücher.de".encode("utf-8")
+    np.testing.assert_array_equal(codes[[0, 2]], encoder.encode(["a.com", ""]))
+    assert encoder.encode_utf8([])[0].shape == (0, 16)
+
+
+def test_prepare_keeps_labels_aligned():
+    elements = generate_elements(20)
+    x_data, y_data = DomainEncoder(max_length=16).prepare(elements)
+    assert x_data.shape == (20, 16)
+    assert y_data.tolist() == [int(element.is_dga) for element in elements]
+
+
+def test_fingerprint_depends_on_the_encoding():
+    assert DomainEncoder().get_fingerprint() == DomainEncoder().get_fingerprint()
+    assert DomainEncoder().get_fingerprint() != DomainEncoder(max_length=71).get_fingerprint()
+    assert DomainEncoder().get_fingerprint() != DomainEncoder(truncating="post").get_fingerprint()
+
+
+def test_wrong_arguments():
+    with pytest.raises(Exception):
+        DomainEncoder(truncating="middle")
+    with pytest.raises(Exception):
+        DomainEncoder(dtype=np.float32)
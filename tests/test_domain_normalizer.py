@@ -0,0 +1,72 @@
+import pytest
+
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.DomainNormalizer import DomainNormalizer
+
+
+SUFFIXES = """// A few rules of the Public Suffix List
+com
+uk
+co.uk
+jp
+kawasaki.jp
+*.kawasaki.jp
+!city.kawasaki.jp
+公司.cn
+cn
+"""
+
+
+@pytest.fixture
+def normalizer(tmp_path) -> DomainNormalizer:
+    path = tmp_path / "public_suffix_list.dat"
+    path.write_text(SUFFIXES, encoding="utf-8")
+    return DomainNormalizer(str(path))
+
+
+def test_normalize():
+    normalizer = DomainNormalizer()
+    assert normalizer.normalize(" Example.COM. ") == "example.com"
+    assert normalizer.normalize("Bücher.de") == "xn--bcher-kva.de"
+    assert normalizer.normalize_batch(["A.com", "b.NET.", " c.org"]) == ["a.com", "b.net", "c.org"]
+    assert normalizer.normalize_batch(["A.com", "Bücher.de"]) == ["a.com", "xn--bcher-kva.de"]
+    assert normalizer.normalize_batch([]) == []
+
+
+@pytest.mark.parametrize("domain, expected", [
+    ("example.com", ("", "example.com", "com")),
+    ("a.b.example.co.uk", ("a.b", "example.co.uk", "co.uk")),
+    ("co.uk", ("", "", "co.uk")),
+    ("b.c.kawasaki.jp", ("", "b.c.kawasaki.jp", "c.kawasaki.jp")),
+    ("www.city.kawasaki.jp", ("www", "city.kawasaki.jp", "kawasaki.jp")),
+    ("shop.xn--55qx5d.cn", ("", "shop.xn--55qx5d.cn", "xn--55qx5d.cn")),
+    ("example.unlisted", ("", "example.unlisted", "unlisted")),
+])
+def test_split(normalizer, domain, expected):
+    assert normalizer.split(domain) == expected
+
+
+def test_split_without_suffix_list():
+    normalizer = DomainNormalizer()
+    assert normalizer.split("a.example.co.uk") == ("a.example", "co.uk", "uk")
+    assert normalizer.get_registrable_domains(["a.example.com"]) == ["example.com"]
+
+
+def test_caches_count_hits(normalizer):
+    for _ in range(3):
+        normalizer.get_suffixes(["a.example.co.uk"])
+    metrics = dict(normalizer.get_stats().get_metrics())
+    assert (metrics["Split hits"], metrics["Split misses"]) == (2, 1)
+    assert metrics["Suffix rules"] == 9
+
+    with pytest.raises(Exception):
+        DomainNormalizer(cache_size=-1)
+
+
+def test_dataset_manager_normalizes_loaded_domains(tmp_path):
+    path = tmp_path / "dataset.txt"
+    path.write_text("WWW.Example.COM.;False\nBücher.de;False\n", encoding="utf-8")
+    dataset_manager = DatasetManager()
+    dataset_manager.set_normalizer(DomainNormalizer())
+    dataset_manager.add_train(str(path))
+    assert {element.domain for element in dataset_manager.get_train()} == {"www.example.com", "xn--bcher-kva.de"}
@@ -0,0 +1,90 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from RAMPAGE.DomainSketch import DomainSketch
+from RAMPAGE.DriftMonitor import DriftMonitor
+from conftest import generate_elements
+
+
+def domains_of(count: int, seed: int, dga: bool) -> list[str]:
+    return [element.domain for element in generate_elements(2 * count, seed) if element.is_dga == dga]
+
+
+def test_estimates_never_undercount():
+    domains = [element.domain for element in generate_elements(2000)]
+    sketch = DomainSketch.from_domains(domains, batch_size=300)
+    counts = Counter(domain[i:i + 2] for domain in domains for i in range(len(domain) - 1))
+
+    estimates = {ngram: sketch.estimate(ngram) for ngram in counts}
+    assert all(estimates[ngram] >= count for ngram, count in counts.items())
+    assert sum(estimates[ngram] == count for ngram, count in counts.items()) > 0.75 * len(counts)
+    assert sketch.domains == 2000
+
+
+def test_merge_and_subtract_are_exact():
+    first = DomainSketch.from_domains(domains_of(500, 1, dga=False))
+    second = DomainSketch.from_domains(domains_of(500, 2, dga=True))
+    merged = DomainSketch.from_domains(domains_of(500, 1, dga=False))
+    merged.merge(second)
+    assert merged.domains == 1000
+
+    merged.subtract(second)
+    np.testing.assert_array_equal(merged.ngram_counts, first.ngram_counts)
+    np.testing.assert_array_equal(merged.tld_counts, first.tld_counts)
+
+    with pytest.raises(Exception):
+        first.merge(DomainSketch(width=1 << 10))
+
+
+def test_divergence_separates_distributions(tmp_path):
+    words = DomainSketch.from_domains(domains_of(2000, 1, dga=False))
+    assert all(value == 0 for _, value in words.divergence(words).get_metrics())
+
+    same = dict(words.divergence(DomainSketch.from_domains(domains_of(2000, 2, dga=False))).get_metrics())
+    other = dict(words.divergence(DomainSketch.from_domains(domains_of(2000, 3, dga=True))).get_metrics())
+    assert other["N-gram JSD"] > 5 * same["N-gram JSD"]
+    assert other["Entropy JSD"] > same["Entropy JSD"]
+
+    path = str(tmp_path / "sketch.npz")
+    words.save(path)
+    loaded = DomainSketch.load(path)
+    np.testing.assert_array_equal(loaded.ngram_counts, words.ngram_counts)
+    assert loaded.top_tlds(3) == words.top_tlds(3)
+
+
+def test_monitor_detects_drift_and_recovers():
+    reference = DomainSketch.from_domains(domains_of(5000, 1, dga=False))
+    monitor = DriftMonitor(reference, window_size=1000, buckets=4, threshold=0.1)
+
+    assert all(not result.get_metrics()[-1][1] for result in monitor.update(domains_of(1000, 2, dga=False)))
+    assert not monitor.is_drifting()
+
+    completed = monitor.update(domains_of(1000, 3, dga=True))
+    assert len(completed) == 4
+    assert monitor.is_drifting()
+    assert monitor.window.domains <= 1000
+
+    monitor.update(domains_of(1000, 4, dga=False))
+    assert not monitor.is_drifting()
+    assert monitor.seen == 3000
+    assert len(monitor.history) == 12
+
+
+def test_wrong_window():
+    with pytest.raises(Exception):
+        DriftMonitor(DomainSketch(), window_size=3, buckets=4)
+
+
+def test_idn_domains_are_summarized_by_utf8_bytes():
+    first = DomainSketch.from_domains(["b中cher.de"])
+    second = DomainSketch.from_domains(["b日cher.de"])
+    assert not np.array_equal(first.ngram_counts, second.ngram_counts)
+    assert first.length_counts[len("b中cher.de".encode("utf-8"))] == 1
+
+    encoded = "b中cher.de".encode("utf-8")
+    expected = -sum(count / len(encoded) * np.log2(count / len(encoded)) for count in Counter(encoded).values())
+    entropy = first._entropies(*first._encoder.encode_utf8(["b中cher.de"]))
+    assert entropy[0] == pytest.approx(expected)
+    assert first.top_tlds(1)[0][0] == "de"
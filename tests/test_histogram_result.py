@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.HistogramResult import HistogramResult
+from RAMPAGE.ScoreResult import ScoreResult
+from conftest import FixedScorer, generate_elements
+
+
+@pytest.fixture
+def scored() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, 5000)
+    return labels, np.clip(labels * 0.3 + rng.random(5000) * 0.7, 0, 1)
+
+
+def test_merged_shards_equal_a_single_pass(scored):
+    labels, scores = scored
+    whole = HistogramResult.from_scores(labels, scores)
+    shards = [HistogramResult.from_scores(labels[start::3], scores[start::3]) for start in range(3)]
+
+    assert HistogramResult.merge_all(shards).get_metrics() == whole.get_metrics()
+    assert HistogramResult.merge_all(shards[::-1]).get_metrics() == whole.get_metrics()
+
+
+def test_metrics_match_the_exact_ones(scored):
+    labels, scores = scored
+    histogram = dict(HistogramResult.from_scores(labels, scores).get_metrics())
+    exact = dict(ScoreResult(labels, scores).get_metrics())
+    for name in ("TP", "TN", "FP", "FN", "Accuracy", "MCC"):
+        assert histogram[name] == exact[name]
+    assert histogram["AUC"] == pytest.approx(exact["AUC"], abs=1e-3)
+
+
+def test_save_load_and_mismatched_merge(scored, tmp_path):
+    labels, scores = scored
+    result = HistogramResult.from_scores(labels, scores, bins=64)
+    path = str(tmp_path / "shard.npz")
+    result.save(path)
+    assert HistogramResult.load(path).get_metrics() == result.get_metrics()
+
+    with pytest.raises(Exception):
+        result.merge(HistogramResult.from_scores(labels, scores, bins=128))
+    with pytest.raises(Exception):
+        result.merge(HistogramResult.from_scores(labels, scores, threshold=0.3, bins=64))
+
+
+def test_framework_shards_cover_the_test_split():
+    elements = generate_elements(500)
+    framework = Framework()
+    framework.set_dataset_manager(DatasetManager())
+    framework.dataset_manager.test_set = set(elements)
+    framework.add_classifier(FixedScorer({element.domain: 0.2 + 0.6 * element.is_dga for element in elements}))
+
+    merged = HistogramResult.merge_all(framework.evaluate_shard(0, shard, 4) for shard in range(4))
+    assert merged.tp + merged.tn + merged.fp + merged.fn == 500
+    assert dict(merged.get_metrics())["Accuracy"] == 100.0
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.InferenceBenchmark import InferenceBenchmark
+from RAMPAGE.NGramClassifier import NGramClassifier
+from conftest import generate_elements
+
+
+def metrics(result) -> dict:
+    return dict(result.get_metrics())
+
+
+def test_reports_every_batch_size(toy_sets):
+    train, validation, test = toy_sets
+    classifier = NGramClassifier(epochs=1, seed=0)
+    classifier.train(train, validation)
+
+    result = metrics(InferenceBenchmark(batch_sizes=(1, 8), warmup=1, repeats=3).run(
+        classifier, [element.domain for element in test]
+    ))
+    for size in (1, 8):
+        assert result[f"B{size} p50 ms"] <= result[f"B{size} p99 ms"]
+        assert result[f"B{size} domains/s"] > 0
+    # Never saved, so there is nothing to measure on disk
+    assert result["Model bytes"] == 0
+    assert math.isnan(result["Load s"])
+
+
+def test_load_does_not_revert_unsaved_training(toy_sets, tmp_path):
+    train, validation, test = toy_sets
+    classifier = NGramClassifier(epochs=1, seed=0)
+    classifier.train(train, validation)
+    classifier.save(str(tmp_path / "ngram"))
+    classifier.partial_train(generate_elements(2000, seed=4), [])
+    weights, bias = classifier.weights.copy(), classifier.bias
+
+    result = metrics(InferenceBenchmark(batch_sizes=(4,), warmup=0, repeats=2, load_repeats=2).run(
+        classifier, [element.domain for element in test]
+    ))
+    assert result["Model bytes"] > 0
+    assert result["Load s"] >= 0
+    assert np.array_equal(classifier.weights, weights)
+    assert classifier.bias == bias
+
+
+def test_load_model_without_saved_model():
+    with pytest.raises(FileNotFoundError):
+        NGramClassifier().load_model()
+
+
+def test_classifier_without_load_model(tmp_path):
+    class Scorer(Classifier):
+        def predict(self, domains):
+            return np.zeros(len(domains), dtype=np.float32)
+
+        def get_model_paths(self):
+            path = tmp_path / "model.bin"
+            path.write_bytes(b"\0" * 10)
+            return [str(path)]
+
+    result = metrics(InferenceBenchmark(batch_sizes=(2,), warmup=0, repeats=1).run(Scorer(), ["a.com"]))
+    assert result["Model bytes"] == 10
+    assert math.isnan(result["Load s"])
+
+
+@pytest.mark.parametrize("settings", [{"batch_sizes": ()}, {"batch_sizes": (0,)}, {"repeats": 0}, {"warmup": -1}])
+def test_wrong_settings(settings):
+    with pytest.raises(Exception, match="Wrong benchmark settings"):
+        InferenceBenchmark(**settings)
+
+
+def test_no_domains():
+    with pytest.raises(Exception, match="No domains"):
+        InferenceBenchmark().run(NGramClassifier(), [])
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.LengthBucketer import LengthBucketer
+from conftest import generate_elements
+
+
+@pytest.fixture
+def bucketer() -> LengthBucketer:
+    return LengthBucketer(DomainEncoder(max_length=32), [12, 20, 32], batch_size=50)
+
+
+def test_batches_cover_every_domain_once(bucketer):
+    domains = [element.domain for element in generate_elements(1000)]
+    batches = bucketer.batch_indices(domains, shuffle=True, seed=3)
+
+    indices = np.concatenate([indices for indices, _ in batches])
+    assert sorted(indices.tolist()) == list(range(1000))
+    for indices, width in batches:
+        assert len(indices) <= 50
+        assert max(min(len(domains[index]), 32) for index in indices) <= width
+
+
+def test_batches_are_padded_to_their_bucket(bucketer):
+    elements = generate_elements(300)
+    domains = [element.domain for element in elements]
+    encoded = bucketer.encoder.encode(domains)
+    for (indices, width), (x_data, y_data) in zip(bucketer.batch_indices(domains), bucketer.batches(elements)):
+        np.testing.assert_array_equal(x_data, encoded[indices, :width])
+        assert y_data.tolist() == [int(elements[index].is_dga) for index in indices]
+
+
+def test_padding_stats(bucketer):
+    metrics = dict(bucketer.padding_stats([element.domain for element in generate_elements(500)]).get_metrics())
+    assert metrics["Bucketed cells"] < metrics["Fixed cells"]
+    assert 0 <= metrics["Bucketed waste"] < metrics["Fixed waste"]
+
+
+def test_wrong_boundaries():
+    with pytest.raises(Exception):
+        LengthBucketer(DomainEncoder(max_length=32), [20, 12, 32])
+    with pytest.raises(Exception):
+        LengthBucketer(DomainEncoder(max_length=32), [12, 20])
+
+
+def test_bucketed_pipeline_batches():
+    pytest.importorskip("tensorflow")
+    from RAMPAGE.DatasetPipeline import DatasetPipeline
+
+    encoder = DomainEncoder(max_length=32)
+    bucketer = LengthBucketer(encoder, [12, 20, 32], batch_size=50)
+    dataset = DatasetPipeline(encoder, batch_size=50, chunk_size=64, bucketer=bucketer).build(generate_elements(400))
+
+    count = 0
+    for x_data, y_data in dataset.as_numpy_iterator():
+        assert x_data.shape[1] in (12, 20, 32)
+        assert len(x_data) == len(y_data) <= 50
+        count += len(x_data)
+    assert count == 400
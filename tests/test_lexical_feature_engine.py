@@ -0,0 +1,103 @@
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.LexicalFeatureEngine import LexicalFeatureEngine
+from conftest import generate_elements
+
+
+def entropy(domain) -> float:
+    return -sum(count / len(domain) * math.log2(count / len(domain)) for count in Counter(domain).values())
+
+
+@pytest.fixture
+def elements():
+    return generate_elements(300)
+
+
+def test_features_match_per_domain_values(elements):
+    engine = LexicalFeatureEngine(names=["length", "entropy", "vowel_ratio", "digit_ratio", "tld"], batch_size=64)
+    columns = engine.compute(elements)
+
+    domains = [element.domain for element in elements]
+    assert columns["length"].tolist() == [len(domain) for domain in domains]
+    np.testing.assert_allclose(columns["entropy"], [entropy(domain) for domain in domains], rtol=1e-5)
+    np.testing.assert_allclose(
+        columns["vowel_ratio"], [sum(char in "aeiou" for char in domain) / len(domain) for domain in domains], rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        columns["digit_ratio"], [sum(char.isdigit() for char in domain) / len(domain) for domain in domains], rtol=1e-6
+    )
+    tlds = [domain.rsplit(".", 1)[1] for domain in domains]
+    # One distinct hash per top-level domain
+    assert len(set(zip(tlds, columns["tld"].tolist()))) == len(set(columns["tld"].tolist())) == len(set(tlds))
+
+
+def test_familiarity_separates_word_like_domains(elements):
+    engine = LexicalFeatureEngine(names=["ngram_familiarity"])
+    with pytest.raises(Exception):
+        engine.compute(elements)
+
+    engine.fit(generate_elements(2000, seed=1))
+    familiarity = engine.compute(elements)["ngram_familiarity"]
+    labels = np.array([element.is_dga for element in elements])
+    assert familiarity[~labels].mean() > familiarity[labels].mean()
+
+
+def test_cache_does_not_depend_on_the_order(elements, tmp_path):
+    engine = LexicalFeatureEngine(names=["length", "entropy"], cache_dir=str(tmp_path))
+    first = engine.compute(elements)
+    shuffled = engine.compute(elements[::-1])
+    np.testing.assert_array_equal(shuffled["entropy"], first["entropy"][::-1])
+
+    reloaded = LexicalFeatureEngine(names=["length", "entropy"], cache_dir=str(tmp_path)).compute(elements)
+    np.testing.assert_array_equal(reloaded["length"], first["length"])
+    assert dict(engine.get_stats().get_metrics())["Hits"] == 1
+
+
+def test_registered_features_and_matrix(elements):
+    engine = LexicalFeatureEngine(names=["length", "dots"])
+    engine.register("dots", lambda codes, lengths: (codes == ord(".")).sum(axis=1), np.uint8)
+    columns = engine.compute(elements)
+    assert (columns["dots"] == 1).all()
+    assert engine.to_matrix(columns).shape == (len(elements), 2)
+
+    with pytest.raises(Exception):
+        LexicalFeatureEngine(names=["missing"]).compute(elements)
+
+
+def test_idn_domains_are_read_as_utf8_bytes(tmp_path):
+    domains = ["b中cher.de", "b日cher.de", "bcher.de", "bücher.de"]
+    elements = [DataElement(domain, False) for domain in domains]
+    engine = LexicalFeatureEngine(names=["length", "entropy", "tld"], cache_dir=str(tmp_path))
+    columns = engine.compute(elements)
+
+    encoded = [domain.encode("utf-8") for domain in domains]
+    assert columns["length"].tolist() == [len(domain) for domain in encoded]
+    np.testing.assert_allclose(columns["entropy"], [entropy(domain) for domain in encoded], rtol=1e-5)
+    assert len(set(columns["entropy"].tolist())) == 3
+
+    # Domains that only differ in a non-ASCII character are different datasets for the cache
+    for domain in domains[:3]:
+        engine.compute([DataElement(domain, False)])
+    assert dict(engine.get_stats().get_metrics())["Hits"] == 0
+
+
+def test_cache_depends_on_the_feature_code(elements, tmp_path):
+    engine = LexicalFeatureEngine(names=["dots"], cache_dir=str(tmp_path))
+    engine.register("dots", lambda codes, lengths: (codes == ord(".")).sum(axis=1), np.uint8)
+    assert (engine.compute(elements)["dots"] == 1).all()
+
+    engine = LexicalFeatureEngine(names=["dots"], cache_dir=str(tmp_path))
+    engine.register("dots", lambda codes, lengths: (codes == ord(".")).sum(axis=1) + 1, np.uint8)
+    assert (engine.compute(elements)["dots"] == 2).all()
+
+    # Captured values are not part of the code, a version tells them apart
+    engine = LexicalFeatureEngine(names=["dots"], cache_dir=str(tmp_path))
+    offset = 2
+    engine.register("dots", lambda codes, lengths: (codes == ord(".")).sum(axis=1) + offset, np.uint8, version="2")
+    assert (engine.compute(elements)["dots"] == 3).all()
+    assert dict(engine.get_stats().get_metrics())["Hits"] == 0
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.MatrixResult import MatrixResult
+from RAMPAGE.NGramClassifier import NGramClassifier
+from RAMPAGE.Result import Result
+from RAMPAGE.ResultStore import ResultStore
+from conftest import generate_elements
+
+
+class FailingClassifier(Classifier):
+    """A classifier whose training fails."""
+
+    def train(self, train_set, validation_set) -> None:
+        raise ValueError("no data")
+
+
+class SharedPathClassifier(Classifier):
+    """A classifier that records how many instances of its class train at once, as if they shared a model file."""
+
+    active = 0
+    most_active = 0
+    guard = threading.Lock()
+
+    def __init__(self, epochs: int = 1) -> None:
+        self.epochs = epochs
+
+    def train(self, train_set, validation_set) -> None:
+        cls = type(self)
+        with cls.guard:
+            cls.active += 1
+            cls.most_active = max(cls.most_active, cls.active)
+        time.sleep(0.05)
+        with cls.guard:
+            cls.active -= 1
+
+    def test(self, test_set) -> Result:
+        return result_of(Accuracy=50.0)
+
+
+def result_of(**metrics) -> Result:
+    result = Result()
+    for name, value in metrics.items():
+        result.add_metric(name, value)
+    return result
+
+
+def test_metrics_best_and_csv():
+    matrix = MatrixResult(["a", "b"], ["x", "y"])
+    matrix.set_cell("a", "x", result_of(Accuracy=90.0), {"train": 2.0})
+    matrix.set_cell("b", "x", result_of(Accuracy=95.0), {"train": 1.0})
+    matrix.set_cell("a", "y", result_of(Accuracy=80.0), {"train": 3.0})
+    matrix.set_cell("b", "y", None, {}, "ValueError: no data")
+
+    accuracy = matrix.get_metric("Accuracy")
+    np.testing.assert_array_equal(accuracy[:, 0], [90.0, 95.0])
+    assert np.isnan(accuracy[1, 1])
+    assert matrix.best("Accuracy") == {"x": ("b", 95.0), "y": ("a", 80.0)}
+    assert matrix.best("train", higher_is_better=False) == {"x": ("b", 1.0), "y": ("a", 3.0)}
+
+    rows = matrix.get_csv_rows(",")
+    assert rows[0] == "classifier,dataset,accuracy,train seconds"
+    assert rows[-1] == "b,y,,"
+    assert "ValueError: no data" in str(matrix)
+
+    with pytest.raises(Exception):
+        matrix.get_result("c", "x")
+
+
+def matrix_framework(tmp_path) -> Framework:
+    framework = Framework()
+    for name, seed in (("first", 1), ("second", 2)):
+        path = tmp_path / f"{name}.txt"
+        path.write_text("".join(f"{element.domain};{element.is_dga}\n" for element in generate_elements(1000, seed)))
+        framework.add_dataset_manager(name, DatasetManager())
+        framework.add_dataset(str(path), random_sets=False)
+    return framework
+
+
+def test_run_matrix(tmp_path):
+    framework = matrix_framework(tmp_path)
+    assert framework.get_dataset_names() == ["first", "second"]
+
+    matrix = framework.run_matrix({"ngram": NGramClassifier, "failing": FailingClassifier}, mode="evaluate", workers=2)
+    assert matrix.datasets == ["first", "second"]
+    assert (matrix.get_metric("Accuracy")[0] > 90).all()
+    assert np.isnan(matrix.get_metric("Accuracy")[1]).all()
+    assert matrix.errors[("failing", "first")] == "ValueError: no data"
+    # The splits are loaded back after sharing their encodings
+    assert len(framework.dataset_managers["first"].get_test()) == 100
+
+    with pytest.raises(Exception):
+        framework.run_matrix({"ngram": NGramClassifier}, datasets=["third"])
+    with pytest.raises(Exception):
+        framework.run_matrix({"ngram": NGramClassifier}, mode="train")
+
+
+def test_exclusive_serializes_rows_of_the_same_class(tmp_path):
+    framework = matrix_framework(tmp_path)
+    # Two rows of one class, e.g. a classifier listed twice with other arguments
+    factories = {"one": SharedPathClassifier, "other": lambda: SharedPathClassifier(epochs=2)}
+    for exclusive in (True, False):
+        SharedPathClassifier.most_active = 0
+        matrix = framework.run_matrix(factories, workers=4, exclusive=exclusive, share_encodings=False)
+        assert not matrix.errors
+        assert (SharedPathClassifier.most_active == 1) == exclusive
+
+
+def test_matrix_runs_are_stored_under_the_row_names(tmp_path):
+    framework = matrix_framework(tmp_path)
+    framework.set_result_store(ResultStore(str(tmp_path / "results.db")))
+    factories = {"NGramClassifier": NGramClassifier, "NGramClassifier-1": lambda: NGramClassifier(ngram_sizes=(3,))}
+    framework.run_matrix(factories, datasets=["first"])
+
+    assert {name for name, _, _ in framework.result_store.leaderboard("Accuracy")} == set(factories)
+    framework.result_store.close()
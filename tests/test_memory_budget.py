@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+resource = pytest.importorskip("resource")
+
+
+# Address space the child may grow by after its imports, well below the in-memory size of the dataset
+HEADROOM = 96 << 20
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAINS = 600_000
+
+# Run in a child process, as the limit cannot be lifted again once lowered
+SCRIPT = textwrap.dedent("""
+    import resource
+    import sys
+    from RAMPAGE.DatasetManager import DatasetManager
+    from RAMPAGE.Framework import Framework
+
+    mode, first, second, spill_dir, headroom = sys.argv[1:]
+    framework = Framework()
+    framework.set_dataset_manager(DatasetManager())
+    if mode == "budget":
+        framework.set_memory_budget(1 << 10, spill_dir)
+    framework.add_train_dataset(first)
+
+    with open("/proc/self/statm") as f:
+        used = int(f.read().split()[0]) * resource.getpagesize()
+    limit = used + int(headroom)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        framework.add_train_dataset(second)
+        train = framework.dataset_manager.get_train()
+        print(len(train), sum(element.is_dga for element in train))
+    # A failed allocation inside eval() may surface as a SystemError
+    except (MemoryError, SystemError):
+        print("MemoryError")
+""")
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory) -> tuple[str, str]:
+    directory = tmp_path_factory.mktemp("dataset")
+    first = directory / "first.txt"
+    first.write_text("".join(f"seed{index}.com;0\n" for index in range(100)))
+    second = directory / "second.txt"
+    with open(second, "w") as f:
+        f.writelines(f"d{index:07d}x{index * 7919 % 100003:05d}.com;{index % 2}\n" for index in range(DOMAINS))
+    return str(first), str(second)
+
+
+def run(mode: str, dataset: tuple[str, str], spill_dir: str) -> str:
+    if not sys.platform.startswith("linux"):
+        pytest.skip("reads /proc/self/statm")
+    process = subprocess.run(
+        [sys.executable, "-c", SCRIPT, mode, *dataset, spill_dir, str(HEADROOM)],
+        capture_output=True, text=True, timeout=600,
+        env={"OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1", "PYTHONPATH": ROOT}
+    )
+    assert process.returncode == 0, process.stderr
+    return process.stdout.strip()
+
+
+def test_dataset_does_not_fit_the_limit_in_memory(dataset, tmp_path):
+    assert run("memory", dataset, str(tmp_path)) == "MemoryError"
+
+
+def test_memory_budget_streams_the_dataset_to_disk(dataset, tmp_path):
+    assert run("budget", dataset, str(tmp_path)) == f"{DOMAINS + 100} {DOMAINS // 2}"
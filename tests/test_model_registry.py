@@ -0,0 +1,79 @@
+import os
+import threading
+
+import pytest
+
+from RAMPAGE.ModelRegistry import ModelRegistry
+
+
+class CountingLoader:
+    """A loader that returns the content of the file and counts its calls."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __call__(self, path: str) -> str:
+        self.calls.append(os.path.basename(path))
+        with open(path) as f:
+            return f.read()
+
+
+@pytest.fixture
+def artifacts(tmp_path) -> list[str]:
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.model"
+        path.write_text(name * 100)
+        paths.append(str(path))
+    return paths
+
+
+def test_loads_once_and_shares_the_model(artifacts):
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+    assert registry.get(artifacts[0]) is registry.get(artifacts[0])
+    assert loader.calls == ["a.model"]
+
+    metrics = dict(registry.get_stats().get_metrics())
+    assert (metrics["Hits"], metrics["Misses"], metrics["Bytes"]) == (1, 1, 100)
+
+
+def test_evicts_the_least_recently_used(artifacts):
+    loader = CountingLoader()
+    registry = ModelRegistry(loader, max_bytes=250)
+    registry.get(artifacts[0])
+    registry.get(artifacts[1])
+    registry.get(artifacts[0])
+    registry.get(artifacts[2])
+
+    registry.get(artifacts[0])
+    registry.get(artifacts[1])
+    assert loader.calls == ["a.model", "b.model", "c.model", "b.model"]
+    assert dict(registry.get_stats().get_metrics())["Evictions"] == 2
+
+
+def test_reloads_changed_and_invalidated_artifacts(artifacts):
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+    registry.get(artifacts[0])
+
+    with open(artifacts[0], "w") as f:
+        f.write("new")
+    stat = os.stat(artifacts[0])
+    os.utime(artifacts[0], (stat.st_atime, stat.st_mtime + 10))
+    assert registry.get(artifacts[0]) == "new"
+
+    registry.invalidate(artifacts[0])
+    registry.get(artifacts[0])
+    assert loader.calls == ["a.model"] * 3
+
+
+def test_concurrent_gets_load_once(artifacts):
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+    threads = [threading.Thread(target=registry.get, args=(artifacts[1],)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == ["b.model"]
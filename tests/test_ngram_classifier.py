@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.NGramClassifier import NGramClassifier
+from RAMPAGE.ScoreResult import ScoreResult
+from RAMPAGE.SpilledSplit import SpilledSplit
+from conftest import generate_elements
+
+
+def accuracy(classifier, elements) -> float:
+    return dict(classifier.test(elements).get_metrics())["Accuracy"]
+
+
+def test_separates_toy_set(toy_sets):
+    train, validation, test = toy_sets
+    classifier = NGramClassifier(epochs=2, seed=0)
+    classifier.train(train, validation)
+
+    assert accuracy(classifier, test) > 95
+    scores = classifier.predict([element.domain for element in test])
+    labels = np.array([element.is_dga for element in test])
+    # Scores spread over both sides of the threshold, not a narrow band
+    assert scores[labels].mean() > 0.8
+    assert scores[~labels].mean() < 0.2
+
+
+def test_train_starts_from_scratch(toy_sets):
+    train, validation, _ = toy_sets
+    classifier = NGramClassifier(epochs=2, seed=0)
+    classifier.train(train, validation)
+    weights, bias = classifier.weights.copy(), classifier.bias
+
+    classifier.train(train, validation)
+    assert np.array_equal(classifier.weights, weights)
+    assert classifier.bias == bias
+
+
+def test_without_validation_keeps_last_epoch(toy_sets):
+    train, _, _ = toy_sets
+    one_epoch = NGramClassifier(epochs=1, seed=0)
+    one_epoch.train(train, [])
+    three_epochs = NGramClassifier(epochs=3, seed=0)
+    three_epochs.train(train, [])
+
+    assert not np.array_equal(one_epoch.weights, three_epochs.weights)
+
+
+def test_partial_train_without_validation_updates(toy_sets):
+    train, validation, _ = toy_sets
+    classifier = NGramClassifier(epochs=1, seed=0)
+    classifier.train(train, validation)
+    weights = classifier.weights.copy()
+
+    classifier.partial_train(generate_elements(1000, seed=7), [])
+    assert not np.array_equal(classifier.weights, weights)
+
+
+def test_partial_train_never_worse_on_validation(toy_sets):
+    train, validation, _ = toy_sets
+    classifier = NGramClassifier(epochs=2, seed=0)
+    classifier.train(train, validation)
+    before = classifier._accuracy(validation)
+
+    # Mislabelled data can only be rejected
+    flipped = [DataElement(element.domain, not element.is_dga) for element in generate_elements(1000, seed=8)]
+    classifier.partial_train(flipped, validation)
+    assert classifier._accuracy(validation) >= before
+
+
+def test_non_ascii_domains_are_hashed_by_bytes():
+    classifier = NGramClassifier()
+    codes, lengths = classifier._encode(["bücher.de", "b中cher.de"])
+    assert lengths.tolist() == [10, 11]
+    # Every byte of the name is kept, none is mapped to the padding value
+    assert (codes[0, :10] != 0).all() and (codes[1, :11] != 0).all()
+
+    features, _ = classifier._features(codes, lengths)
+    assert not np.array_equal(features[:, 0], features[:, 1])
+
+
+def test_scores_idn_and_empty_domains():
+    classifier = NGramClassifier()
+    assert classifier.predict(["bücher.de", ""]).shape == (2,)
+
+
+def test_trains_on_spilled_splits_without_loading_them(toy_sets, tmp_path, monkeypatch):
+    train, validation, test = toy_sets
+    spilled_train = SpilledSplit.spill(train, str(tmp_path), "train")
+    spilled_validation = SpilledSplit.spill(validation, str(tmp_path), "validation")
+
+    def fail(self):
+        raise AssertionError("the split was iterated")
+    monkeypatch.setattr(SpilledSplit, "__iter__", fail)
+
+    classifier = NGramClassifier(epochs=2, seed=0)
+    classifier.train(spilled_train, spilled_validation)
+    classifier.partial_train(spilled_train, spilled_validation)
+    assert accuracy(classifier, test) > 95
+
+
+def test_test_keeps_the_scores(toy_sets):
+    train, validation, test = toy_sets
+    classifier = NGramClassifier(epochs=1, seed=0)
+    classifier.train(train, validation)
+    result = classifier.test(test)
+    assert isinstance(result, ScoreResult)
+    assert len(result.scores) == len(test)
+
+
+def test_save_and_load(toy_sets, tmp_path):
+    train, validation, test = toy_sets
+    classifier = NGramClassifier(ngram_sizes=(1, 3), hash_bits=16, epochs=1, seed=0)
+    classifier.train(train, validation)
+    classifier.save(str(tmp_path / "model"))
+
+    loaded = NGramClassifier.load(str(tmp_path / "model.npz"))
+    assert loaded.ngram_sizes == (1, 3)
+    assert loaded.hash_bits == 16
+    domains = [element.domain for element in test]
+    assert np.allclose(loaded.predict(domains), classifier.predict(domains))
+    assert np.array_equal(loaded._squared_gradients, classifier._squared_gradients)
+
+
+def test_wrong_ngram_sizes():
+    with pytest.raises(Exception, match="Wrong n-gram sizes"):
+        NGramClassifier(ngram_sizes=(5,))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.Framework import Framework
+from conftest import FixedScorer
+
+
+SCORES = {"a.com": 0.25, "b.com": 0.5, "c.com": 0.75}
+
+
+@pytest.fixture
+def framework() -> Framework:
+    framework = Framework()
+    framework.add_classifier(FixedScorer(SCORES))
+    return framework
+
+
+def write_lines(path, lines: list[str]) -> str:
+    path.write_text("".join(f"{line}\n" for line in lines))
+    return str(path)
+
+
+def test_binary_output_keeps_blank_lines_as_nan(framework, tmp_path):
+    path = write_lines(tmp_path / "domains.txt", ["a.com", "", "b.com;1", "  ", "c.com"])
+    output = str(tmp_path / "scores.f32")
+
+    stats = framework.predict_by_index(0, path, output, batch_size=2, output_format="binary")
+
+    scores = np.fromfile(output, "<f4")
+    assert len(scores) == 5
+    assert np.isnan(scores[[1, 3]]).all()
+    assert scores[[0, 2, 4]].tolist() == [0.25, 0.5, 0.75]
+    assert dict(stats.get_metrics())["Domains"] == 3
+
+
+def test_csv_output_skips_blank_lines(framework, tmp_path):
+    path = write_lines(tmp_path / "domains.txt", ["a.com", "", "", "c.com"])
+    output = tmp_path / "scores.csv"
+
+    framework.predict_by_index(0, path, str(output), batch_size=2)
+
+    assert output.read_text().splitlines() == ["a.com,0.25", "c.com,0.75"]
@@ -0,0 +1,101 @@
+import pytest
+
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.NGramClassifier import NGramClassifier
+from RAMPAGE.Result import Result
+from RAMPAGE.ResultStore import ResultStore
+
+
+def make_result(accuracy: float, fpr: float) -> Result:
+    result = Result()
+    result.add_metric("Accuracy", accuracy)
+    result.add_metric("FPR", fpr)
+    return result
+
+
+@pytest.fixture
+def store():
+    store = ResultStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_round_trip(store):
+    run_id = store.add(make_result(90.0, 0.1), "A", "config", "data", {"train": 1.5}, host="host")
+    assert store.get_result(run_id).get_metrics() == [("Accuracy", 90.0), ("FPR", 0.1)]
+    run = store.get_run(run_id)
+    assert (run["classifier"], run["config"], run["dataset"], run["host"]) == ("A", "config", "data", "host")
+    assert run["timings"] == {"train": 1.5}
+
+
+def test_unknown_run(store):
+    with pytest.raises(Exception, match="Unknown run"):
+        store.get_run(1)
+
+
+def test_leaderboard_trend_and_delta(store):
+    first = store.add(make_result(90.0, 0.2), "A", dataset="x")
+    second = store.add(make_result(95.0, 0.1), "A", dataset="y")
+    third = store.add(make_result(92.0, 0.05), "B", dataset="x")
+
+    assert store.leaderboard("Accuracy") == [("A", 95.0, second), ("B", 92.0, third)]
+    assert store.leaderboard("FPR", descending=False) == [("B", 0.05, third), ("A", 0.1, second)]
+    assert store.leaderboard("Accuracy", dataset="x") == [("B", 92.0, third), ("A", 90.0, first)]
+    assert [value for _, _, value in store.trend("A", "Accuracy")] == [90.0, 95.0]
+    assert store.delta(second, first).get_metrics() == [("Accuracy", 5.0), ("FPR", pytest.approx(-0.1))]
+
+
+def test_config_fingerprint_ignores_private_state():
+    classifier = NGramClassifier(epochs=3)
+    fingerprint = ResultStore.config_fingerprint(classifier)
+    classifier._model_path = "model.npz"
+    classifier.weights[1] = 1.0
+    assert ResultStore.config_fingerprint(classifier) == fingerprint
+    assert ResultStore.config_fingerprint(NGramClassifier(epochs=4)) != fingerprint
+
+
+def test_dataset_fingerprint_is_cached_until_data_changes(monkeypatch, tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("".join(f"domain{i}.com;{i % 2 == 1}\n" for i in range(100)))
+    framework = Framework()
+    framework.set_dataset_manager(DatasetManager())
+    framework.add_dataset(str(path), True)
+
+    calls = []
+    fingerprint = ResultStore.dataset_fingerprint
+    monkeypatch.setattr(ResultStore, "dataset_fingerprint", lambda manager: calls.append(1) or fingerprint(manager))
+
+    first = framework._get_dataset_fingerprint(framework.dataset_manager)
+    assert framework._get_dataset_fingerprint(framework.dataset_manager) == first
+    assert len(calls) == 1
+
+    other = tmp_path / "other.txt"
+    other.write_text("other.com;False\n")
+    framework.add_test_dataset(str(other))
+    assert framework._get_dataset_fingerprint(framework.dataset_manager) != first
+    assert len(calls) == 2
+
+
+def test_framework_stores_results(toy_sets, tmp_path):
+    train, validation, test = toy_sets
+    manager = DatasetManager()
+    manager.train_set.update(train)
+    manager.validation_set.update(validation)
+    manager.test_set.update(test)
+
+    store = ResultStore(str(tmp_path / "results.db"))
+    framework = Framework()
+    framework.set_dataset_manager(manager)
+    framework.set_result_store(store)
+    framework.add_classifier(NGramClassifier(epochs=1, seed=0))
+    framework.add_classifier(NGramClassifier(ngram_sizes=(3,), epochs=1, seed=0))
+    framework.train()
+    framework.test()
+
+    # Two configurations of a class are stored under their unique names
+    (classifier, _, run_id), other = store.leaderboard("Accuracy")
+    assert {classifier, other[0]} == {"NGramClassifier-0", "NGramClassifier-1"}
+    assert store.get_run(run_id)["dataset"] == ResultStore.dataset_fingerprint(manager)
+    assert set(store.get_run(run_id)["timings"]) >= {"train", "test"}
+    store.close()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.ConfusionResult import ConfusionResult
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.ScoreResult import ScoreResult
+from conftest import FixedScorer, generate_elements
+
+
+LABELS = np.array([0, 0, 1, 1, 0, 1])
+SCORES = np.array([0.1, 0.6, 0.7, 0.4, 0.3, 0.9])
+
+
+def test_metrics_match_the_confusion_matrix():
+    result = ScoreResult(LABELS, SCORES)
+    assert result.get_metrics() == ConfusionResult.from_scores(LABELS, SCORES).get_metrics()
+
+
+def test_with_threshold_recomputes_the_counts():
+    result = ScoreResult(LABELS, SCORES).with_threshold(0.35)
+    assert (result.tp, result.tn, result.fp, result.fn) == (3, 2, 1, 0)
+    assert result.auc == ScoreResult(LABELS, SCORES).auc
+
+
+def test_save_and_load(tmp_path):
+    domains = ["a.com", "bücher.de", "例え.jp", "d.net", "e.org", "f.io"]
+    path = str(tmp_path / "scores.npz")
+    ScoreResult(LABELS, SCORES, threshold=0.35, domains=domains).save(path)
+
+    loaded = ScoreResult.load(path)
+    assert loaded.domains == domains
+    assert loaded.threshold == 0.35
+    assert loaded.get_metrics() == ScoreResult(LABELS, SCORES, threshold=0.35).get_metrics()
+
+    empty_path = str(tmp_path / "empty.npz")
+    ScoreResult(np.zeros(0), np.zeros(0), domains=[]).save(empty_path)
+    assert ScoreResult.load(empty_path).domains == []
+
+
+def test_evaluate_and_rescore_without_inference(tmp_path):
+    elements = generate_elements(100)
+    framework = Framework()
+    framework.set_dataset_manager(DatasetManager())
+    framework.dataset_manager.test_set = set(elements)
+    framework.add_classifier(FixedScorer({element.domain: float(element.is_dga) * 0.8 for element in elements}))
+
+    path = str(tmp_path / "scores.npz")
+    result = framework.evaluate_by_index(0, scores_path=path)
+    assert dict(result.get_metrics())["Accuracy"] == 100.0
+    assert len(ScoreResult.load(path).scores) == 100
+
+    rescored = framework.rescore_by_index(0, threshold=0.9)
+    assert dict(rescored.get_metrics())["TP"] == 0
+    assert framework.get_result_by_index(0) is rescored
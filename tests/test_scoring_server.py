@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.Framework import Framework
+from RAMPAGE.ScoringServer import ScoringServer
+
+
+class LengthScorer(Classifier):
+    def __init__(self, model_name: str = None) -> None:
+        if model_name is not None:
+            self.model_name = model_name
+
+    def predict(self, domains):
+        return np.array([len(domain) / 100 for domain in domains], dtype=np.float32)
+
+
+async def request(port: int, lines: list) -> list[str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 24)
+    writer.write(b"".join((line if isinstance(line, bytes) else line.encode()) + b"\n" for line in lines))
+    await writer.drain()
+    responses = [(await reader.readline()).decode() for _ in lines]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def run_server(server: ScoringServer, lines: list) -> list[str]:
+    async def run():
+        port = await server.start_tcp()
+        try:
+            return await request(port, lines)
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_scores_pipelined_requests():
+    server = ScoringServer({"length": LengthScorer()}, max_batch_size=4, max_latency=0.01)
+    responses = run_server(server, ["length a.com abcd.com", "length abcdefgh.com", "STATS", "unknown a.com", "length"])
+
+    assert responses[0] == "0.050000 0.080000\n"
+    assert responses[1] == "0.120000\n"
+    assert '"Requests"' in responses[2]
+    assert responses[3].startswith("ERROR Unknown classifier")
+    assert responses[4].startswith("ERROR Empty request")
+
+
+def test_from_framework_names_are_unique():
+    framework = Framework()
+    for classifier in (LengthScorer(), LengthScorer(), LengthScorer("bucketed"), LengthScorer("plain")):
+        framework.add_classifier(classifier)
+
+    server = ScoringServer.from_framework(framework)
+    assert list(server.classifiers) == ["LengthScorer-0", "LengthScorer-1", "bucketed", "plain"]
+    assert [server.classifiers[name] for name in server.classifiers] == framework.classifiers
+
+
+class FailingScorer(Classifier):
+    def predict(self, domains):
+        raise ValueError("first line\nsecond line")
+
+
+def test_errors_stay_on_one_line():
+    server = ScoringServer({"failing": FailingScorer(), "length": LengthScorer()})
+    responses = run_server(server, ["failing a.com", "length a.com"])
+
+    assert responses[0] == "ERROR failing failed: first line\\nsecond line\n"
+    assert responses[1] == "0.050000\n"
+
+
+def test_pipelined_requests_beyond_max_pending():
+    server = ScoringServer({"length": LengthScorer()}, max_batch_size=8, max_latency=0.001, max_pending=4)
+    responses = run_server(server, [f"length {'a' * (i % 10 + 1)}.com" for i in range(200)])
+
+    assert len(responses) == 200
+    assert responses[9] == "0.140000\n"
+
+
+def test_long_lines_get_an_error_reply():
+    server = ScoringServer({"length": LengthScorer()}, max_line_bytes=1024)
+    long_line = "length " + " ".join(["abcdefgh.com"] * 1000)
+    responses = run_server(server, [long_line, "length a.com", long_line])
+
+    assert responses[0] == "ERROR Request longer than 1024 bytes\n"
+    assert responses[1] == "0.050000\n"
+    assert responses[2] == responses[0]
+
+    # Batches beyond the 64 KiB asyncio default are served
+    response = run_server(ScoringServer({"length": LengthScorer()}), ["length " + " ".join(["abcdefgh.com"] * 10000)])
+    assert len(response[0].split()) == 10000
+
+
+def test_invalid_utf8_gets_an_error_reply():
+    server = ScoringServer({"length": LengthScorer()})
+    responses = run_server(server, [b"length \xff\xfe.com", "length a.com"])
+
+    assert responses[0] == "ERROR Request is not valid UTF-8\n"
+    assert responses[1] == "0.050000\n"
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.NGramClassifier import NGramClassifier
+from RAMPAGE.ScoreResult import ScoreResult
+from RAMPAGE.SliceResult import SliceResult
+
+
+class FamilyElement(DataElement):
+    def __init__(self, domain: str, is_dga: bool, family: str) -> None:
+        super().__init__(domain, is_dga)
+        self.family = family
+
+
+def test_keys():
+    domains = ["a.com", "b.es", "c.co.uk", "verylongdomainname.com"]
+    assert list(SliceResult.tld_keys(domains)) == ["com", "es", "uk", "com"]
+    assert len(set(SliceResult.length_keys(domains))) >= 2
+
+
+def test_metrics_per_slice():
+    labels = np.array([1, 1, 0, 0, 1, 0])
+    scores = np.array([0.9, 0.8, 0.1, 0.2, 0.1, 0.9])
+    result = ScoreResult(labels, scores, domains=["a.com", "b.com", "c.com", "d.com", "e.es", "f.es"])
+    slices = result.slices("tld")
+
+    assert dict(slices.get_slice("com").get_metrics())["Accuracy"] == 100.0
+    assert dict(slices.get_slice("es").get_metrics())["Accuracy"] == 0.0
+    assert slices.worst("Accuracy", 1)[0][0] == "es"
+
+
+def test_slices_need_domains():
+    with pytest.raises(Exception, match="no domains"):
+        ScoreResult(np.array([1, 0]), np.array([0.9, 0.1])).slices("tld")
+
+
+def test_attribute_slices_keep_duplicate_domains():
+    manager = DatasetManager()
+    manager.train_set.update([DataElement("abc.com", False), DataElement("xq9z1.com", True)] * 50)
+    # The same domain in two families, with different labels
+    manager.test_set.update([
+        FamilyElement("dup.com", True, "first"),
+        FamilyElement("dup.com", False, "second"),
+        FamilyElement("other.com", False, "second")
+    ])
+    framework = Framework()
+    framework.set_dataset_manager(manager)
+    framework.add_classifier(NGramClassifier(epochs=1, seed=0))
+    framework.train()
+    framework.evaluate_by_index(0)
+
+    slices = framework.slice_by_index(0, "family")
+    assert set(slices.keys) == {"first", "second"}
+    assert slices.sizes[slices.keys.index("second")] == 2
+
+    # Changing the test split after the evaluation does not break the slices
+    manager.test_set.clear()
+    assert set(framework.slice_by_index(0, "family").keys) == {"first", "second"}
@@ -0,0 +1,57 @@
+import numpy as np
+
+from RAMPAGE.DataElement import DataElement
+from RAMPAGE.DomainEncoder import DomainEncoder
+from RAMPAGE.SpilledSplit import SpilledSplit
+from conftest import generate_elements
+
+
+def as_pairs(elements) -> list[tuple[str, bool]]:
+    return [(element.domain, element.is_dga) for element in elements]
+
+
+def test_round_trip(tmp_path):
+    elements = generate_elements(1000) + [DataElement("bücher.de", False), DataElement("例え.jp", True)]
+    split = SpilledSplit.spill(elements, str(tmp_path), "train")
+
+    assert len(split) == len(elements)
+    assert as_pairs(split) == as_pairs(elements)
+    assert split.get_domains(1000, 1002) == ["bücher.de", "例え.jp"]
+    assert as_pairs(SpilledSplit(str(tmp_path), "train")) == as_pairs(elements)
+
+
+def test_update_appends_and_clear_empties(tmp_path):
+    first, second = generate_elements(10, seed=1), generate_elements(5, seed=2)
+    split = SpilledSplit.spill(first, str(tmp_path), "test")
+    split.update(second)
+    split.update([])
+    assert as_pairs(split) == as_pairs(first + second)
+
+    split.clear()
+    assert len(split) == 0
+    assert list(split) == []
+
+
+def test_encoding_is_cached_until_the_split_changes(tmp_path):
+    elements = generate_elements(100)
+    encoder = DomainEncoder(max_length=16)
+    split = SpilledSplit.spill(elements, str(tmp_path), "train")
+
+    codes, lengths = split.encode(encoder)
+    domains = [element.domain for element in elements]
+    assert isinstance(codes, np.memmap)
+    np.testing.assert_array_equal(codes, encoder.encode(domains))
+    np.testing.assert_array_equal(lengths, np.minimum([len(domain) for domain in domains], 16))
+    assert split.encode(encoder)[0].filename == codes.filename
+
+    split.update(generate_elements(3, seed=5))
+    assert len(split.encode(encoder)[0]) == 103
+
+
+def test_delete_removes_every_file(tmp_path):
+    split = SpilledSplit.spill(generate_elements(10), str(tmp_path), "validation")
+    split.encode(DomainEncoder(max_length=8))
+    assert split.get_disk_bytes() > 0
+
+    split.delete()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from RAMPAGE.TFLiteModel import TFLiteModel
+
+
+MAX_LENGTH = 16
+
+
+@pytest.fixture(scope="module")
+def keras_model():
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input((MAX_LENGTH,), dtype="int32"),
+        tf.keras.layers.Embedding(256, 8),
+        tf.keras.layers.GlobalAveragePooling1D(),
+        tf.keras.layers.Dense(1, activation="sigmoid")
+    ])
+    model.compile(loss="binary_crossentropy")
+    return model
+
+
+@pytest.fixture(scope="module")
+def x_data() -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 90, (100, MAX_LENGTH), dtype=np.uint8)
+
+
+def test_export_matches_keras(keras_model, x_data, tmp_path):
+    path = str(tmp_path / "model.tflite")
+    assert TFLiteModel.export(keras_model, path, MAX_LENGTH, batch_size=32) > 0
+
+    model = TFLiteModel(path)
+    assert model.batch_size == 32
+    expected = np.ravel(keras_model.predict_on_batch(x_data.astype(np.int32)))
+    np.testing.assert_allclose(model.predict(x_data), expected, atol=1e-5)
+
+    # Narrower matrices are padded to the model width
+    padded = np.pad(x_data[:, :10], ((0, 0), (0, MAX_LENGTH - 10)))
+    np.testing.assert_array_equal(model.predict(x_data[:, :10]), model.predict(padded))
+
+
+def test_quantized_export_and_compare(keras_model, x_data, tmp_path):
+    path = str(tmp_path / "model.tflite")
+    TFLiteModel.export(keras_model, path, MAX_LENGTH, batch_size=32, quantize=True)
+
+    metrics = dict(TFLiteModel(path).compare(keras_model, x_data, np.zeros(len(x_data)), repetitions=1).get_metrics())
+    assert metrics["Max score diff"] < 0.05
+    assert metrics["TFLite bytes"] > 0
@@ -0,0 +1,79 @@
+import pytest
+
+from RAMPAGE.Classifier import Classifier
+from RAMPAGE.DatasetManager import DatasetManager
+from RAMPAGE.Framework import Framework
+from RAMPAGE.NGramClassifier import NGramClassifier
+from conftest import generate_elements
+
+
+class RecordingClassifier(Classifier):
+    """A classifier that records the sizes of the sets it is trained on."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def train(self, train_set, validation_set) -> None:
+        self.calls.append(("train", len(train_set)))
+
+
+class IncrementalClassifier(RecordingClassifier):
+    """A classifier with incremental updates."""
+
+    def partial_train(self, new_train_set, validation_set) -> None:
+        self.calls.append(("partial_train", len(new_train_set)))
+
+
+class BrokenClassifier(RecordingClassifier):
+    """A classifier whose update fails with a NotImplementedError of its own."""
+
+    def partial_train(self, new_train_set, validation_set) -> None:
+        raise NotImplementedError("unsupported layer")
+
+
+def write_dataset(path, count: int, seed: int) -> str:
+    path.write_text("".join(f"{element.domain};{element.is_dga}\n" for element in generate_elements(count, seed)))
+    return str(path)
+
+
+@pytest.fixture
+def framework(tmp_path) -> Framework:
+    framework = Framework()
+    framework.set_dataset_manager(DatasetManager())
+    framework.add_dataset(write_dataset(tmp_path / "initial.txt", 1000, seed=1), random_sets=False)
+    return framework
+
+
+def test_update_uses_partial_train(framework, tmp_path):
+    classifier = IncrementalClassifier()
+    framework.add_classifier(classifier)
+    framework.update(write_dataset(tmp_path / "new.txt", 100, seed=2), random_sets=False)
+    assert classifier.calls == [("partial_train", 80)]
+    assert "update" in framework.timings[0]
+
+
+def test_update_retrains_without_partial_train(framework, tmp_path):
+    classifier = RecordingClassifier()
+    framework.add_classifier(classifier)
+    with pytest.warns(UserWarning):
+        framework.update(write_dataset(tmp_path / "new.txt", 100, seed=2), random_sets=False)
+    assert classifier.calls == [("train", 880)]
+
+
+def test_errors_of_partial_train_are_not_retrains(framework):
+    classifier = BrokenClassifier()
+    framework.add_classifier(classifier)
+    with pytest.raises(NotImplementedError, match="unsupported layer"):
+        framework.partial_train_by_index(0, generate_elements(10), generate_elements(10))
+    assert classifier.calls == []
+
+
+def test_ngram_update_keeps_accuracy(framework, tmp_path, toy_sets):
+    train_set, validation_set, test_set = toy_sets
+    classifier = NGramClassifier(epochs=2)
+    classifier.train(train_set, validation_set)
+    framework.add_classifier(classifier)
+    before = dict(classifier.test(test_set).get_metrics())["Accuracy"]
+
+    framework.update(write_dataset(tmp_path / "new.txt", 500, seed=4), random_sets=False)
+    assert dict(classifier.test(test_set).get_metrics())["Accuracy"] >= before - 1.0